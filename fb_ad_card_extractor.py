@@ -12,6 +12,10 @@ The script prints a compact table to stdout. Designed to be resilient to DOM
 changes by relying on visible text patterns and minimal selectors instead of
 fragile class names.
 
+If the optional ``google-re2`` package is installed, card text is scanned with
+RE2 (linear-time, no catastrophic backtracking); otherwise the stdlib ``re``
+engine is used. Likewise ``orjson`` is used to write ``--json-out`` when present.
+
 Usage:
   python scrapper/fb_ad_card_extractor.py "<ad_library_url>" --max-cards 10 --scrolls 30 --headless
 """
@@ -19,29 +23,70 @@ Usage:
 from __future__ import annotations
 
 import argparse
+import bisect
+import functools
+import os
 import re
 import sys
+from concurrent.futures import ThreadPoolExecutor
 from dataclasses import dataclass, asdict
 import json
-from datetime import datetime
-from typing import Iterable, List, Optional
+from datetime import date, datetime
+from typing import Callable, Iterable, List, Optional, Tuple
+
+from playwright.sync_api import sync_playwright, Page
+
+try:
+    import re2  # optional: pip install google-re2
+except ImportError:
+    re2 = None
+
+try:
+    import orjson  # optional: pip install orjson
+except ImportError:
+    orjson = None
+
+
+# All card fields in one alternation so each card's text is scanned in a single pass.
+# Named groups:
+#   lib_id                       -> "Library ID: 123"
+#   started_date / total         -> "Started running on Oct 8, 2025 · Total active time 14 hrs"
+#   started_only                 -> "Started running on Oct 8, 2025" (no total active time)
+#   range_start / range_end      -> "Sep 30, 2025 - Oct 1, 2025" (inactive ads)
+#   alt_start / alt_end          -> "30 Sep 2025 - 1 Oct 2025"
+# Status is not part of it: see STATUS_RE.
+CARD_FIELD_PATTERNS = (
+    ("lib", r"\bLibrary ID:\s*(?P<lib_id>\d+)\b"),
+    ("started", r"Started\s+running\s+on\s+"
+                r"(?:(?P<started_date>[^\n·\-]+?)\s*[·\-]\s*Total\s+active\s+time\s*(?P<total>[^\n]+)"
+                r"|(?P<started_only>[^\n]+))"),
+    ("range", r"(?P<range_start>[A-Z][a-z]{2}\s+\d{1,2},\s+\d{4})\s*[-–—]\s*(?P<range_end>[A-Z][a-z]{2}\s+\d{1,2},\s+\d{4})"),
+    ("range_alt", r"(?P<alt_start>\d{1,2}\s+[A-Z][a-z]{2}\s+\d{4})\s*[-–—]\s*(?P<alt_end>\d{1,2}\s+[A-Z][a-z]{2}\s+\d{4})"),
+)
 
-from playwright.sync_api import sync_playwright, Page, Locator
 
+@functools.lru_cache(maxsize=None)
+def _compile_card_fields(kinds: Tuple[str, ...]):
+    """Compile the alternation of the given CARD_FIELD_PATTERNS kinds, in table order."""
+    return (re2 or re).compile(
+        "(?i)" + "|".join(f"(?P<{kind}>{pattern})" for kind, pattern in CARD_FIELD_PATTERNS if kind in kinds)
+    )
 
-LIBRARY_ID_RE = re.compile(r"\bLibrary ID:\s*(\d+)\b", re.I)
-# Matches lines like: "Started running on Oct 8, 2025 · Total active time 14 hrs"
-STARTED_RE = re.compile(
-    r"Started\s+running\s+on\s+([^\n·\-]+?)\s*[·\-]\s*Total\s+active\s+time\s*([^\n]+)",
-    re.I,
-)
-# Fallback when only the start date is present
-STARTED_SIMPLE_RE = re.compile(r"Started\s+running\s+on\s+([^\n]+)", re.I)
-# Match date range for inactive ads: "Sep 30, 2025 - Oct 1, 2025" or "Sep 30, 2025 – Oct 1, 2025"
-DATE_RANGE_RE = re.compile(r"([A-Z][a-z]{2}\s+\d{1,2},\s+\d{4})\s*[-–—]\s*([A-Z][a-z]{2}\s+\d{1,2},\s+\d{4})", re.I)
-# Alternative date range like "30 Sep 2025 - 1 Oct 2025"
-DATE_RANGE_ALT_RE = re.compile(r"(\d{1,2}\s+[A-Z][a-z]{2}\s+\d{4})\s*[-–—]\s*(\d{1,2}\s+[A-Z][a-z]{2}\s+\d{4})", re.I)
+
+CARD_FIELDS_RE = _compile_card_fields(tuple(kind for kind, _ in CARD_FIELD_PATTERNS))
+# Card status: the first whole-word Active/Inactive, in any case (the status label
+# precedes the "Total active time" line)
 STATUS_RE = re.compile(r"\b(Active|Inactive)\b", re.I)
+# Strips a repeated "Total active time:" label from the captured duration
+TOTAL_ACTIVE_PREFIX_RE = re.compile(r"^total\s+active\s+time\s*[:\-]*\s*", re.I)
+# Browser profile reused across runs (see extract_cards)
+PROFILE_DIR = ".pw_profile"
+# Minimum pause after each scroll so rendered cards are committed to the DOM
+SCROLL_SETTLE_MS = 200
+# Worker threads that parse card text while the page scrolls
+PARSE_WORKERS = 4
+# Literal labels every ad card renders; text without any of them cannot produce a row
+CARD_KEYWORDS = ("Library ID", "Started running", "Active", "Inactive")
 
 
 @dataclass
@@ -55,14 +100,50 @@ class AdCard:
         return f"{self.library_id or '-':<18}  {self.status or '-':<8}  {self.started_running or '-':<20}  {self.total_active_time or '-'}"
 
 
+MONTH_ABBRS = ("Jan", "Feb", "Mar", "Apr", "May", "Jun", "Jul", "Aug", "Sep", "Oct", "Nov", "Dec")
+MONTH_NUMBERS = {abbr.lower(): n for n, abbr in enumerate(MONTH_ABBRS, start=1)}
+
+
+def _fast_parse_date(date_str: str) -> Optional[date]:
+    """Parse 'Oct 8, 2025' or '8 Oct 2025' with a month-table lookup instead of strptime."""
+    parts = date_str.replace(",", " ").split()
+    if len(parts) != 3:
+        return None
+    if parts[0].isdigit():
+        day, mon, year = parts
+    else:
+        mon, day, year = parts
+    month = MONTH_NUMBERS.get(mon.lower())
+    if not month:
+        return None
+    try:
+        return date(int(year), month, int(day))
+    except ValueError:
+        return None
+
+
+def _format_short_date(d: date) -> str:
+    """Format as '%b %d, %Y' (e.g. 'Sep 30, 2025') without going through strftime."""
+    return f"{MONTH_ABBRS[d.month - 1]} {d.day:02d}, {d.year}"
+
+
+# Duration buckets: days in [1, 7) are counted in days, [7, 30) in weeks,
+# [30, 365) in 30-day months and anything longer in 365-day years
+DURATION_BUCKET_FLOORS = (1, 7, 30, 365)
+DURATION_BUCKET_UNITS = ((1, "day"), (7, "week"), (30, "month"), (365, "year"))
+
+
+@functools.lru_cache(maxsize=4096)
 def _calculate_time_difference(start_date_str: str, end_date_str: str, *, inclusive: bool = False) -> str:
     """Calculate time difference between two dates and return formatted string.
     If inclusive=True, counts both the start and end dates (e.g., Sep 30 - Oct 1 → 2 days).
     """
     try:
         # Parse dates like "Sep 30, 2025" or "Oct 1, 2025"
-        start_date = datetime.strptime(start_date_str.strip(), "%b %d, %Y")
-        end_date = datetime.strptime(end_date_str.strip(), "%b %d, %Y")
+        start_date = _fast_parse_date(start_date_str)
+        end_date = _fast_parse_date(end_date_str)
+        if not start_date or not end_date:
+            return None
         
         # Calculate difference
         diff = end_date - start_date
@@ -72,25 +153,29 @@ def _calculate_time_difference(start_date_str: str, end_date_str: str, *, inclus
         
         if days == 0:
             return "less than 1 day"
-        elif days == 1:
-            return "1 day"
-        elif days < 7:
-            return f"{days} days"
-        elif days < 30:
-            weeks = days // 7
-            return f"{weeks} week" if weeks == 1 else f"{weeks} weeks"
-        elif days < 365:
-            months = days // 30
-            return f"{months} month" if months == 1 else f"{months} months"
-        else:
-            years = days // 365
-            return f"{years} year" if years == 1 else f"{years} years"
+        # Pick the unit whose lower bound is the largest one not exceeding days
+        bound_idx = bisect.bisect_right(DURATION_BUCKET_FLOORS, days) - 1
+        unit_days, unit = DURATION_BUCKET_UNITS[bound_idx]
+        count = days // unit_days
+        return f"{count} {unit}" if count == 1 else f"{count} {unit}s"
     except Exception:
         return None
 
 
+# Facebook renders "Oct 6, 2025", so that format is tried first
+DATE_FORMATS = (
+    "%b %d, %Y",  # Oct 6, 2025
+    "%B %d, %Y",  # October 6, 2025
+    "%d %b %Y",   # 6 Oct 2025
+    "%d %B %Y",   # 6 October 2025
+)
+
+
+@functools.lru_cache(maxsize=4096)
 def _parse_date(date_str: str) -> Optional[datetime]:
-    """Best-effort parse for rendered dates like 'Oct 6, 2025' or '6 Oct 2025'."""
+    """Best-effort parse for rendered dates like 'Oct 6, 2025' or '6 Oct 2025'.
+    Results are memoized since the same few dates repeat across most cards.
+    """
     if not date_str:
         return None
     cleaned = (
@@ -98,77 +183,78 @@ def _parse_date(date_str: str) -> Optional[datetime]:
         .replace("\u2009", " ")          # thin space
         .replace("\u2013", "-")
         .replace("\u2014", "-")
+        .split(" - ")[0]                 # keep the start of a range
         .strip()
     )
-    candidates = [cleaned, cleaned.split(" - ")[0].strip()]
-    fmts = [
-        "%b %d, %Y",  # Oct 6, 2025
-        "%B %d, %Y",  # October 6, 2025
-        "%d %b %Y",   # 6 Oct 2025
-        "%d %B %Y",   # 6 October 2025
-    ]
-    for cand in candidates:
-        for fmt in fmts:
-            try:
-                return datetime.strptime(cand, fmt)
-            except Exception:
-                continue
+    for fmt in DATE_FORMATS:
+        try:
+            return datetime.strptime(cleaned, fmt)
+        except ValueError:
+            continue
     return None
 
 
-def _extract_from_text(text: str) -> AdCard:
+def _has_card_keywords(text: str) -> bool:
+    """Cheap substring pre-filter run before any regex work."""
+    return any(k in text for k in CARD_KEYWORDS)
+
+
+def _extract_from_text(text: str, fields_re=CARD_FIELDS_RE) -> AdCard:
     library_id = None
     started_running = None
     total_active_time = None
     status = None
 
-    m = LIBRARY_ID_RE.search(text)
-    if m:
-        library_id = m.group(1)
+    if not text or not _has_card_keywords(text):
+        return AdCard(status=None, library_id=None, started_running=None, total_active_time=None)
 
     m = STATUS_RE.search(text)
     if m:
         status = m.group(1).capitalize()
 
+    # First occurrence of each field wins, mirroring independent searches
+    started = range_match = alt_match = None
+    for m in fields_re.finditer(text):
+        kind = m.lastgroup
+        if kind == "lib":
+            library_id = library_id or m.group("lib_id")
+        elif kind == "started":
+            started = started or m
+        elif kind == "range":
+            range_match = range_match or m
+        elif kind == "range_alt":
+            alt_match = alt_match or m
+
     # If explicitly Inactive, prefer parsing the date range string and compute inclusive duration
     if status == "Inactive":
+        start_date = end_date = None
         # First try American month-name format
-        m3 = DATE_RANGE_RE.search(text)
-        if not m3:
-            # Then try day-first format
-            m3 = DATE_RANGE_ALT_RE.search(text)
-            if m3:
-                # Normalize to %b %d, %Y for our calculator
-                try:
-                    s = datetime.strptime(m3.group(1).strip(), "%d %b %Y").strftime("%b %d, %Y")
-                    e = datetime.strptime(m3.group(2).strip(), "%d %b %Y").strftime("%b %d, %Y")
-                    start_date, end_date = s, e
-                except Exception:
-                    start_date = end_date = None
-        else:
-            start_date = m3.group(1).strip()
-            end_date = m3.group(2).strip()
+        if range_match:
+            start_date = range_match.group("range_start").strip()
+            end_date = range_match.group("range_end").strip()
+        elif alt_match:
+            # Then try day-first format, normalized to %b %d, %Y for our calculator
+            s_dt = _fast_parse_date(alt_match.group("alt_start"))
+            e_dt = _fast_parse_date(alt_match.group("alt_end"))
+            if s_dt and e_dt:
+                start_date, end_date = _format_short_date(s_dt), _format_short_date(e_dt)
 
         if start_date and end_date:
             started_running = started_running or start_date
             calculated_time = _calculate_time_difference(start_date, end_date, inclusive=True)
             if calculated_time:
                 total_active_time = calculated_time
-    else:
+    elif started:
         # Active or unknown: check for "Started running on" formats
-        m_active = STARTED_RE.search(text)
-        if m_active:
-            raw_date = m_active.group(1).strip()
+        if started.group("started_date"):
+            raw_date = started.group("started_date").strip()
             # Normalize to '8 Oct 2025' for output
             parsed_dt = _parse_date(raw_date)
             started_running = parsed_dt.strftime("%d %b %Y") if parsed_dt else raw_date
             # Keep only the duration fragment (e.g., '14 hrs')
-            total_active_time = m_active.group(2).strip()
-            total_active_time = re.sub(r"^total\s+active\s+time\s*[:\-]*\s*", "", total_active_time, flags=re.I)
+            total_active_time = TOTAL_ACTIVE_PREFIX_RE.sub("", started.group("total").strip())
         else:
-            m2 = STARTED_SIMPLE_RE.search(text)
-            if m2:
-                started_running = m2.group(1).strip()
+            started_running = started.group("started_only").strip()
 
     # For active ads without a provided total active time, approximate to nearest hour since start date
     if status == "Active" and started_running and not total_active_time:
@@ -183,57 +269,137 @@ def _extract_from_text(text: str) -> AdCard:
     return AdCard(status=status, library_id=library_id, started_running=started_running, total_active_time=total_active_time)
 
 
-def _visible_card_locators(page: Page) -> List[Locator]:
-    """Find unique ad card containers, avoiding duplicates from nested elements."""
-    cards: List[Locator] = []
-    
-    # Try multiple selectors to find ad cards
-    # Facebook's structure can vary, so we try different approaches
-    
-    # Approach 1: Look for divs with role='article' (Facebook feed items)
-    div_articles = page.locator("div[role='article']")
-    article_count = div_articles.count()
-    
-    if article_count > 0:
-        # Get all role=article divs
-        cards.extend([div_articles.nth(i) for i in range(article_count)])
-    else:
-        # Approach 2: Standard article tags
-        article_cards = page.locator("article").filter(has_text="Library ID")
-        if article_cards.count() > 0:
-            cards.extend([article_cards.nth(i) for i in range(article_cards.count())])
-        else:
-            # Approach 3: Fallback to divs containing Library ID
-            # Deduplicate by Library ID to avoid nested elements
-            div_cards = page.locator("div:has-text('Library ID')")
-            total_div_count = div_cards.count()
-            count = min(total_div_count, 500)  # Increased limit to catch more cards
-            seen_library_ids = set()
-            for i in range(count):
-                try:
-                    loc = div_cards.nth(i)
-                    text = loc.inner_text(timeout=500)
-                    # Extract the Library ID from this element
-                    m = LIBRARY_ID_RE.search(text)
-                    if not m:
-                        continue
-                    lib_id = m.group(1)
-                    if lib_id in seen_library_ids:
-                        continue
-
-                    # Promote to nearest card container so we capture header/date text as well
-                    container = loc.locator("xpath=ancestor::div[@role='article'][1]")
-                    if container.count() == 0:
-                        container = loc.locator("xpath=ancestor::article[1]")
-                    # Fallback to the original element if no container found
-                    chosen = container if container.count() > 0 else loc
-
-                    seen_library_ids.add(lib_id)
-                    cards.append(chosen)
-                except:
-                    continue
-                    
-    return cards
+def _specialize_parser(sample_text: str) -> Callable[[str], AdCard]:
+    """Return a card parser restricted to the field layouts found in ``sample_text``.
+    Facebook renders the same layout for nearly every card on a page, so the
+    alternatives that never fire are dropped from the steady-state regex. Cards
+    the narrowed parser can't fully read fall back to the general parser.
+    """
+    kinds = {m.lastgroup for m in CARD_FIELDS_RE.finditer(sample_text)}
+    if "lib" not in kinds or len(kinds) < 2:
+        return _extract_from_text
+    fields_re = _compile_card_fields(tuple(kind for kind, _ in CARD_FIELD_PATTERNS if kind in kinds))
+
+    def parse(text: str) -> AdCard:
+        card = _extract_from_text(text, fields_re)
+        if card.library_id and card.started_running:
+            return card
+        return _extract_from_text(text)
+
+    return parse
+
+
+# Runs in the page and returns the innerText of every unique ad card container, so a
+# whole scroll position costs one round-trip instead of count()/nth()/inner_text()
+# calls per card. Tries the same three approaches the scraper has always used.
+VISIBLE_CARD_TEXTS_JS = """
+() => {
+  const textsOf = (nodes) => nodes.map((n) => n.innerText || "");
+
+  // Approach 1: divs with role='article' (Facebook feed items)
+  const divArticles = [...document.querySelectorAll("div[role='article']")];
+  if (divArticles.length) return textsOf(divArticles);
+
+  // Approach 2: standard article tags mentioning a Library ID
+  const articles = [...document.querySelectorAll("article")]
+    .filter((n) => (n.innerText || "").includes("Library ID"));
+  if (articles.length) return textsOf(articles);
+
+  // Approach 3: divs containing a Library ID, promoted to their nearest card
+  // container and deduplicated by Library ID to avoid nested elements
+  const seen = new Set();
+  const cards = [];
+  let scanned = 0;
+  for (const div of document.querySelectorAll("div")) {
+    const text = div.innerText || "";
+    if (!text.includes("Library ID")) continue;
+    if (++scanned > 500) break;
+    const m = text.match(/\\bLibrary ID:\\s*(\\d+)\\b/i);
+    if (!m || seen.has(m[1])) continue;
+    seen.add(m[1]);
+    cards.push(div.closest("div[role='article'], article") || div);
+  }
+  return textsOf(cards);
+}
+"""
+
+
+def _visible_card_texts(page: Page) -> List[str]:
+    """Return the text of each unique ad card currently in the DOM, in one round-trip."""
+    try:
+        return page.evaluate(VISIBLE_CARD_TEXTS_JS) or []
+    except Exception:
+        return []
+
+
+# Installs a MutationObserver that pushes newly inserted ad cards' text to the Python
+# side. Cards fill in progressively, so a card is reported again whenever its text has
+# changed, until it carries its dates ("Started running" for active ads, a date range
+# for inactive ones); after that it is never re-read. Registered as an init script too,
+# so the observer comes back after a navigation or reload (top frame only).
+CARD_OBSERVER_JS = """
+() => {
+  if (window !== window.top || window.__adCardObserver) return;
+  const complete = new WeakSet();
+  const lastText = new WeakMap();
+  const DATES = /Started running|\\d{4}\\s*[-–—]\\s*\\S/;
+  const report = (card) => {
+    if (complete.has(card)) return;
+    const text = card.innerText || "";
+    if (!text.includes("Library ID") || lastText.get(card) === text) return;
+    lastText.set(card, text);
+    if (DATES.test(text)) complete.add(card);
+    window.onAdCard(text);
+  };
+  const scan = (node) => {
+    if (node.nodeType !== Node.ELEMENT_NODE) return;
+    const card = node.closest("div[role='article'], article");
+    if (card) {
+      report(card);
+      return;
+    }
+    node.querySelectorAll("div[role='article'], article").forEach(report);
+  };
+  const install = () => {
+    window.__adCardObserver = new MutationObserver((mutations) => {
+      for (const m of mutations) m.addedNodes.forEach(scan);
+    });
+    window.__adCardObserver.observe(document.body, { childList: true, subtree: true });
+  };
+  if (document.body) install();
+  else document.addEventListener("DOMContentLoaded", install, { once: true });
+}
+"""
+
+
+def _filled_fields(card: AdCard) -> int:
+    """Number of parsed fields, used to keep the most complete reading of a re-reported card."""
+    return sum(v is not None for v in (card.status, card.started_running, card.total_active_time))
+
+
+def _install_card_observer(page: Page, sink: List[str]) -> bool:
+    """Stream the text of cards inserted from now on into ``sink``.
+    Returns False if the observer could not be installed.
+    """
+    try:
+        page.expose_binding("onAdCard", lambda source, text: sink.append(text))
+        # Future documents get it from the init script, the current one right away
+        page.add_init_script(f"({CARD_OBSERVER_JS})()")
+        page.evaluate(CARD_OBSERVER_JS)
+        return True
+    except Exception:
+        return False
+
+
+def _wait_for_feed_growth(page: Page, height_before: int, timeout_ms: int = 2000) -> None:
+    """Return as soon as the document grows past ``height_before`` (new cards loaded),
+    or after ``timeout_ms``. A short floor lets the DOM commit what already arrived.
+    """
+    page.wait_for_timeout(SCROLL_SETTLE_MS)
+    try:
+        page.wait_for_function("(h) => document.body.scrollHeight > h", arg=height_before, timeout=timeout_ms)
+    except Exception:
+        pass
 
 
 def _scroll_to_load(page: Page, iterations: int) -> None:
@@ -243,84 +409,104 @@ def _scroll_to_load(page: Page, iterations: int) -> None:
         page.wait_for_timeout(2000)
 
 
-def extract_cards(url: str, max_cards: int, scrolls: int, headless: bool) -> List[AdCard]:
+def extract_cards(url: str, max_cards: int, scrolls: int, headless: bool, profile_dir: str = PROFILE_DIR) -> List[AdCard]:
     with sync_playwright() as p:
-        browser = p.chromium.launch(headless=headless, args=["--disable-blink-features=AutomationControlled"])
-        context = browser.new_context()
-        page = context.new_page()
+        # Persistent profile: disk cache and Facebook's JS bundles carry over between runs
+        context = p.chromium.launch_persistent_context(
+            profile_dir,
+            headless=headless,
+            args=[
+                "--disable-blink-features=AutomationControlled",
+                f"--disk-cache-dir={os.path.join(profile_dir, 'cache')}",
+            ],
+        )
+        page = context.pages[0] if context.pages else context.new_page()
         page.set_default_timeout(120000)
 
         page.goto(url, wait_until="domcontentloaded")
         page.wait_for_timeout(3000)
 
+        # Cards inserted by later scrolls arrive here via the observer binding
+        card_queue: List[str] = []
+        observing = _install_card_observer(page, card_queue)
+
         results: List[AdCard] = []
         seen_ids = set()
-
-        # Progressive scan: on each iteration, re-query visible cards, parse, then scroll.
-        # Note: Facebook uses virtual scrolling, so we always process all visible cards
-        # and rely on seen_ids to skip duplicates.
-        for step in range(max(1, scrolls)):
-            try:
-                cards_locators = _visible_card_locators(page)
-                total_cards = len(cards_locators)
-                cards_added_this_scroll = 0
-                
-                # Quick preview: what IDs are currently visible?
-                visible_ids = set()
-                for idx in range(min(total_cards, 100)):
-                    try:
-                        text = cards_locators[idx].inner_text(timeout=500)
-                        m = LIBRARY_ID_RE.search(text)
-                        if m:
-                            visible_ids.add(m.group(1))
-                    except:
-                        continue
-                
-                new_ids = visible_ids - seen_ids
-                if new_ids or step == 0:
-                    print(f"[Scroll {step+1}/{scrolls}] {len(new_ids)} new IDs detected (total collected: {len(results)})")
-                
-                # Process all visible cards, relying on seen_ids for deduplication
-                for idx in range(total_cards):
+        row_of_id = {}  # library ID -> index of its row in results
+        parse_card: Optional[Callable[[str], AdCard]] = None
+
+        # Parse workers are shut down even if a scroll step raises
+        with ThreadPoolExecutor(max_workers=PARSE_WORKERS) as parse_pool:
+            # Progressive scan: on each iteration, take the cards reported since the last
+            # scroll, then parse them while scrolling. Note: Facebook uses virtual scrolling,
+            # so cards can be reported again; seen_ids skips duplicates.
+            for step in range(max(1, scrolls)):
+                try:
+                    if step == 0 or not observing or not card_queue:
+                        # Initial (or fallback) sweep of everything already in the DOM
+                        card_queue.clear()
+                        card_texts = _visible_card_texts(page)
+                    else:
+                        card_texts = card_queue[:]
+                        card_queue.clear()
+                    if parse_card is None:
+                        # Specialize the parser to the layout of the first card that has one
+                        sample = next((t for t in card_texts if "Library ID" in t), None)
+                        if sample:
+                            parse_card = _specialize_parser(sample)
+                    # Parse on worker threads while the browser scrolls and loads the next batch
+                    parse_jobs = [parse_pool.submit(parse_card or _extract_from_text, text) for text in card_texts]
+                    cards_added_this_scroll = 0
+                    collected_before = len(results)
+                    
+                    # Scroll more slowly in smaller increments to catch cards as they load
+                    # Do 2 half-screen scrolls instead of 1 full screen, then wait only
+                    # as long as it takes for the feed to grow
+                    height_before = page.evaluate("document.body.scrollHeight")
+                    page.evaluate("window.scrollBy(0, window.innerHeight / 2)")
+                    page.wait_for_timeout(SCROLL_SETTLE_MS)
+                    page.evaluate("window.scrollBy(0, window.innerHeight / 2)")
+                    _wait_for_feed_growth(page, height_before)
+                    
+                    # Process all visible cards, relying on seen_ids for deduplication
+                    for job in parse_jobs:
+                        if max_cards and len(results) >= max_cards:
+                            print(f"  ℹ Reached max_cards limit ({max_cards})")
+                            break
+                        try:
+                            parsed = job.result()
+                            if parsed.library_id and parsed.library_id in seen_ids:
+                                # Silently skip duplicates (too verbose otherwise), but a card
+                                # reported again after filling in replaces its partial row
+                                row = row_of_id.get(parsed.library_id)
+                                if row is not None and _filled_fields(parsed) > _filled_fields(results[row]):
+                                    results[row] = parsed
+                                continue
+                            if parsed.library_id:
+                                seen_ids.add(parsed.library_id)
+                                cards_added_this_scroll += 1
+                            if parsed.library_id or parsed.started_running or parsed.status:
+                                if parsed.library_id:
+                                    row_of_id[parsed.library_id] = len(results)
+                                results.append(parsed)
+                        except Exception as e:
+                            # Silently continue on extraction errors
+                            continue
+                    
+                    # New IDs fall out of the parse loop itself, no separate preview pass
+                    if cards_added_this_scroll or step == 0:
+                        print(f"[Scroll {step+1}/{scrolls}] {cards_added_this_scroll} new IDs detected (total collected: {collected_before})")
+                    if cards_added_this_scroll > 0:
+                        print(f"  ✓ Added {cards_added_this_scroll} new cards (total: {len(results)})")
+                    
                     if max_cards and len(results) >= max_cards:
-                        print(f"  ℹ Reached max_cards limit ({max_cards})")
                         break
-                    card = cards_locators[idx]
-                    try:
-                        # Just wait for the card to be stable, don't scroll to it
-                        page.wait_for_timeout(50)
-                        text = card.inner_text()
-                        parsed = _extract_from_text(text)
-                        if parsed.library_id and parsed.library_id in seen_ids:
-                            # Silently skip duplicates (too verbose otherwise)
-                            continue
-                        if parsed.library_id:
-                            seen_ids.add(parsed.library_id)
-                            cards_added_this_scroll += 1
-                        if parsed.library_id or parsed.started_running or parsed.status:
-                            results.append(parsed)
-                    except Exception as e:
-                        # Silently continue on extraction errors
-                        continue
-                
-                if cards_added_this_scroll > 0:
-                    print(f"  ✓ Added {cards_added_this_scroll} new cards (total: {len(results)})")
-                
-                if max_cards and len(results) >= max_cards:
-                    break
-                
-                # Scroll more slowly in smaller increments to catch cards as they load
-                # Do 2 half-screen scrolls instead of 1 full screen
-                page.evaluate("window.scrollBy(0, window.innerHeight / 2)")
-                page.wait_for_timeout(1500)
-                page.evaluate("window.scrollBy(0, window.innerHeight / 2)")
-                page.wait_for_timeout(1500)
-            except Exception:
-                # Even if a step fails, keep going to the next
-                page.evaluate("window.scrollBy(0, window.innerHeight)")
-                page.wait_for_timeout(2000)
-
-        browser.close()
+                except Exception:
+                    # Even if a step fails, keep going to the next
+                    page.evaluate("window.scrollBy(0, window.innerHeight)")
+                    page.wait_for_timeout(2000)
+
+        context.close()
         print(f"\n📊 Extraction complete: Found {len(results)} unique cards (requested {max_cards})")
         return results
 
@@ -348,6 +534,10 @@ def save_json(rows: List[AdCard], out_path: str) -> None:
         "time_of_scrapping": datetime.now().strftime("%Y-%m-%d %H:%M:%S"),
         "results": [asdict(r) for r in rows],
     }
+    if orjson is not None:
+        with open(out_path, "wb") as f:
+            f.write(orjson.dumps(payload, option=orjson.OPT_INDENT_2))
+        return
     with open(out_path, "w", encoding="utf-8") as f:
         json.dump(payload, f, ensure_ascii=False, indent=2)
 
@@ -359,10 +549,11 @@ def main(argv: Optional[List[str]] = None) -> int:
     parser.add_argument("--scrolls", type=int, default=30, help="Number of scroll iterations to load more ads")
     parser.add_argument("--headless", action="store_true", help="Run browser in headless mode")
     parser.add_argument("--json-out", type=str, default=None, help="Optional path to write results as JSON")
+    parser.add_argument("--profile-dir", type=str, default=PROFILE_DIR, help="Browser profile directory reused across runs")
 
     args = parser.parse_args(argv)
 
-    rows = extract_cards(url=args.url, max_cards=args.max_cards, scrolls=args.scrolls, headless=args.headless)
+    rows = extract_cards(url=args.url, max_cards=args.max_cards, scrolls=args.scrolls, headless=args.headless, profile_dir=args.profile_dir)
     print_table(rows)
     if args.json_out:
         try:
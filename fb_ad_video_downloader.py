@@ -3,9 +3,12 @@
 # pip install playwright
 # playwright install chromium
 
+import hashlib
 import os
+import queue
 import re
 import sys
+import threading
 from pathlib import Path
 from urllib.parse import urlparse, unquote
 from playwright.sync_api import sync_playwright
@@ -14,7 +17,20 @@ SAVE_DIR = Path("downloads_full")
 SAVE_DIR.mkdir(exist_ok=True)
 
 MEDIA_TYPES = ("video/", "image/", "application/vnd.apple.mpegurl", "application/x-mpegURL")
-MEDIA_EXT_RE = re.compile(r"\.(mp4|mov|m3u8|ts|jpg|jpeg|png|webp|gif)$", re.I)
+MEDIA_EXTS = frozenset({".mp4", ".mov", ".m3u8", ".ts", ".jpg", ".jpeg", ".png", ".webp", ".gif"})
+
+USER_AGENT = ("Mozilla/5.0 (Windows NT 10.0; Win64; x64) "
+              "AppleWebKit/537.36 (KHTML, like Gecko) "
+              "Chrome/120.0 Safari/537.36")
+DOWNLOAD_WORKERS = 4
+
+# (url, body, out_path) jobs filled by the response handler, written to disk by workers
+download_queue = queue.Queue()
+# Media URLs already queued, and content digest -> first saved path
+# (catches the same file served from different CDN hosts)
+seen_urls = set()
+saved_by_digest = {}
+digest_lock = threading.Lock()
 
 def safe_name(url):
     p = urlparse(url).path
@@ -25,15 +41,19 @@ def safe_name(url):
 def is_media(response):
     url = response.url
     ctype = (response.headers.get("content-type") or "").lower()
-    if MEDIA_EXT_RE.search(url):
+    if os.path.splitext(urlparse(url).path)[1].lower() in MEDIA_EXTS:
         return True
     if any(mt in ctype for mt in MEDIA_TYPES):
         return True
     return False
 
-def save_response_immediate(response):
+def queue_response(response):
+    """Read a media body the browser already fetched; a worker writes it to disk."""
     try:
         url = response.url
+        if url in seen_urls:
+            return
+        seen_urls.add(url)
         filename = safe_name(url)
         # Add extension guess if missing
         if not os.path.splitext(filename)[1]:
@@ -47,25 +67,45 @@ def save_response_immediate(response):
 
         out_path = SAVE_DIR / filename
 
-        # Read body as soon as possible
+        # Read body as soon as possible (Playwright objects stay on this thread)
         body = response.body()
-        with open(out_path, "wb") as f:
-            f.write(body)
-        print(f"[✓] Saved {url} -> {out_path}")
+        download_queue.put((url, body, out_path))
     except Exception as e:
         print(f"[!] Failed to save {response.url[:80]}... {e}")
 
+def download_worker():
+    """Hash and write queued bodies off the browser thread."""
+    while True:
+        url, body, out_path = download_queue.get()
+        try:
+            digest = hashlib.blake2b(body, digest_size=16).digest()
+            with digest_lock:
+                first_path = saved_by_digest.setdefault(digest, out_path)
+            if first_path != out_path:
+                print(f"[=] Skipped duplicate {url[:80]}...")
+                continue
+            # URLs differing only in their query share a file name: write to a private
+            # temp file and rename, so concurrent writers never interleave (last one wins)
+            tmp_path = out_path.with_name(f"{out_path.name}.{threading.get_ident()}.part")
+            with open(tmp_path, "wb") as f:
+                f.write(body)
+            os.replace(tmp_path, out_path)
+            print(f"[✓] Saved {url} -> {out_path}")
+        except Exception as e:
+            print(f"[!] Failed to save {url[:80]}... {e}")
+        finally:
+            download_queue.task_done()
+
 def main(url):
+    for _ in range(DOWNLOAD_WORKERS):
+        threading.Thread(target=download_worker, daemon=True).start()
+
     with sync_playwright() as p:
         browser = p.chromium.launch(headless=False)
-        context = browser.new_context(
-            user_agent="Mozilla/5.0 (Windows NT 10.0; Win64; x64) "
-                       "AppleWebKit/537.36 (KHTML, like Gecko) "
-                       "Chrome/120.0 Safari/537.36"
-        )
+        context = browser.new_context(user_agent=USER_AGENT)
         page = context.new_page()
 
-        page.on("response", lambda r: is_media(r) and save_response_immediate(r))
+        page.on("response", lambda r: is_media(r) and queue_response(r))
 
         print(f"Navigating to: {url}")
         page.goto(url, wait_until="domcontentloaded")
@@ -80,7 +120,10 @@ def main(url):
         page.wait_for_timeout(15000)
 
         browser.close()
-        print("\n✅ Done. Check:", SAVE_DIR.resolve())
+
+    # Let the workers finish everything that was queued
+    download_queue.join()
+    print("\n✅ Done. Check:", SAVE_DIR.resolve())
 
 if __name__ == "__main__":
     if len(sys.argv) < 2:
@@ -8,6 +8,9 @@ Outputs:
 - All media files named after the Library ID (and suffixed _2, _3 for multiples)
 - A single JSON summary file named ads_summary.json
 
+The JSON files are written with ``orjson`` when it is installed, otherwise with the
+stdlib ``json`` module.
+
 Usage:
   python scrapper/fb_ad_full_media_metadata_download.py "<ad_library_url>" \
     --out-dir ad_media \
@@ -19,29 +22,60 @@ Usage:
 from __future__ import annotations
 
 import argparse
+import functools
 import json
 import os
 import re
+import shutil
+import urllib.request
+from concurrent.futures import Future, ThreadPoolExecutor
 from dataclasses import dataclass, asdict
-from datetime import datetime
-from typing import List, Optional
+from datetime import date, datetime
+from typing import List, Optional, Tuple
 
 from playwright.sync_api import sync_playwright, Page, Locator
 
+try:
+    import orjson  # optional: pip install orjson
+except ImportError:
+    orjson = None
+
 
-LIBRARY_ID_RE = re.compile(r"\bLibrary ID:\s*(\d+)\b", re.I)
 # Media detection patterns from network interception
 MEDIA_TYPES = ("video/", "image/", "application/vnd.apple.mpegurl", "application/x-mpegURL")
 MEDIA_EXT_RE = re.compile(r"\.(mp4|mov|m3u8|ts|jpg|jpeg|png|webp|gif)$", re.I)
-# e.g., Started running on Oct 8, 2025 · Total active time 14 hrs
-STARTED_RE = re.compile(
-    r"Started\s+running\s+on\s+([^\n·\-]+?)\s*[·\-]\s*Total\s+active\s+time\s*([^\n]+)",
+# Card text fields other than status in one alternation, scanned once per card; the firing
+# group names the field:
+#   lib                              -> "Library ID: 123"
+#   started_date / total             -> "Started running on Oct 8, 2025 · Total active time 14 hrs"
+#   started_only                     -> "Started running on Oct 8, 2025"
+#   range_start / range_end          -> "Sep 30, 2025 - Oct 1, 2025" (inactive ads)
+#   alt_start / alt_end              -> "30 Sep 2025 - 1 Oct 2025"
+CARD_FIELDS_RE = re.compile(
+    r"(?P<lib>\bLibrary ID:\s*(?P<lib_id>\d+)\b)"
+    r"|(?P<started>Started\s+running\s+on\s+"
+    r"(?:(?P<started_date>[^\n·\-]+?)\s*[·\-]\s*Total\s+active\s+time\s*(?P<total>[^\n]+)"
+    r"|(?P<started_only>[^\n]+)))"
+    r"|(?P<range>(?P<range_start>[A-Z][a-z]{2}\s+\d{1,2},\s+\d{4})\s*[-–—]\s*(?P<range_end>[A-Z][a-z]{2}\s+\d{1,2},\s+\d{4}))"
+    r"|(?P<range_alt>(?P<alt_start>\d{1,2}\s+[A-Z][a-z]{2}\s+\d{4})\s*[-–—]\s*(?P<alt_end>\d{1,2}\s+[A-Z][a-z]{2}\s+\d{4}))",
     re.I,
 )
-STARTED_SIMPLE_RE = re.compile(r"Started\s+running\s+on\s+([^\n]+)", re.I)
-DATE_RANGE_RE = re.compile(r"([A-Z][a-z]{2}\s+\d{1,2},\s+\d{4})\s*[-–—]\s*([A-Z][a-z]{2}\s+\d{1,2},\s+\d{4})", re.I)
-DATE_RANGE_ALT_RE = re.compile(r"(\d{1,2}\s+[A-Z][a-z]{2}\s+\d{4})\s*[-–—]\s*(\d{1,2}\s+[A-Z][a-z]{2}\s+\d{4})", re.I)
+# Status is searched separately over the whole text: the "started" branch above consumes
+# the rest of its line, which may be where the only status word is
 STATUS_RE = re.compile(r"\b(Active|Inactive)\b", re.I)
+# Leading "Total active time:" label left on a parsed duration
+TOTAL_ACTIVE_STRIP_RE = re.compile(r"^total\s+active\s+time\s*[:\-]*\s*", re.I)
+# Characters not allowed in saved file names
+UNSAFE_NAME_RE = re.compile(r"[^a-zA-Z0-9._-]")
+# File extension at the end of a URL path, before any query or fragment
+URL_EXT_RE = re.compile(r"\.([a-z0-9]{2,4})(?:[\?#]|$)", re.I)
+# Requests the extraction never needs: web fonts and Facebook's Banzai logging beacons.
+# Matched by URL so every other request bypasses the Python route handler (and keeps
+# the HTTP cache); stylesheets, images and media load normally for card layout.
+BLOCKED_URL_RE = re.compile(r"\.(?:woff2?|ttf|otf|eot)(?:[?#]|$)|/ajax/bz(?:[?#/]|$)", re.I)
+# Concurrent media downloads (network-bound, fetched outside the browser)
+DOWNLOAD_WORKERS = 8
+CHUNK_SIZE = 1 << 16
 
 
 @dataclass
@@ -57,6 +91,26 @@ class AdCard:
         return f"{self.library_id or '-':<18}  {self.status or '-':<8}  {self.started_running or '-':<20}  {self.total_active_time or '-'}"
 
 
+# Cheap shape checks that pick the single strptime format worth trying
+DATE_FORMAT_DISPATCH = (
+    (re.compile(r"^[A-Za-z]{3}\s+\d{1,2},\s+\d{4}$"), "%b %d, %Y"),  # Oct 6, 2025
+    (re.compile(r"^[A-Za-z]+\s+\d{1,2},\s+\d{4}$"), "%B %d, %Y"),    # October 6, 2025
+    (re.compile(r"^\d{1,2}\s+[A-Za-z]{3}\s+\d{4}$"), "%d %b %Y"),     # 6 Oct 2025
+    (re.compile(r"^\d{1,2}\s+[A-Za-z]+\s+\d{4}$"), "%d %B %Y"),       # 6 October 2025
+)
+
+
+def _strptime_dispatched(value: str) -> Optional[datetime]:
+    for shape, fmt in DATE_FORMAT_DISPATCH:
+        if shape.match(value):
+            try:
+                return datetime.strptime(value, fmt)
+            except ValueError:
+                return None
+    return None
+
+
+@functools.lru_cache(maxsize=4096)
 def _parse_date(date_str: str) -> Optional[datetime]:
     if not date_str:
         return None
@@ -67,23 +121,27 @@ def _parse_date(date_str: str) -> Optional[datetime]:
         .replace("\u2014", "-")
         .strip()
     )
-    candidates = [cleaned, cleaned.split(" - ")[0].strip()]
-    fmts = ["%b %d, %Y", "%B %d, %Y", "%d %b %Y", "%d %B %Y"]
-    for cand in candidates:
-        for fmt in fmts:
-            try:
-                return datetime.strptime(cand, fmt)
-            except Exception:
-                continue
-    return None
+    return _strptime_dispatched(cleaned)
+
+
+# Month abbreviation -> number, for hand-parsing "Oct 8, 2025" without strptime
+MONTH_NUMBERS = {
+    abbr: n
+    for n, abbr in enumerate(
+        ("jan", "feb", "mar", "apr", "may", "jun", "jul", "aug", "sep", "oct", "nov", "dec"), start=1
+    )
+}
+
+
+def _date_ordinal(date_str: str) -> int:
+    """Proleptic ordinal of a '%b %d, %Y' date; raises KeyError/ValueError if malformed."""
+    mon, day, year = date_str.replace(",", " ").split()
+    return date(int(year), MONTH_NUMBERS[mon.lower()], int(day)).toordinal()
 
 
 def _calculate_time_difference(start_date_str: str, end_date_str: str, *, inclusive: bool = False) -> Optional[str]:
     try:
-        s = datetime.strptime(start_date_str.strip(), "%b %d, %Y")
-        e = datetime.strptime(end_date_str.strip(), "%b %d, %Y")
-        diff = e - s
-        days = diff.days + (1 if inclusive else 0)
+        days = _date_ordinal(end_date_str) - _date_ordinal(start_date_str) + (1 if inclusive else 0)
         if days < 0:
             days = 0
         if days == 0:
@@ -110,48 +168,51 @@ def _extract_card_text_fields(text: str) -> AdCard:
     total_active_time = None
     status = None
 
-    m = LIBRARY_ID_RE.search(text)
-    if m:
-        library_id = m.group(1)
+    # One pass over the text; the first occurrence of each field wins
+    started = range_match = alt_match = None
+    for m in CARD_FIELDS_RE.finditer(text):
+        kind = m.lastgroup
+        if kind == "lib":
+            library_id = library_id or m.group("lib_id")
+        elif kind == "started":
+            started = started or m
+        elif kind == "range":
+            range_match = range_match or m
+        elif kind == "range_alt":
+            alt_match = alt_match or m
 
     m = STATUS_RE.search(text)
     if m:
         status = m.group(1).capitalize()
 
     if status == "Inactive":
-        m3 = DATE_RANGE_RE.search(text)
         start_date = end_date = None
-        if not m3:
-            m3 = DATE_RANGE_ALT_RE.search(text)
-            if m3:
-                try:
-                    s = datetime.strptime(m3.group(1).strip(), "%d %b %Y").strftime("%b %d, %Y")
-                    e = datetime.strptime(m3.group(2).strip(), "%d %b %Y").strftime("%b %d, %Y")
-                    start_date, end_date = s, e
-                except Exception:
-                    start_date = end_date = None
-        else:
-            start_date = m3.group(1).strip()
-            end_date = m3.group(2).strip()
+        if range_match:
+            start_date = range_match.group("range_start").strip()
+            end_date = range_match.group("range_end").strip()
+        elif alt_match:
+            try:
+                s = datetime.strptime(alt_match.group("alt_start").strip(), "%d %b %Y").strftime("%b %d, %Y")
+                e = datetime.strptime(alt_match.group("alt_end").strip(), "%d %b %Y").strftime("%b %d, %Y")
+                start_date, end_date = s, e
+            except Exception:
+                start_date = end_date = None
 
         if start_date and end_date:
             started_running = start_date
             calc = _calculate_time_difference(start_date, end_date, inclusive=True)
             if calc:
                 total_active_time = calc
-    else:
-        m_active = STARTED_RE.search(text)
-        if m_active:
-            raw_date = m_active.group(1).strip()
+    elif started:
+        if started.group("started_date"):
+            raw_date = started.group("started_date").strip()
             parsed_dt = _parse_date(raw_date)
             started_running = parsed_dt.strftime("%d %b %Y") if parsed_dt else raw_date
-            dur = m_active.group(2).strip()
-            dur = re.sub(r"^total\s+active\s+time\s*[:\-]*\s*", "", dur, flags=re.I)
+            dur = started.group("total").strip()
+            dur = TOTAL_ACTIVE_STRIP_RE.sub("", dur)
             total_active_time = dur
         else:
-            m2 = STARTED_SIMPLE_RE.search(text)
-            if m2:
-                started_running = m2.group(1).strip()
+            started_running = started.group("started_only").strip()
 
     if status == "Active" and started_running and not total_active_time:
         sdt = _parse_date(started_running)
@@ -171,39 +232,78 @@ def _extract_card_text_fields(text: str) -> AdCard:
     )
 
 
-def _visible_card_locators(page: Page) -> List[Locator]:
-    cards: List[Locator] = []
+# Tags one container per Library ID with data-lib-id (nearest article ancestor of the
+# first div whose text carries that ID), replacing a div:has-text() scan that cost an
+# inner_text() plus ancestor lookups per div.
+TAG_LIBRARY_ID_CARDS_JS = r"""
+() => {
+  for (const el of document.querySelectorAll("[data-lib-id]")) el.removeAttribute("data-lib-id");
+  const seen = new Set();
+  let scanned = 0;
+  for (const d of document.querySelectorAll("div")) {
+    if (!(d.textContent || "").includes("Library ID")) continue;
+    if (++scanned > 500) break;
+    const m = (d.innerText || "").match(/\bLibrary ID:\s*(\d+)\b/i);
+    if (!m || seen.has(m[1])) continue;
+    seen.add(m[1]);
+    const card = d.closest("div[role='article'], article") || d;
+    card.setAttribute("data-lib-id", m[1]);
+  }
+  return seen.size;
+}
+"""
+
+
+def _visible_card_locators(page: Page) -> Tuple[Optional[Locator], List[Locator]]:
+    """The locator matching every card, plus one nth() locator per card."""
+    # Locator.all() resolves the match count once; nth() locators are built locally
     div_articles = page.locator("div[role='article']")
-    if div_articles.count() > 0:
-        cards.extend([div_articles.nth(i) for i in range(div_articles.count())])
-    else:
-        article_cards = page.locator("article").filter(has_text="Library ID")
-        if article_cards.count() > 0:
-            cards.extend([article_cards.nth(i) for i in range(article_cards.count())])
-        else:
-            div_cards = page.locator("div:has-text('Library ID')")
-            total_div_count = div_cards.count()
-            count = min(total_div_count, 500)
-            seen_library_ids = set()
-            for i in range(count):
-                try:
-                    loc = div_cards.nth(i)
-                    text = loc.inner_text(timeout=500)
-                    m = LIBRARY_ID_RE.search(text)
-                    if not m:
-                        continue
-                    lib_id = m.group(1)
-                    if lib_id in seen_library_ids:
-                        continue
-                    container = loc.locator("xpath=ancestor::div[@role='article'][1]")
-                    if container.count() == 0:
-                        container = loc.locator("xpath=ancestor::article[1]")
-                    chosen = container if container.count() > 0 else loc
-                    seen_library_ids.add(lib_id)
-                    cards.append(chosen)
-                except Exception:
-                    continue
-    return cards
+    cards = div_articles.all()
+    if cards:
+        return div_articles, cards
+    article_cards = page.locator("article").filter(has_text="Library ID")
+    cards = article_cards.all()
+    if cards:
+        return article_cards, cards
+    # Fallback: find card roots in-page and tag them so one locator returns them all
+    try:
+        page.evaluate(TAG_LIBRARY_ID_CARDS_JS)
+        tagged = page.locator("[data-lib-id]")
+        return tagged, tagged.all()
+    except Exception:
+        return None, []
+
+
+# Maps card elements to {text, hasVideo} in one round-trip. hasVideo mirrors the
+# checks in _detect_video_thumbnails_in_card (play overlays and <video> elements).
+CARD_SUMMARY_JS = """
+(nodes) => nodes.map((n) => {
+  const hasVideo = !!n.querySelector(
+    '[data-testid*="play"], .play-button, [class*="play"], svg[viewBox*="0 0 24 24"], video, ' +
+    '[style*="play"], [class*="Play"], [class*="playButton"]'
+  );
+  return { text: n.innerText || "", hasVideo };
+})
+"""
+
+
+# True once every image in a card has finished loading (or failed); cards without
+# images (video-only, text-only) are done immediately
+CARD_IMAGES_LOADED_JS = """
+(card) => [...card.querySelectorAll("img")].every((i) => i.complete)
+"""
+
+
+def _card_summaries(cards: Optional[Locator], count: int) -> List[Optional[dict]]:
+    """Text and video-thumbnail hint for every card, read in a single evaluate_all."""
+    try:
+        summaries = cards.evaluate_all(CARD_SUMMARY_JS)
+        # The feed may have grown since the cards were listed; indices would no longer line up
+        if len(summaries) == count:
+            return summaries
+    except Exception:
+        pass
+    return [None] * count
 
 
 def _normalize_cdn_url(u: str) -> str:
@@ -222,7 +322,33 @@ def _score_sd(w: int, h: int) -> int:
     return abs(w - target_w) + abs(h - target_h)
 
 
-def _extract_media_urls(card: Locator, page: Page) -> List[str]:
+# Runs against a card element and returns every candidate media asset in its subtree,
+# in one round-trip as parallel columns {urls, ws, hs}. Querying from the card root already scopes results
+# to nodes it contains, so no layout/geometry reads are needed. Videos report a
+# nominal 640x360 since their intrinsic size isn't known until metadata loads.
+CARD_MEDIA_JS = """
+(root) => {
+  const urls = [], ws = [], hs = [];
+  const add = (url, w, h) => { urls.push(url); ws.push(w); hs.push(h); };
+  for (const v of [...root.querySelectorAll("video")].slice(0, 3)) {
+    const src = v.getAttribute("src");
+    if (src) add(src, 640, 360);
+    for (const s of [...v.querySelectorAll("source")].slice(0, 3)) {
+      const sSrc = s.getAttribute("src");
+      if (sSrc) add(sSrc, 640, 360);
+    }
+  }
+  for (const im of [...root.querySelectorAll("img[src]")].slice(0, 30)) {
+    const src = im.getAttribute("src");
+    if (!src || src.startsWith("data:")) continue;
+    add(src, im.naturalWidth || im.clientWidth || 0, im.naturalHeight || im.clientHeight || 0);
+  }
+  return { urls, ws, hs };
+}
+"""
+
+
+def _extract_media_urls(card: Locator) -> List[str]:
     """Return exactly one primary creative URL per card in SD quality.
     Heuristic: If a sufficiently large video exists, pick the single video whose
     dimensions are closest to ~640x360. Otherwise, pick the single largest image
@@ -230,68 +356,13 @@ def _extract_media_urls(card: Locator, page: Page) -> List[str]:
     """
     candidates: List[tuple[str, str, int, int]] = []  # (url, base, w, h)
 
-    # Limit assets to elements whose center lies within the card box
+    # Gather videos, video sources and images inside the card in a single evaluate
     try:
-        card_bb = card.bounding_box() or {}
+        found = card.evaluate(CARD_MEDIA_JS) or {}
     except Exception:
-        card_bb = {}
-    cx0 = float(card_bb.get("x") or 0)
-    cy0 = float(card_bb.get("y") or 0)
-    cw = float(card_bb.get("width") or 0)
-    ch = float(card_bb.get("height") or 0)
-
-    def _is_inside(elem: Locator) -> bool:
-        try:
-            bb = elem.bounding_box() or {}
-            ex = float(bb.get("x") or 0) + float(bb.get("width") or 0) / 2.0
-            ey = float(bb.get("y") or 0) + float(bb.get("height") or 0) / 2.0
-            return (cx0 <= ex <= cx0 + cw) and (cy0 <= ey <= cy0 + ch)
-        except Exception:
-            return True
-
-    # Simple video detection - just look for basic video elements
-    try:
-        vids = card.locator("video")
-        for i in range(min(3, vids.count())):
-            v = vids.nth(i)
-            if not _is_inside(v):
-                continue
-            
-            # Get video source
-            src = v.get_attribute("src")
-            if src:
-                candidates.append((src, _normalize_cdn_url(src), 640, 360))
-            
-            # Check video sources
-            try:
-                sources = v.locator("source")
-                for j in range(min(3, sources.count())):
-                    s_src = sources.nth(j).get_attribute("src")
-                    if s_src:
-                        candidates.append((s_src, _normalize_cdn_url(s_src), 640, 360))
-            except Exception:
-                pass
-    except Exception:
-        pass
-
-    # Images
-    try:
-        imgs = card.locator("img[src]")
-        for i in range(min(30, imgs.count())):
-            im = imgs.nth(i)
-            if not _is_inside(im):
-                continue
-            src = im.get_attribute("src")
-            if not src or src.startswith("data:"):
-                continue
-            try:
-                dims = im.evaluate("el => ({w: el.naturalWidth || el.clientWidth || 0, h: el.naturalHeight || el.clientHeight || 0})")
-            except Exception:
-                dims = {"w": 0, "h": 0}
-            base = _normalize_cdn_url(src)
-            candidates.append((src, base, int(dims.get("w", 0) or 0), int(dims.get("h", 0) or 0)))
-    except Exception:
-        pass
+        found = {}
+    for src, w, h in zip(found.get("urls", ()), found.get("ws", ()), found.get("hs", ())):
+        candidates.append((src, _normalize_cdn_url(src), int(w or 0), int(h or 0)))
 
     # Choose a single best candidate overall, preferring videos if present
     best_url = None
@@ -323,11 +394,11 @@ def _extract_media_urls(card: Locator, page: Page) -> List[str]:
 
 
 def _safe_name(name: str) -> str:
-    return re.sub(r"[^a-zA-Z0-9._-]", "_", name or "file")
+    return UNSAFE_NAME_RE.sub("_", name or "file")
 
 
 def _guess_ext(url: str, ctype: str) -> str:
-    m = re.search(r"\.([a-z0-9]{2,4})(?:[\?#]|$)", url, re.I)
+    m = URL_EXT_RE.search(url)
     if m:
         return "." + m.group(1).lower()
     if "mp4" in ctype: return ".mp4"
@@ -338,30 +409,91 @@ def _guess_ext(url: str, ctype: str) -> str:
     return ""
 
 
-def _download_media(context, url: str, base_name: str, idx: int, out_dir: str) -> Optional[str]:
+def _request_headers(context, page: Page) -> dict:
+    """Headers that let a plain HTTP client fetch media the way the browser session would."""
+    headers = {}
     try:
-        # Download via Playwright request
-        resp = context.request.get(url)
-        if not resp.ok:
+        headers["User-Agent"] = page.evaluate("navigator.userAgent")
+        headers["Referer"] = page.url
+        cookies = context.cookies()
+        if cookies:
+            headers["Cookie"] = "; ".join(f"{c['name']}={c['value']}" for c in cookies)
+    except Exception:
+        pass
+    return headers
+
+
+def _media_path(out_dir: str, base_name: str, idx: int, ext: str) -> str:
+    fname = f"{base_name}{'' if idx == 1 else f'_{idx}'}{ext}"
+    return os.path.join(out_dir, _safe_name(fname))
+
+
+def _download_media(url: str, headers: dict, base_name: str, idx: int, out_dir: str) -> Optional[str]:
+    # Runs on worker threads, so it must not touch the (thread-bound) Playwright objects
+    try:
+        req = urllib.request.Request(url, headers=headers)
+        with urllib.request.urlopen(req, timeout=60) as resp:
+            ctype = (resp.headers.get("content-type") or "").lower()
+            out_path = _media_path(out_dir, base_name, idx, _guess_ext(url, ctype) or ".bin")
+            # Stream to disk so a large video never sits in memory whole
+            with open(out_path, "wb") as f:
+                shutil.copyfileobj(resp, f, CHUNK_SIZE)
+        return out_path
+    except Exception:
+        return None
+
+
+def _link_media(source: Future, base_name: str, idx: int, out_dir: str) -> Optional[str]:
+    """Give an already-downloaded asset this card's name instead of fetching it again."""
+    try:
+        src = source.result()
+        if not src:
             return None
-        body = resp.body()
-        ctype = (resp.headers.get("content-type") or "").lower()
-        
-        ext = _guess_ext(url, ctype) or ".bin"
-        fname = f"{base_name}{'' if idx == 1 else f'_{idx}'}{ext}"
-        out_path = os.path.join(out_dir, _safe_name(fname))
-        with open(out_path, "wb") as f:
-            f.write(body)
+        out_path = _media_path(out_dir, base_name, idx, os.path.splitext(src)[1])
+        if out_path == src:
+            return src
+        try:
+            if os.path.exists(out_path):
+                os.remove(out_path)
+            os.link(src, out_path)
+        except OSError:
+            # Hard links can fail across devices or on some filesystems
+            shutil.copyfile(src, out_path)
         return out_path
     except Exception:
         return None
 
 
+def _collect_downloads(pending: list, seen_ids: set, wait: bool) -> list:
+    """Fill in media_files for queued cards whose downloads have finished (all of them if wait).
+    Only cards that saved at least one media file are recorded in seen_ids; the others
+    can be queued again when they are next seen. Returns the entries still in flight.
+    """
+    in_flight = []
+    for parsed, futures in pending:
+        if not wait and not all(f.done() for f in futures):
+            in_flight.append((parsed, futures))
+            continue
+        parsed.media_files = [sp for sp in (f.result() for f in futures) if sp]
+        if parsed.media_files:
+            seen_ids.add(parsed.library_id)
+    return in_flight
+
+
+def _write_json(data, out_path: str) -> None:
+    """Write pretty-printed JSON, using orjson when it is installed."""
+    if orjson is not None:
+        with open(out_path, "wb") as f:
+            f.write(orjson.dumps(data, option=orjson.OPT_INDENT_2))
+        return
+    with open(out_path, "w", encoding="utf-8") as f:
+        json.dump(data, f, ensure_ascii=False, indent=2)
+
+
 def _save_summary(rows: List[AdCard], out_dir: str) -> None:
     try:
         out_path = os.path.join(out_dir, "ads_summary.json")
-        with open(out_path, "w", encoding="utf-8") as f:
-            json.dump([asdict(r) for r in rows], f, ensure_ascii=False, indent=2)
+        _write_json([asdict(r) for r in rows], out_path)
     except Exception:
         pass
 
@@ -384,8 +516,7 @@ def _save_ad_cards_json(rows: List[AdCard], out_dir: str) -> None:
                 })
         
         ad_cards_path = os.path.join(out_dir, "ad_cards.json")
-        with open(ad_cards_path, "w", encoding="utf-8") as f:
-            json.dump(ad_cards_data, f, indent=2, ensure_ascii=False)
+        _write_json(ad_cards_data, ad_cards_path)
     except Exception:
         pass
 
@@ -401,10 +532,18 @@ def _is_media_response(response) -> bool:
     return False
 
 
+def _block_unneeded_resources(context) -> None:
+    """Abort font and beacon requests on every page of the context."""
+    context.route(BLOCKED_URL_RE, lambda route: route.abort())
+
+
 def _setup_network_interception(page: Page, out_dir: str, video_queue: list) -> None:
     """Save all video responses and queue them for Library ID association.
-    video_queue: list of (video_path, timestamp) tuples
+    video_queue: list of (video_path, timestamp, ext) tuples
     """
+    # Normalized URLs already saved; the CDN re-serves the same video as the feed scrolls
+    seen_video_urls = set()
+
     def save_video_response(response):
         try:
             url = response.url
@@ -413,10 +552,16 @@ def _setup_network_interception(page: Page, out_dir: str, video_queue: list) ->
             # Only process video responses
             if not ("video" in ctype or any(ext in url.lower() for ext in ['.mp4', '.webm', '.mov', '.m3u8'])):
                 return
+
+            norm = _normalize_cdn_url(url)
+            if norm in seen_video_urls:
+                return
+            seen_video_urls.add(norm)
             
-            # Generate temporary filename
+            # Generate temporary filename; the response already tells us the container type
+            ext = _guess_ext(url, ctype) or ".mp4"
             timestamp = datetime.now().strftime("%H%M%S_%f")
-            filename = f"temp_video_{timestamp}.mp4"
+            filename = f"temp_video_{timestamp}{ext}"
             out_path = os.path.join(out_dir, filename)
             
             try:
@@ -425,7 +570,7 @@ def _setup_network_interception(page: Page, out_dir: str, video_queue: list) ->
                     f.write(body)
                 
                 # Add to queue for later Library ID assignment
-                video_queue.append((out_path, datetime.now()))
+                video_queue.append((out_path, datetime.now(), ext))
                 return out_path
             except Exception as e:
                 return None
@@ -437,27 +582,12 @@ def _setup_network_interception(page: Page, out_dir: str, video_queue: list) ->
 def _detect_video_thumbnails_in_card(page: Page, card) -> bool:
     """Detect if a card has a video thumbnail by looking for play button overlays."""
     try:
-        # Look for play button icons within the card
-        play_buttons = card.locator('[data-testid*="play"], .play-button, [class*="play"], svg[viewBox*="0 0 24 24"]')
-        if play_buttons.count() > 0:
-            return True
-        
-        # Look for video elements within the card
-        videos = card.locator('video')
-        if videos.count() > 0:
-            return True
-            
-        # Look for elements with play button styling
-        play_elements = card.locator('[style*="play"], [class*="Play"], [class*="playButton"]')
-        if play_elements.count() > 0:
-            return True
-            
-        # Check if the card contains any video-related attributes
-        card_html = card.inner_html()
-        if any(indicator in card_html.lower() for indicator in ['play', 'video', 'mp4', 'webm']):
-            return True
-            
-        return False
+        # Play button icons, <video> elements and play-button styling, in a single count()
+        indicators = card.locator(
+            '[data-testid*="play"], .play-button, [class*="play"], svg[viewBox*="0 0 24 24"], '
+            'video, [style*="play"], [class*="Play"], [class*="playButton"]'
+        )
+        return indicators.count() > 0
     except Exception:
         return False
 
@@ -480,144 +610,63 @@ def _assign_videos_to_library_ids_precise(out_dir: str, results: List[AdCard], v
     video_library_ids.sort(key=lambda x: x[1])
     video_library_ids = [lib_id for lib_id, _ in video_library_ids]
     
+    # First card per Library ID, so each assignment is a dict lookup instead of a scan
+    cards_by_id = {}
+    for card in results:
+        if card.library_id:
+            cards_by_id.setdefault(card.library_id, card)
+
     # Assign videos to cards that have video thumbnails
     video_index = 0
     for lib_id in video_library_ids:
         if video_index < len(video_queue):
-            video_path, timestamp = video_queue[video_index]
-            
-            # Check if the temp video file still exists
-            if not os.path.exists(video_path):
-                video_index += 1
-                continue
-            
-            # Determine file extension by reading file header
-            try:
-                with open(video_path, 'rb') as f:
-                    header = f.read(12)
-                    if header.startswith(b'\x00\x00\x00\x20ftypmp42') or header.startswith(b'\x00\x00\x00\x18ftypmp41'):
-                        ext = '.mp4'
-                    elif header.startswith(b'RIFF') and b'WEBM' in header:
-                        ext = '.webm'
-                    elif header.startswith(b'\x00\x00\x00\x14ftypqt'):
-                        ext = '.mov'
-                    else:
-                        ext = '.mp4'  # Default
-            except Exception:
-                ext = '.mp4'  # Default if can't read header
+            video_path, timestamp, ext = video_queue[video_index]
             
             # Rename video with Library ID
             new_name = f"{lib_id}{ext}"
             new_path = os.path.join(out_dir, new_name)
             
-            # Remove existing file if it exists
-            if os.path.exists(new_path):
-                try:
-                    os.remove(new_path)
-                except Exception:
-                    pass
-            
             try:
-                os.rename(video_path, new_path)
+                # Atomically overwrites any existing file; a missing temp file raises and is skipped
+                os.replace(video_path, new_path)
                 
                 # Update the card's media_files list
-                for card in results:
-                    if card.library_id == lib_id:
-                        if not card.media_files:
-                            card.media_files = []
-                        card.media_files.append(new_path)
-                        break
+                card = cards_by_id.get(lib_id)
+                if card:
+                    if not card.media_files:
+                        card.media_files = []
+                    card.media_files.append(new_path)
                 
                 video_index += 1
                 
             except Exception as e:
                 video_index += 1
     
-    # Remove any remaining temp videos that weren't assigned
-    import glob
-    temp_videos = glob.glob(os.path.join(out_dir, "temp_video_*"))
-    for temp_video in temp_videos:
-        try:
-            if os.path.exists(temp_video):
-                os.remove(temp_video)
-        except Exception:
-            pass
-
-
-def _assign_videos_to_library_ids(out_dir: str, results: List[AdCard], video_queue: list) -> None:
-    """Assign videos to Library IDs based on visual detection of video thumbnails."""
-    if not video_queue:
-        print("[DEBUG] No videos in queue to assign")
-        return
-    
-    print(f"[DEBUG] Assigning {len(video_queue)} videos to Library IDs")
-    
-    # Sort video queue by timestamp (earliest first)
-    video_queue.sort(key=lambda x: x[1])
-    
-    # Create a list of cards that have video thumbnails (detected during processing)
-    cards_with_videos = []
-    for card in results:
-        if card.library_id and not any('.mp4' in f or '.webm' in f or '.mov' in f for f in card.media_files):
-            cards_with_videos.append(card)
-    
-    print(f"[DEBUG] {len(cards_with_videos)} cards need videos")
-    
-    # Assign videos to cards in order
-    for i, (video_path, timestamp) in enumerate(video_queue):
-        if i < len(cards_with_videos):
-            card = cards_with_videos[i]
-            
-            # Determine file extension by reading file header
-            with open(video_path, 'rb') as f:
-                header = f.read(12)
-                if header.startswith(b'\x00\x00\x00\x20ftypmp42') or header.startswith(b'\x00\x00\x00\x18ftypmp41'):
-                    ext = '.mp4'
-                elif header.startswith(b'RIFF') and b'WEBM' in header:
-                    ext = '.webm'
-                elif header.startswith(b'\x00\x00\x00\x14ftypqt'):
-                    ext = '.mov'
-                else:
-                    ext = '.mp4'  # Default
-            
-            # Rename video with Library ID
-            new_name = f"{card.library_id}{ext}"
-            new_path = os.path.join(out_dir, new_name)
-            
-            try:
-                os.rename(video_path, new_path)
-                print(f"[Assign] Video assigned to {card.library_id}: {os.path.basename(video_path)} -> {new_name}")
-                
-                # Update the card's media_files list
-                if not card.media_files:
-                    card.media_files = []
-                card.media_files.append(new_path)
-                
-            except Exception as e:
-                print(f"[Assign] Failed to rename video for {card.library_id}: {e}")
-    
-    # Remove any remaining temp videos
-    import glob
-    temp_videos = glob.glob(os.path.join(out_dir, "temp_video_*"))
-    for temp_video in temp_videos:
-        try:
-            os.remove(temp_video)
-            print(f"[Cleanup] Removed unused temp video: {os.path.basename(temp_video)}")
-        except Exception:
-            pass
+    # Remove any remaining temp videos that weren't assigned (assigned ones were renamed away)
+    try:
+        with os.scandir(out_dir) as entries:
+            for entry in entries:
+                if entry.name.startswith("temp_video_"):
+                    try:
+                        os.remove(entry.path)
+                    except Exception:
+                        pass
+    except Exception:
+        pass
 
 
 def extract_and_download(url: str, out_dir: str, max_cards: int, scrolls: int, headless: bool) -> List[AdCard]:
     with sync_playwright() as p:
         browser = p.chromium.launch(headless=headless, args=["--disable-blink-features=AutomationControlled"])
         context = browser.new_context()
+        _block_unneeded_resources(context)
         page = context.new_page()
         page.set_default_timeout(120000)
 
         os.makedirs(out_dir, exist_ok=True)
 
         # Set up network interception to save all videos and queue them
-        video_queue = []  # List of (video_path, timestamp) tuples
+        video_queue = []  # List of (video_path, timestamp, ext) tuples
         video_card_mapping = {}  # Library ID -> (has_video_thumbnail, card_index)
         _setup_network_interception(page, out_dir, video_queue)
 
@@ -631,56 +680,88 @@ def extract_and_download(url: str, out_dir: str, max_cards: int, scrolls: int, h
 
         results: List[AdCard] = []  # Only cards with a saved media file
         seen_ids = set()
+        # Downloads run in the background while the feed keeps scrolling
+        pool = ThreadPoolExecutor(max_workers=DOWNLOAD_WORKERS)
+        pending = []  # (AdCard, [Future]) pairs awaiting their media files
+        downloaded_cache = {}  # normalized media URL -> Future of its first download
+        row_of_id = {}  # Library ID -> index of its card in results
 
         for step in range(max(1, scrolls)):
             try:
-                cards_locators = _visible_card_locators(page)
+                # Record the cards whose downloads finished; failed ones become eligible again
+                pending = _collect_downloads(pending, seen_ids, wait=False)
+                in_flight_ids = {parsed.library_id for parsed, _ in pending}
+                # Cookies rotate and the URL changes while scrolling: rebuild per batch
+                headers = _request_headers(context, page)
+                cards, cards_locators = _visible_card_locators(page)
                 total_cards = len(cards_locators)
+                summaries = _card_summaries(cards, total_cards)
 
                 for idx in range(total_cards):
                     if max_cards and len(results) >= max_cards:
                         break
                     card = cards_locators[idx]
+                    summary = summaries[idx] or {}
                     try:
-                        # Ensure card and its lazy media are in view before reading
+                        # Read the text first so already-saved ads skip the scroll and waits
+                        text = summary.get("text")
+                        parsed = _extract_card_text_fields(text if text is not None else card.inner_text())
+                        if parsed.library_id and (parsed.library_id in seen_ids or parsed.library_id in in_flight_ids):
+                            continue
+                        # A card seen before whose media all failed is re-queued in its existing row
+                        row = row_of_id.get(parsed.library_id, len(results))
+                        # Ensure card and its lazy media are in view before collecting media,
+                        # waiting only as long as its images actually take to load
+                        card_handle = None
                         try:
                             card.scroll_into_view_if_needed()
-                            # Center the card in viewport to stabilize lazy loads
-                            bb = card.bounding_box()
-                            if bb and isinstance(bb, dict) and bb.get("y") is not None:
-                                page.evaluate("window.scrollTo(0, Math.max(0, arguments[0] - window.innerHeight * 0.15))", bb.get("y"))
-                            page.wait_for_timeout(200)
+                            card_handle = card.element_handle(timeout=1000)
+                            page.wait_for_function(CARD_IMAGES_LOADED_JS, arg=card_handle, timeout=1500)
                         except Exception:
-                            page.wait_for_timeout(50)
-                        # Small extra wait to allow images/video sources to resolve
-                        page.wait_for_timeout(150)
-                        text = card.inner_text()
-                        parsed = _extract_card_text_fields(text)
-                        if parsed.library_id and parsed.library_id in seen_ids:
-                            continue
+                            pass
+                        finally:
+                            # Handles live until disposed; one per card would pile up over the scroll
+                            if card_handle is not None:
+                                try:
+                                    card_handle.dispose()
+                                except Exception:
+                                    pass
+                        if not parsed.started_running:
+                            # Off-screen cards may not have rendered their date line yet
+                            parsed = _extract_card_text_fields(card.inner_text())
                         # Detect if this card has a video thumbnail
-                        has_video_thumbnail = _detect_video_thumbnails_in_card(page, card)
+                        has_video_thumbnail = summary.get("hasVideo")
+                        if has_video_thumbnail is None:
+                            has_video_thumbnail = _detect_video_thumbnails_in_card(page, card)
                         if parsed.library_id:
-                            video_card_mapping[parsed.library_id] = (has_video_thumbnail, len(results))
+                            video_card_mapping[parsed.library_id] = (has_video_thumbnail, row)
                         
                         # Collect media and download
-                        media_urls = _extract_media_urls(card, page)
+                        media_urls = _extract_media_urls(card)
                         parsed.media_urls = media_urls or []
                         parsed.media_files = []
                         
-                        # Download images with Library ID names
+                        # Queue downloads with Library ID names; files are collected after scrolling
                         if parsed.library_id and media_urls:
-                            saved = []
+                            futures = []
                             for n, murl in enumerate(media_urls, start=1):
-                                sp = _download_media(context, murl, parsed.library_id, n, out_dir)
-                                if sp:
-                                    saved.append(sp)
-                            parsed.media_files = saved
-
-                        # Only count/record cards that actually saved at least one media file
-                        if parsed.library_id and parsed.media_files:
-                            seen_ids.add(parsed.library_id)
-                        results.append(parsed)
+                                base = _normalize_cdn_url(murl)
+                                cached = downloaded_cache.get(base)
+                                if cached is not None and not (cached.done() and not cached.result()):
+                                    # Same creative reused by another ad: link the saved file
+                                    fut = pool.submit(_link_media, cached, parsed.library_id, n, out_dir)
+                                else:
+                                    fut = pool.submit(_download_media, murl, headers, parsed.library_id, n, out_dir)
+                                    downloaded_cache[base] = fut
+                                futures.append(fut)
+                            pending.append((parsed, futures))
+                            in_flight_ids.add(parsed.library_id)
+                        if row < len(results):
+                            results[row] = parsed
+                        else:
+                            if parsed.library_id:
+                                row_of_id[parsed.library_id] = row
+                            results.append(parsed)
                     except Exception:
                         continue
 
@@ -697,6 +778,10 @@ def extract_and_download(url: str, out_dir: str, max_cards: int, scrolls: int, h
 
         # Wait a moment to let any in-flight network responses finish saving
         page.wait_for_timeout(5000)
+
+        # Collect the queued downloads before videos are matched to cards
+        _collect_downloads(pending, seen_ids, wait=True)
+        pool.shutdown()
         
         # Assign saved videos to Library IDs using precise mapping
         _assign_videos_to_library_ids_precise(out_dir, results, video_queue, video_card_mapping)
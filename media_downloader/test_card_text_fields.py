@@ -0,0 +1,24 @@
+import os
+import sys
+
+import pytest
+
+pytest.importorskip("playwright")
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from fb_ad_full_media_metadata_download import _extract_card_text_fields
+
+
+def test_status_on_single_started_line():
+    # The status word only appears inside the "Started running on ... · Total active time ..." line
+    card = _extract_card_text_fields("Library ID: 123\nStarted running on Oct 8, 2025 · Total active time 14 hrs")
+    assert card.library_id == "123"
+    assert card.status == "Active"
+    assert card.started_running == "08 Oct 2025"
+    assert card.total_active_time == "14 hrs"
+
+
+def test_status_after_started_only_line():
+    card = _extract_card_text_fields("Library ID: 456\nStarted running on Oct 8, 2025 Inactive")
+    assert card.library_id == "456"
+    assert card.status == "Inactive"
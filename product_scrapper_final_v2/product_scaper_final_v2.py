@@ -20,52 +20,136 @@ Key Enhancements:
 - Opens product pages in new tabs, scrapes, then closes them
 - Continues from where it left off after scraping buy button pages
 - NEW: Comprehensive buying options detection
+- Crawls several pages concurrently (async Playwright, --concurrency)
+
+Every scraped product is appended to products.ndjson (one JSON object per line) as
+soon as it is extracted, so partial results survive an interrupted crawl. JSON-LD
+parsing and these lines use ``orjson`` when it is installed, otherwise the stdlib
+``json`` module.
 
 Usage:
   python scrapper/product_scraper_final_v2.py "https://example.com" \
     --out-dir product_data \
     --max-pages 20 \
     --headless \
-    --buying-options
+    --buying-options \
+    --concurrency 4
 """
 
 from __future__ import annotations
 
 import argparse
+import asyncio
+import functools
+import io
 import json
 import os
 import re
 import time
 from dataclasses import dataclass, asdict
 from datetime import datetime
-from typing import List, Optional, Dict, Set
+from typing import List, Optional, Dict, Sequence, Set
 from urllib.parse import urljoin, urlparse, urlunparse
 
-from playwright.sync_api import sync_playwright, Page, BrowserContext
+from playwright.async_api import async_playwright, Page, BrowserContext
+
+try:
+    import orjson  # optional: pip install orjson
+except ImportError:
+    orjson = None
+
+try:
+    from PIL import Image  # optional: pip install Pillow (needed for PNG conversion)
+except ImportError:
+    Image = None
 
+# Ports dropped from the host by normalize_url
+DEFAULT_PORTS = {'http': ':80', 'https': ':443'}
+
+# Click-tracking query parameters stripped by normalize_url (utm_* is matched by prefix)
+TRACKING_PARAMS = {'gclid', 'fbclid'}
 
 def normalize_url(url: str) -> str:
     """
     Normalize URL by removing fragments (hash) and trailing slashes.
     This prevents treating the same page with different hash fragments as different pages.
     
+    The host is lowercased, default ports are dropped, tracking parameters
+    (utm_*, gclid, fbclid) are removed and the remaining query parameters are
+    sorted, so equivalent links collapse to a single frontier entry.
+    
     Example:
         https://example.com/page#section1 -> https://example.com/page
         https://example.com/page#section2 -> https://example.com/page
+        https://Example.com:443/page?b=2&utm_source=x&a=1 -> https://example.com/page?a=1&b=2
     """
     parsed = urlparse(url)
+    scheme = parsed.scheme.lower()
+    netloc = parsed.netloc.lower()
+    default_port = DEFAULT_PORTS.get(scheme)
+    if default_port and netloc.endswith(default_port):
+        netloc = netloc[:-len(default_port)]
+    # Sort raw key=value pairs so the original percent-encoding is kept
+    query = '&'.join(sorted(
+        pair for pair in parsed.query.split('&')
+        if pair and not _is_tracking_param(pair.split('=', 1)[0])
+    ))
     # Remove fragment and rebuild URL
     normalized = urlunparse((
-        parsed.scheme,
-        parsed.netloc,
+        scheme,
+        netloc,
         parsed.path.rstrip('/') if parsed.path != '/' else parsed.path,
         parsed.params,
-        parsed.query,
+        query,
         ''  # Remove fragment
     ))
     return normalized
 
 
+def _is_tracking_param(name: str) -> bool:
+    """True for analytics/ad click parameters that don't change page content."""
+    name = name.lower()
+    return name.startswith('utm_') or name in TRACKING_PARAMS
+
+
+def _loads_json(text: str):
+    """Parse JSON, using orjson when it is installed."""
+    if orjson is not None:
+        return orjson.loads(text)
+    return json.loads(text)
+
+
+def _ndjson_line(obj) -> bytes:
+    """Serialize a dataclass to one newline-terminated JSON line, using orjson when it is installed."""
+    if orjson is not None:
+        return orjson.dumps(obj, option=orjson.OPT_APPEND_NEWLINE)
+    return (json.dumps(asdict(obj), ensure_ascii=False) + "\n").encode("utf-8")
+
+
+@functools.lru_cache(maxsize=4)
+def _format_second(second: int, fmt: str) -> str:
+    """Format a whole epoch second in local time (cached: many pages share a second)."""
+    return datetime.fromtimestamp(second).strftime(fmt)
+
+
+def _now(fmt: str = "%Y-%m-%d %H:%M:%S") -> str:
+    """Current local time formatted with fmt, rebuilt at most once per second."""
+    return _format_second(int(time.time()), fmt)
+
+
+@functools.cache
+def _ensure_dir(path: str) -> str:
+    """Create path (and parents) the first time it is requested; returns path."""
+    os.makedirs(path, exist_ok=True)
+    return path
+
+
+def _origin(url: str) -> str:
+    """Return scheme://netloc for url."""
+    parsed = urlparse(url)
+    return f"{parsed.scheme}://{parsed.netloc}"
+
+
 @dataclass
 class BuyingOption:
     """Represents a buying option for a product."""
@@ -108,14 +192,37 @@ class PageData:
     links_found: List[str]
 
 
-# Price detection patterns
-PRICE_PATTERNS = [
-    re.compile(r'\$\s*(\d+(?:,\d{3})*(?:\.\d{2})?)', re.I),  # $99.99, $1,299.99
-    re.compile(r'(\d+(?:,\d{3})*(?:\.\d{2})?)\s*(?:USD|EUR|GBP)', re.I),  # 99.99 USD
-    re.compile(r'(?:USD|EUR|GBP)\s*(\d+(?:,\d{3})*(?:\.\d{2})?)', re.I),  # USD 99.99
-    re.compile(r'£\s*(\d+(?:,\d{3})*(?:\.\d{2})?)', re.I),  # £99.99
-    re.compile(r'€\s*(\d+(?:,\d{3})*(?:\.\d{2})?)', re.I),  # €99.99
-]
+# Price detection: $99.99 / £99.99 / €99.99, 99.99 USD, USD 99.99 (one pass, leftmost match wins)
+PRICE_RE = re.compile(
+    r'(?P<symbol>[$£€])\s*(?P<amount>\d[\d,]*(?:\.\d{2})?)'
+    r'|(?P<amount_before_code>\d[\d,]*(?:\.\d{2})?)\s*(?P<code>USD|EUR|GBP)'
+    r'|(?P<code_before_amount>USD|EUR|GBP)\s*(?P<amount_after_code>\d[\d,]*(?:\.\d{2})?)',
+    re.I
+)
+
+# Prices in subscription option text, e.g. "$47.34" (symbol directly before the amount)
+SUBSCRIPTION_PRICE_RE = re.compile(r'([$£€])(\d+(?:\.\d{2})?)')
+
+# Price in buying-option text (optional symbol), e.g. "3 Bottles - $89.99" -> "89.99"
+OPTION_PRICE_RE = re.compile(r'[\$£€]?(\d+(?:\.\d{2})?)')
+
+# First number in buying-option text, used as the quantity
+OPTION_QUANTITY_RE = re.compile(r'(\d+)')
+
+# File extension at the end of a URL path (before any query/fragment)
+URL_EXT_RE = re.compile(r"\.([a-z0-9]{2,4})(?:[\?#]|$)", re.I)
+
+# Characters not allowed in saved media filenames
+UNSAFE_FILENAME_RE = re.compile(r"[^a-zA-Z0-9._-]")
+
+# bytes.translate table for _safe_name: every byte outside [a-zA-Z0-9._-] becomes "_"
+SAFE_FILENAME_TABLE = bytes(
+    c if c < 128 and (chr(c).isalnum() or chr(c) in "._-") else ord("_") for c in range(256)
+)
+
+# Leading bytes of every PNG file; such downloads are saved without re-encoding when
+# they are already what _to_png_bytes produces (see _is_plain_rgb_png)
+PNG_SIGNATURE = b"\x89PNG\r\n\x1a\n"
 
 # Currency symbols
 CURRENCY_MAP = {
@@ -124,80 +231,517 @@ CURRENCY_MAP = {
     '€': 'EUR',
 }
 
+# Number of pages crawled concurrently (the work is dominated by network/JS waits)
+MAX_PARALLEL_PAGES = 4
+
+# Media downloads in flight at once per product (latency-bound HTTP fetches)
+MAX_PARALLEL_DOWNLOADS = 8
+
+# Pages served by a pooled browser context before it is closed and replaced
+MAX_CONTEXT_USES = 50
+
+# Resource types aborted on discovery pages (only links and product signals are needed there)
+BLOCKED_RESOURCE_TYPES = {"image", "font", "media", "stylesheet", "texttrack"}
+
+# Resource types aborted on product pages; images (main-image sizing, screenshots) and CSS (layout) still load
+PRODUCT_BLOCKED_RESOURCE_TYPES = {"font", "media", "texttrack"}
+
+# URL fragments that rule out a product page (listing, regional store and account pages)
+PRODUCT_PAGE_EXCLUDE_RE = re.compile("|".join(map(re.escape, [
+    '/shop',
+    '/category',
+    '/categories',
+    '/collection',
+    '/collections',
+    '/search',
+    '?__geom=',  # Country selector parameters
+    '/en-us',    # US store
+    '/en-au',    # Australian store
+    '/en-ca',    # Canadian store
+    '/en-ie',    # Irish store
+    '/en-eu',    # EU store
+    '/en-nz',    # New Zealand store
+    '/de-de',    # German store
+    '/fr-fr',    # French store
+    '/es-es',    # Spanish store
+    '/it-it',    # Italian store
+    '/cart',
+    '/checkout',
+    '/account',
+    '/login',
+    '/register',
+])))
+
+# Country selector / regional store URLs skipped by _extract_links (prevents looping through country stores)
+REGIONAL_URL_RE = re.compile("|".join(map(re.escape, [
+    '?__geom=',  # Country selector parameter
+    '/en-us',    # US store
+    '/en-au',    # Australian store
+    '/en-ca',    # Canadian store
+    '/en-ie',    # Irish store
+    '/en-eu',    # EU store
+    '/en-nz',    # New Zealand store
+    '/de-de',    # German store
+    '/fr-fr',    # French store
+    '/es-es',    # Spanish store
+    '/it-it',    # Italian store
+])), re.I)
+
+# Product URL patterns; a product ID/slug must follow (not just /products)
+PRODUCT_URL_RE = re.compile(
+    r'(?P<pattern>/product/|/products/|/supplement/|/supplements/|/item/|/p/|/dp/)/*[^/]'
+)
+
+# Navigation timeout; pages wait for DOMContentLoaded, then for the content markup below
+NAVIGATION_TIMEOUT_MS = 15000
+
+# Upper bound on the explicit content waits below (network idle ends them early)
+CONTENT_WAIT_TIMEOUT_MS = 5000
+
+# Element whose presence means a discovery page has rendered its content: links in the
+# main area or in product cards (header/nav links and <h1> are there before any content)
+PAGE_READY_SELECTOR = (
+    'main a[href], [role="main"] a[href], [class*="product"] a[href], '
+    '[data-product-id], [itemtype*="schema.org/Product"]'
+)
+
+# Element whose presence means a product page has rendered its price/title
+PRODUCT_READY_SELECTOR = '[itemprop="price"], [class*="price"], h1'
+
+# True once every <img> on the page has finished loading (or failed)
+IMAGES_COMPLETE_JS = "() => Array.from(document.images).every(img => img.complete)"
+
+# Upper bound on the in-page scroll (infinite-scroll pages never settle)
+SCROLL_TIME_LIMIT_MS = 30000
+
+# Scroll a viewport at a time; at the bottom, stop once scrollHeight is unchanged for two 200ms checks
+SCROLL_TO_STABLE_HEIGHT_JS = """
+async (timeLimitMs) => {
+    const sleep = ms => new Promise(r => setTimeout(r, ms));
+    const deadline = Date.now() + timeLimitMs;
+    let y = 0, lastHeight = 0, stable = 0;
+    while (Date.now() < deadline) {
+        y += Math.max(window.innerHeight, 1000);
+        window.scrollTo(0, y);
+        await sleep(50);
+        const height = document.body.scrollHeight;
+        if (y + window.innerHeight < height) continue;
+        if (height === lastHeight) {
+            if (++stable >= 2) break;
+        } else {
+            lastHeight = height;
+            stable = 0;
+        }
+        y = height;
+        await sleep(200);
+    }
+    return document.body.scrollHeight;
+}
+"""
+
+# Product-page signals collected in one evaluate for _is_product_page
+PRODUCT_SIGNALS_JS = """
+() => {
+    const og = document.querySelector('meta[property="og:type"]');
+    return {
+        schemaProduct: !!document.querySelector('[itemtype*="schema.org/Product"]'),
+        ogType: og ? og.getAttribute('content') : null,
+        jsonLd: Array.from(document.querySelectorAll('script[type="application/ld+json"]'), s => s.textContent),
+        buy: Array.from(document.querySelectorAll('button')).some(
+            b => /add to cart|buy now|add to bag/i.test((b.textContent || '').replace(/\\s+/g, ' '))),
+        price: !!document.querySelector('[class*="price"], [id*="price"], [data-testid*="price"]'),
+        title: !!document.querySelector('h1[class*="product"], h1[itemprop="name"]'),
+    };
+}
+"""
+
+# Buying options, Strategy 1: quantity selectors
+QUANTITY_OPTION_SELECTORS = (
+    'select[name*="quantity"]',
+    'select[id*="quantity"]',
+    '[class*="quantity"] select',
+    '[class*="qty"] select',
+    'select[data-quantity]',
+    '.quantity-selector select',
+    '.qty-selector select',
+    # Radio buttons for quantities
+    'input[type="radio"][name*="quantity"]',
+    'input[type="radio"][id*="quantity"]',
+    '[class*="quantity"] input[type="radio"]',
+    '[class*="qty"] input[type="radio"]',
+    # Button groups for quantities
+    '[class*="quantity"] button',
+    '[class*="qty"] button',
+    '.quantity-option',
+    '.qty-option',
+)
+
+# Buying options, Strategy 2: subscription options
+SUBSCRIPTION_OPTION_SELECTORS = (
+    'input[type="radio"][name*="subscription"]',
+    'input[type="radio"][name*="recurring"]',
+    '[class*="subscription"] input[type="radio"]',
+    '[class*="recurring"] input[type="radio"]',
+    '.subscription-option',
+    '.recurring-option',
+    'select[name*="subscription"]',
+    'select[name*="recurring"]',
+)
+
+# Buying options, Strategy 3: product variants (size, flavor, etc.)
+VARIANT_OPTION_SELECTORS = (
+    'select[name*="variant"]',
+    'select[name*="option"]',
+    '[class*="variant"] select',
+    '[class*="option"] select',
+    'input[type="radio"][name*="variant"]',
+    'input[type="radio"][name*="option"]',
+    '.variant-selector select',
+    '.option-selector select',
+    '.product-variant',
+    '.variant-option',
+)
+
+# Buying options, Strategy 4: pricing tiers or bundles
+PRICING_TIER_OPTION_SELECTORS = (
+    '[class*="pricing-tier"]',
+    '[class*="bundle-option"]',
+    '[class*="package-option"]',
+    '.pricing-option',
+    '.bundle-selector',
+    '.package-selector',
+)
+
+# Every buying-option selector, classified in one pass by OPTION_ELEMENTS_JS
+ALL_OPTION_SELECTORS = (
+    QUANTITY_OPTION_SELECTORS
+    + SUBSCRIPTION_OPTION_SELECTORS
+    + VARIANT_OPTION_SELECTORS
+    + PRICING_TIER_OPTION_SELECTORS
+)
+
+# One querySelectorAll over all selectors; each match is described once (attributes, text,
+# label, <option>s) and its index recorded under every selector it matches. Labels come
+# from a label[for] index built once, then the closest ancestor <label>.
+OPTION_ELEMENTS_JS = """
+selectors => {
+    const labelsFor = new Map();
+    for (const l of document.querySelectorAll('label[for]')) {
+        if (!labelsFor.has(l.htmlFor)) labelsFor.set(l.htmlFor, l);
+    }
+    const describe = el => {
+        const id = el.getAttribute('id');
+        let label = id !== null ? labelsFor.get(id) || null : null;
+        if (!label && el.parentElement) label = el.parentElement.closest('label');
+        return {
+            type: el.getAttribute('type'),
+            value: el.getAttribute('value'),
+            dataValue: el.getAttribute('data-value'),
+            cls: el.getAttribute('class'),
+            text: el.innerText || '',
+            checked: !!el.checked,
+            labelText: label ? label.innerText : null,
+            options: Array.from(el.querySelectorAll('option'), o => ({value: o.getAttribute('value'), text: o.innerText || ''})),
+        };
+    };
+    const elements = [];
+    const matches = selectors.map(() => []);
+    for (const el of document.querySelectorAll(selectors.join(', '))) {
+        let index = -1;
+        selectors.forEach((selector, i) => {
+            if (!el.matches(selector)) return;
+            if (index < 0) {
+                index = elements.length;
+                elements.push(describe(el));
+            }
+            matches[i].push(index);
+        });
+    }
+    return {elements, matches};
+}
+"""
+
+# Schema.org itemprop fields read by _extract_product_data
+SCHEMA_ITEMPROPS = ('name', 'price', 'priceCurrency', 'description', 'sku', 'brand', 'availability')
+
+# Fallback price elements, tried in order when neither Schema.org nor JSON-LD gives a price
+PRICE_FALLBACK_SELECTORS = (
+    '[class*="price"]',
+    '[id*="price"]',
+    '[data-testid*="price"]',
+    '.product-price',
+    '#product-price',
+)
+
+# Every DOM read _extract_product_data needs, in one round-trip: the first element of each
+# itemprop as {text, content} (missing itemprops omitted), the JSON-LD script bodies, the
+# h1 and document titles, and the text of the first match of each fallback price selector
+PRODUCT_FIELDS_JS = """
+({itemprops, priceSelectors}) => {
+    const schema = {};
+    for (const prop of itemprops) {
+        const el = document.querySelector('[itemprop="' + prop + '"]');
+        if (el) schema[prop] = {text: el.innerText || '', content: el.getAttribute('content')};
+    }
+    const h1 = document.querySelector('h1');
+    return {
+        schema,
+        jsonLd: Array.from(document.querySelectorAll('script[type="application/ld+json"]'), s => s.textContent),
+        heading: h1 ? h1.innerText : null,
+        title: document.title,
+        priceTexts: priceSelectors.map(selector => {
+            const el = document.querySelector(selector);
+            return el ? el.innerText || '' : null;
+        }),
+    };
+}
+"""
+
+# Main product image, Strategy 1: dosage/size variants in the product name, e.g. "720mg", "2.5 oz", "1000 IU"
+VARIANT_RE = re.compile(r'(?<![\d.])(\d+(?:\.\d+)?)\s*(mcg|mg|ml|oz|iu|g)\b', re.I)
+
+# Main product image, Strategy 2: product-specific image containers (first match of each)
+MAIN_IMAGE_CONTAINER_SELECTORS = (
+    '.product-image',
+    '.product-photo', 
+    '.product-gallery',
+    '.main-image',
+    '.hero-image',
+    '[class*="product"][class*="image"]',
+    '[class*="main"][class*="image"]',
+    '.product-single__photo',
+    '.product__media',
+    '[data-product-image]',
+    # More specific product image selectors
+    '.product-main-image',
+    '.product-hero-image',
+    '.product-primary-image',
+    '.main-product-image',
+    '[class*="product-main"]',
+    '[class*="product-hero"]',
+    '[class*="product-primary"]',
+    '[class*="main-product"]',
+)
+
+# Main product image, Strategy 4: images in the main content area / left column
+MAIN_IMAGE_LAYOUT_SELECTORS = (
+    'main img',
+    '[role="main"] img',
+    '.main-content img',
+    '.content img',
+    '.left img',
+    '.product-left img',
+    '.product-main img',
+    '.product-details img',
+    'section img',
+    '.product-section img',
+)
+
+# Main product image, Strategy 3: URL fragments of obvious non-product images (one case-insensitive scan)
+NON_PRODUCT_IMAGE_RE = re.compile("|".join(map(re.escape, [
+    'logo', 'icon', 'menu', 'header', 'footer', 'cart', 'search',
+    'badge', 'sticker', 'award', 'certificate', 'approval', 'seal',
+    'social', 'facebook', 'twitter', 'instagram', 'youtube',
+    'payment', 'visa', 'mastercard', 'paypal',
+    'trust', 'security', 'ssl', 'verified',
+    'flag', 'country', 'language', 'currency',
+    'star', 'rating', 'review',
+    'nav', 'breadcrumb', 'back', 'close', 'x',
+    'loading', 'spinner', 'placeholder',
+])), re.I)
+
+# Main product image, Strategies 4-5: the shorter badge/logo exclusion list
+BADGE_IMAGE_RE = re.compile("|".join(map(re.escape, ['badge', 'sticker', 'award', 'logo', 'icon'])), re.I)
+
+# Everything _extract_main_product_image needs in one round-trip: the h1 text, and the
+# candidate <img>s of each strategy (src attribute + natural size) as indexes into `images`
+MAIN_IMAGE_CANDIDATES_JS = """
+({containers, layouts}) => {
+    const images = [];
+    const indexes = new Map();
+    const describe = img => {
+        if (!indexes.has(img)) {
+            indexes.set(img, images.length);
+            images.push({src: img.getAttribute('src'), w: img.naturalWidth || 0, h: img.naturalHeight || 0});
+        }
+        return indexes.get(img);
+    };
+    const firstN = (elements, n) => Array.from(elements).slice(0, n).map(describe);
+    const h1 = document.querySelector('h1');
+    return {
+        heading: h1 ? h1.innerText : null,
+        all: firstN(document.querySelectorAll('img[src]'), 20),
+        containers: containers.map(selector => {
+            const container = document.querySelector(selector);
+            return container ? firstN(container.querySelectorAll('img[src]'), 5) : null;
+        }),
+        layouts: layouts.map(selector => firstN(document.querySelectorAll(selector), 5)),
+        images,
+    };
+}
+"""
+
+# "Buy Now" / "Buy" buttons and links on catalog pages, probed by _detect_and_scrape_buy_buttons
+BUY_BUTTON_SELECTORS = (
+    # Text-based (case insensitive)
+    'a:has-text("Buy Now")',
+    'a:has-text("Buy now")',
+    'a:has-text("buy now")',
+    'a:has-text("BUY NOW")',
+    'button:has-text("Buy Now")',
+    'button:has-text("Buy now")',
+    'button:has-text("buy now")',
+    'a:has-text("Buy")',
+    'button:has-text("Buy")',
+    'a:has-text("buy")',
+    'button:has-text("buy")',
+    'a:has-text("Shop Now")',
+    'a:has-text("shop now")',
+    'button:has-text("Shop Now")',
+    'a:has-text("View Product")',
+    'a:has-text("Learn More")',
+    # Class and data attributes
+    '[data-action*="buy"]',
+    '[class*="buy-button"]',
+    '[class*="buy-btn"]',
+    '[class*="shop-now"]',
+    '[class*="shop-button"]',
+    '[class*="product-link"]',
+    '[data-testid*="buy"]',
+    '[data-testid*="shop"]',
+    # Product card links
+    '.product-card a',
+    '.product-item a',
+    '[class*="product-card"] a',
+    '[class*="product-item"] a',
+)
+
+# Product cards searched for links when a catalog page has no buy buttons
+PRODUCT_CARD_SELECTORS = (
+    '[class*="product-card"]',
+    '[class*="product-item"]',
+    '[class*="product-tile"]',
+    '[class*="product-box"]',
+    '.product',
+    '[data-product-id]',
+    '[data-testid*="product"]',
+)
+
+# Target URL of each matched buy element (first 50) plus the match count, in one round-trip.
+# Buttons without an href fall back to the outermost ancestor <a href>, then the first sibling
+# <a href>, then the first <a href> inside the outermost product/card/item ancestor.
+BUY_ELEMENT_HREFS_JS = """
+els => ({
+    count: els.length,
+    hrefs: els.slice(0, 50).map(el => {
+        const href = el.getAttribute('href');
+        if (href) return href;
+        const ancestors = [];
+        for (let p = el.parentElement; p; p = p.parentElement) ancestors.push(p);
+        const link = ancestors.filter(p => p.matches('a[href]')).pop();
+        if (link) return link.getAttribute('href');
+        const sibling = el.parentElement
+            ? Array.from(el.parentElement.children).find(c => c !== el && c.matches('a[href]'))
+            : null;
+        if (sibling) return sibling.getAttribute('href');
+        const card = ancestors.filter(p => /product|card|item/.test(p.getAttribute('class') || '')).pop();
+        const nearby = card ? card.querySelector('a[href]') : null;
+        return nearby ? nearby.getAttribute('href') : null;
+    }),
+})
+"""
+
+# Match count plus the hrefs of the first 3 links in each of the first 20 matched product cards
+PRODUCT_CARD_HREFS_JS = """
+els => ({
+    count: els.length,
+    hrefs: els.slice(0, 20).map(card => Array.from(card.querySelectorAll('a[href]'), a => a.getAttribute('href')).slice(0, 3)),
+})
+"""
+
+# Cookie-specific accept buttons, tried first (one combined visible-only locator)
+COOKIE_ACCEPT_SELECTOR = ", ".join([
+    'button:has-text("Accept")',
+    'button:has-text("Accept All")',
+    'button:has-text("Accept Cookies")',
+    'button:has-text("Accept All Cookies")',
+    'button:has-text("I Accept")',
+    '[data-testid*="cookie"]',
+    '[class*="cookie-accept"]',
+    '[id*="cookie-accept"]',
+    '.cookie-accept',
+    '.accept-cookies',
+    '.cookie-banner button',
+    '.cookie-notice button',
+    '.gdpr-banner button',
+    '#cookie-accept',
+    '#accept-cookies',
+    '[onclick*="cookie"]',
+]) + " >> visible=true"
+
+# Cookie / consent banner containers; the generic buttons below only count inside one
+COOKIE_BANNER_SCOPE = (
+    ':is([id*="cookie" i], [class*="cookie" i], [id*="consent" i], [class*="consent" i], '
+    '[id*="gdpr" i], [class*="gdpr" i], [aria-label*="cookie" i], [aria-label*="consent" i])'
+)
 
-def _accept_cookies(page: Page, verbose: bool = False) -> None:
+# Generic confirm buttons ("OK" also matches "Book"/"Look"), tried last and only inside a banner
+COOKIE_GENERIC_SELECTOR = ", ".join(f"{COOKIE_BANNER_SCOPE} {sel}" for sel in [
+    'button:has-text("Agree")',
+    'button:has-text("OK")',
+    'button:has-text("Allow")',
+    'button:has-text("Allow All")',
+    'button:has-text("Yes")',
+    'button:has-text("Continue")',
+    '[data-testid*="accept"]',
+    '[class*="accept"]',
+    '[id*="accept"]',
+    '.btn-accept',
+    '[onclick*="accept"]',
+]) + " >> visible=true"
+
+
+async def _wait_for_content(page: Page, selector: str) -> None:
+    """
+    Wait (up to CONTENT_WAIT_TIMEOUT_MS) for selector to be attached, or for the network
+    to go idle on pages that never render it; a timeout is not an error.
+    """
+    waits = [
+        asyncio.ensure_future(page.wait_for_selector(selector, state="attached", timeout=CONTENT_WAIT_TIMEOUT_MS)),
+        asyncio.ensure_future(page.wait_for_load_state("networkidle", timeout=CONTENT_WAIT_TIMEOUT_MS)),
+    ]
+    try:
+        await asyncio.wait(waits, return_when=asyncio.FIRST_COMPLETED)
+    finally:
+        for wait in waits:
+            wait.cancel()
+        await asyncio.gather(*waits, return_exceptions=True)
+
+
+async def _accept_cookies(page: Page, verbose: bool = False) -> bool:
     """
     Accept cookies by clicking common cookie banner buttons.
     This prevents cookie banners from interfering with product detection.
+    
+    Returns:
+        True if a cookie-specific accept button was clicked (only then is the origin
+        treated as accepted); a generic banner button is clicked but returns False
     """
     try:
         if verbose:
             print(f"[Cookies] Looking for cookie banner to accept...")
         
-        # Common cookie acceptance button selectors
-        cookie_selectors = [
-            'button:has-text("Accept")',
-            'button:has-text("Accept All")',
-            'button:has-text("Accept Cookies")',
-            'button:has-text("Accept All Cookies")',
-            'button:has-text("I Accept")',
-            'button:has-text("Agree")',
-            'button:has-text("OK")',
-            'button:has-text("Allow")',
-            'button:has-text("Allow All")',
-            'button:has-text("Yes")',
-            'button:has-text("Continue")',
-            '[data-testid*="accept"]',
-            '[data-testid*="cookie"]',
-            '[class*="accept"]',
-            '[class*="cookie-accept"]',
-            '[id*="accept"]',
-            '[id*="cookie-accept"]',
-            '.cookie-accept',
-            '.accept-cookies',
-            '.btn-accept',
-            '.cookie-banner button',
-            '.cookie-notice button',
-            '.gdpr-banner button',
-            '#cookie-accept',
-            '#accept-cookies',
-            '[onclick*="accept"]',
-            '[onclick*="cookie"]',
-        ]
-        
-        # Try to find and click cookie acceptance button
-        for selector in cookie_selectors:
-            try:
-                button = page.locator(selector).first
-                if button.count() > 0:
-                    # Check if button is visible and clickable
-                    if button.is_visible():
-                        button.click()
-                        if verbose:
-                            print(f"[Cookies] ✓ Accepted cookies using selector: {selector}")
-                        # Wait a moment for banner to disappear
-                        page.wait_for_timeout(1000)
-                        return
-            except:
-                continue
-        
-        # Also try to find by text content in buttons
-        button_texts = [
-            "Accept", "Accept All", "Accept Cookies", "I Accept", 
-            "Agree", "OK", "Allow", "Allow All", "Yes", "Continue"
-        ]
-        
-        for text in button_texts:
-            try:
-                button = page.locator(f'button:has-text("{text}")').first
-                if button.count() > 0 and button.is_visible():
-                    button.click()
-                    if verbose:
-                        print(f"[Cookies] ✓ Accepted cookies using text: {text}")
-                    page.wait_for_timeout(1000)
-                    return
-            except:
-                continue
+        # Cookie-specific buttons first, generic ones (scoped to a banner) last;
+        # each tier is a single locator, so at most two round-trips
+        for selector, specific in ((COOKIE_ACCEPT_SELECTOR, True), (COOKIE_GENERIC_SELECTOR, False)):
+            button = page.locator(selector).first
+            if await button.count() > 0:
+                await button.click()
+                if verbose:
+                    print(f"[Cookies] ✓ Accepted cookies")
+                # Wait a moment for banner to disappear
+                await asyncio.sleep(1)
+                return specific
         
         if verbose:
             print(f"[Cookies] No cookie banner found or already accepted")
@@ -205,9 +749,11 @@ def _accept_cookies(page: Page, verbose: bool = False) -> None:
     except Exception as e:
         if verbose:
             print(f"[Cookies] Error handling cookies: {e}")
+    
+    return False
 
 
-def _scroll_page_to_load_content(page: Page, verbose: bool = False) -> None:
+async def _scroll_page_to_load_content(page: Page, verbose: bool = False, wait_for_images: bool = True) -> None:
     """
     Scroll the page to load all content, including lazy-loaded images and infinite scroll.
     
@@ -216,76 +762,47 @@ def _scroll_page_to_load_content(page: Page, verbose: bool = False) -> None:
     - Infinite scroll
     - Dynamic content loading
     - Product carousels
+    
+    Pass wait_for_images=False on pages whose images are blocked to skip waiting for them to load.
     """
     try:
         if verbose:
             print(f"[Scroll] Starting page scroll to load all content...")
         
-        # Get initial page height
-        initial_height = page.evaluate("document.body.scrollHeight")
+        # Scroll to the bottom inside the page until the height stops growing
+        final_height = await page.evaluate(SCROLL_TO_STABLE_HEIGHT_JS, SCROLL_TIME_LIMIT_MS)
         if verbose:
-            print(f"[Scroll] Initial page height: {initial_height}px")
-        
-        # Scroll to bottom in increments
-        scroll_step = 1000  # pixels
-        current_scroll = 0
-        scroll_attempts = 0
-        max_scroll_attempts = 50  # Prevent infinite scrolling
-        no_change_count = 0
-        max_no_change = 3  # Stop if height doesn't change for 3 attempts
-        
-        while scroll_attempts < max_scroll_attempts:
-            # Scroll down by step
-            current_scroll += scroll_step
-            page.evaluate(f"window.scrollTo(0, {current_scroll})")
-            
-            # Wait for content to load
-            page.wait_for_timeout(1000)  # Wait 1 second for lazy loading
-            
-            # Check new page height
-            new_height = page.evaluate("document.body.scrollHeight")
-            
-            if verbose and scroll_attempts % 5 == 0:
-                print(f"[Scroll] Attempt {scroll_attempts}: Scrolled to {current_scroll}px, height: {new_height}px")
-            
-            # If we've reached the bottom or height hasn't changed
-            if current_scroll >= new_height - 1000:  # 1000px buffer
-                if verbose:
-                    print(f"[Scroll] Reached bottom of page")
-                break
-            
-            # Check if height increased (new content loaded)
-            if new_height > initial_height:
-                initial_height = new_height
-                no_change_count = 0
-            else:
-                no_change_count += 1
-                
-            # If height hasn't changed for several attempts, stop
-            if no_change_count >= max_no_change:
-                if verbose:
-                    print(f"[Scroll] No new content loaded, stopping scroll")
-                break
-            
-            scroll_attempts += 1
+            print(f"[Scroll] Reached bottom of page at height: {final_height}px")
         
         # Scroll back to top
-        page.evaluate("window.scrollTo(0, 0)")
-        page.wait_for_timeout(500)  # Brief pause
+        await page.evaluate("window.scrollTo(0, 0)")
+        await asyncio.sleep(0.5)  # Brief pause
         
-        final_height = page.evaluate("document.body.scrollHeight")
         if verbose:
-            print(f"[Scroll] Scroll complete. Final page height: {final_height}px")
+            print(f"[Scroll] Scroll complete")
             
-        # Additional wait for any remaining lazy-loaded images
-        page.wait_for_timeout(2000)
+        # Wait until the lazy-loaded images triggered by the scroll have finished loading
+        if wait_for_images:
+            try:
+                await page.wait_for_function(IMAGES_COMPLETE_JS, timeout=CONTENT_WAIT_TIMEOUT_MS)
+            except Exception:
+                pass
         
     except Exception as e:
         if verbose:
             print(f"[Scroll Error] Failed to scroll page: {e}")
 
 
-def _is_product_page(page: Page, verbose: bool = False) -> bool:
+def _looks_like_product_url(url: str) -> bool:
+    """URL-only part of _is_product_page, used to pick a browser context before navigating."""
+    url = url.lower()
+    path = url.split('?')[0]
+    if PRODUCT_PAGE_EXCLUDE_RE.search(url) or any(x in path for x in ['/index', '/home']):
+        return False
+    return PRODUCT_URL_RE.search(url) is not None
+
+
+async def _is_product_page(page: Page, verbose: bool = False) -> bool:
     """
     Detect if a page is a product page using multiple heuristics:
     1. Schema.org Product markup
@@ -303,37 +820,11 @@ def _is_product_page(page: Page, verbose: bool = False) -> bool:
             print(f"[Product Detection] Checking URL: {url}")
         
         # EXCLUSION FILTERS: These are NOT product pages
-        exclusion_patterns = [
-            '/shop',
-            '/category',
-            '/categories',
-            '/collection',
-            '/collections',
-            '/search',
-            '?__geom=',  # Country selector parameters
-            '/en-us',    # US store
-            '/en-au',    # Australian store
-            '/en-ca',    # Canadian store
-            '/en-ie',    # Irish store
-            '/en-eu',    # EU store
-            '/en-nz',    # New Zealand store
-            '/de-de',    # German store
-            '/fr-fr',    # French store
-            '/es-es',    # Spanish store
-            '/it-it',    # Italian store
-            '/cart',
-            '/checkout',
-            '/account',
-            '/login',
-            '/register',
-        ]
-        
-        # Exclude if URL matches exclusion patterns
-        for pattern in exclusion_patterns:
-            if pattern in url:
-                if verbose:
-                    print(f"[Product Detection] Excluded by pattern: {pattern}")
-                return False
+        excluded = PRODUCT_PAGE_EXCLUDE_RE.search(url)
+        if excluded:
+            if verbose:
+                print(f"[Product Detection] Excluded by pattern: {excluded.group(0)}")
+            return False
         
         # Exclude home pages (/, /index, /home, or ends with domain)
         path = url.split('?')[0]  # Remove query params
@@ -342,17 +833,24 @@ def _is_product_page(page: Page, verbose: bool = False) -> bool:
         if any(x in path for x in ['/index', '/home']):
             return False
         
+        # Check URL patterns (STRICT - must have product ID or slug after the pattern)
+        matched = PRODUCT_URL_RE.search(url)
+        if matched:
+            if verbose:
+                print(f"[Product Detection] ✓ Matched URL pattern: {matched.group('pattern')}")
+            return True
+        
+        # Gather every DOM signal in one round-trip
+        signals = await page.evaluate(PRODUCT_SIGNALS_JS)
+        
         # Check for Schema.org Product
-        schema_product = page.locator('[itemtype*="schema.org/Product"]').count() > 0
-        if schema_product:
+        if signals['schemaProduct']:
             return True
         
         # Check for JSON-LD Product schema (STRICT - must be exact @type match)
-        json_ld = page.locator('script[type="application/ld+json"]')
-        for i in range(json_ld.count()):
+        for content in signals['jsonLd']:
             try:
-                content = json_ld.nth(i).inner_text()
-                data = json.loads(content)
+                data = _loads_json(content)
                 
                 # Check if it's a single product
                 if isinstance(data, dict):
@@ -372,37 +870,14 @@ def _is_product_page(page: Page, verbose: bool = False) -> bool:
                 continue
         
         # Check for OpenGraph product metadata
-        og_type = page.locator('meta[property="og:type"]').first
-        if og_type.count() > 0:
-            og_content = og_type.get_attribute('content') or ''
-            if og_content.lower() == 'product':  # Exact match only
-                return True
-        
-        # Check URL patterns (STRICT - must have product ID or slug)
-        product_url_patterns = [
-            '/product/',
-            '/products/',
-            '/supplement/',     # Added for supplement sites
-            '/supplements/',    # Added for supplement sites
-            '/item/',
-            '/p/',
-            '/dp/',
-        ]
-        
-        # URL must contain pattern AND have additional path segments (not just /products)
-        for pattern in product_url_patterns:
-            if pattern in url:
-                # Check if there's content after the pattern (product ID/slug)
-                parts = url.split(pattern)
-                if len(parts) > 1 and parts[1].strip('/'):
-                    if verbose:
-                        print(f"[Product Detection] ✓ Matched URL pattern: {pattern}")
-                    return True
+        og_content = signals['ogType'] or ''
+        if og_content.lower() == 'product':  # Exact match only
+            return True
         
         # Check for common product page elements (STRICT - need multiple indicators)
-        buy_button = page.locator('button:has-text("Add to Cart"), button:has-text("Buy Now"), button:has-text("Add to Bag")').count() > 0
-        price_element = page.locator('[class*="price"], [id*="price"], [data-testid*="price"]').count() > 0
-        product_title = page.locator('h1[class*="product"], h1[itemprop="name"]').count() > 0
+        buy_button = signals['buy']
+        price_element = signals['price']
+        product_title = signals['title']
         
         # Need at least 2 out of 3 product indicators
         indicators = sum([buy_button, price_element, product_title])
@@ -414,6 +889,19 @@ def _is_product_page(page: Page, verbose: bool = False) -> bool:
         return False
 
 
+def _find_price(text: str) -> tuple[Optional[str], Optional[str]]:
+    """Return (amount without thousands separators, currency code) of the first price in text."""
+    match = PRICE_RE.search(text)
+    if not match:
+        return None, None
+    amount = match.group('amount') or match.group('amount_before_code') or match.group('amount_after_code')
+    if match.group('symbol'):
+        currency = CURRENCY_MAP[match.group('symbol')]
+    else:
+        currency = (match.group('code') or match.group('code_before_amount')).upper()
+    return amount.replace(',', ''), currency
+
+
 def _parse_subscription_prices(text: str) -> tuple[Optional[str], Optional[str], Optional[str]]:
     """
     Parse subscription prices from text like:
@@ -422,30 +910,12 @@ def _parse_subscription_prices(text: str) -> tuple[Optional[str], Optional[str],
     Returns: (original_price, updated_price, currency)
     """
     try:
-        # Split by newlines to get individual lines
-        lines = text.split('\n')
+        # One pass over the whole text: (symbol, amount) for every price
+        matches = SUBSCRIPTION_PRICE_RE.findall(text)
+        prices = [amount for _, amount in matches]
         
-        # Look for price patterns in the lines
-        prices = []
-        currency = None
-        
-        for line in lines:
-            line = line.strip()
-            if not line:
-                continue
-                
-            # Look for price patterns with currency symbols
-            price_matches = re.findall(r'[\$£€](\d+(?:\.\d{2})?)', line)
-            if price_matches:
-                prices.extend(price_matches)
-                
-                # Detect currency from the line
-                if '$' in line and not currency:
-                    currency = 'USD'
-                elif '£' in line and not currency:
-                    currency = 'GBP'
-                elif '€' in line and not currency:
-                    currency = 'EUR'
+        # Currency comes from the first price's symbol
+        currency = CURRENCY_MAP[matches[0][0]] if matches else None
         
         # If we found exactly 2 prices, the first is original, second is updated
         if len(prices) >= 2:
@@ -460,309 +930,327 @@ def _parse_subscription_prices(text: str) -> tuple[Optional[str], Optional[str],
         return None, None, None
 
 
-def _extract_buying_options(page: Page, verbose: bool = False) -> List[BuyingOption]:
+async def _describe_option_elements(page: Page, selectors: Sequence[str]) -> Dict[str, List[dict]]:
     """
-    Extract buying options from a product page.
-    
-    Looks for:
-    - Quantity selectors (1, 3, 6 bottles)
-    - Subscription options (one-time, monthly, etc.)
-    - Product variants (size, flavor, etc.)
-    - Pricing tiers
+    Snapshot every element matched by any of the selectors with a single
+    evaluate (one DOM walk). Returns selector -> descriptors, in document order.
     """
+    try:
+        result = await page.evaluate(OPTION_ELEMENTS_JS, list(selectors))
+    except Exception:
+        return {}
+    elements = result['elements']
+    return {
+        selector: [elements[i] for i in indexes]
+        for selector, indexes in zip(selectors, result['matches'])
+    }
+
+
+def _extract_quantity_options(elements_by_selector: Dict[str, List[dict]], verbose: bool = False) -> List[BuyingOption]:
+    """Strategy 1: quantity selectors (dropdowns, radio buttons, button groups)."""
     buying_options = []
     
-    try:
-        if verbose:
-            print(f"[Buying Options] Extracting buying options...")
-        
-        # Strategy 1: Look for quantity selectors
-        quantity_selectors = [
-            'select[name*="quantity"]',
-            'select[id*="quantity"]',
-            '[class*="quantity"] select',
-            '[class*="qty"] select',
-            'select[data-quantity]',
-            '.quantity-selector select',
-            '.qty-selector select',
-            # Radio buttons for quantities
-            'input[type="radio"][name*="quantity"]',
-            'input[type="radio"][id*="quantity"]',
-            '[class*="quantity"] input[type="radio"]',
-            '[class*="qty"] input[type="radio"]',
-            # Button groups for quantities
-            '[class*="quantity"] button',
-            '[class*="qty"] button',
-            '.quantity-option',
-            '.qty-option',
-        ]
-        
-        for selector in quantity_selectors:
-            try:
-                elements = page.locator(selector)
-                count = elements.count()
+    for selector in QUANTITY_OPTION_SELECTORS:
+        elements = elements_by_selector.get(selector, [])
+        try:
+            count = len(elements)
+            
+            if count > 0:
+                if verbose:
+                    print(f"[Buying Options] Found {count} quantity element(s) with selector: {selector}")
                 
-                if count > 0:
-                    if verbose:
-                        print(f"[Buying Options] Found {count} quantity element(s) with selector: {selector}")
-                    
-                    # Handle select dropdowns
-                    if 'select' in selector:
-                        for i in range(count):
-                            try:
-                                select = elements.nth(i)
-                                options = select.locator('option')
-                                
-                                for j in range(options.count()):
-                                    option = options.nth(j)
-                                    value = option.get_attribute('value')
-                                    text = option.inner_text().strip()
-                                    
-                                    if value and text and value != '':
-                                        # Try to extract price from the text
-                                        price_match = re.search(r'[\$£€]?(\d+(?:\.\d{2})?)', text)
-                                        price = price_match.group(1) if price_match else None
-                                        
-                                        # Try to extract quantity number
-                                        qty_match = re.search(r'(\d+)', text)
-                                        qty_value = qty_match.group(1) if qty_match else value
-                                        
-                                        buying_options.append(BuyingOption(
-                                            option_type="quantity",
-                                            original_price=price,
-                                            updated_price=price,  # Same price for quantity options
-                                            currency=None,  # Will be detected from page
-                                            value=qty_value,
-                                            unit="units",
-                                            is_default=(j == 0),
-                                            raw_data={"selector": selector, "value": value}
-                                        ))
-                            except:
-                                continue
-                    
-                    # Handle radio buttons
-                    elif 'radio' in selector:
-                        for i in range(count):
-                            try:
-                                radio = elements.nth(i)
-                                value = radio.get_attribute('value')
-                                # Try to find associated label
-                                label = page.locator(f'label[for="{radio.get_attribute("id")}"]').first
-                                if label.count() == 0:
-                                    # Try to find parent label
-                                    label = radio.locator('xpath=ancestor::label').first
-                                
-                                text = label.inner_text().strip() if label.count() > 0 else value
+                # Handle select dropdowns
+                if 'select' in selector:
+                    for element in elements:
+                        try:
+                            for j, option in enumerate(element['options']):
+                                value = option['value']
+                                text = option['text'].strip()
                                 
-                                if value and text:
-                                    # Try to extract price and quantity
-                                    price_match = re.search(r'[\$£€]?(\d+(?:\.\d{2})?)', text)
+                                if value and text and value != '':
+                                    # Try to extract price from the text
+                                    price_match = OPTION_PRICE_RE.search(text)
                                     price = price_match.group(1) if price_match else None
                                     
-                                    qty_match = re.search(r'(\d+)', text)
+                                    # Try to extract quantity number
+                                    qty_match = OPTION_QUANTITY_RE.search(text)
                                     qty_value = qty_match.group(1) if qty_match else value
                                     
-                                    is_checked = radio.is_checked()
-                                    
                                     buying_options.append(BuyingOption(
                                         option_type="quantity",
                                         original_price=price,
                                         updated_price=price,  # Same price for quantity options
-                                        currency=None,
+                                        currency=None,  # Will be detected from page
                                         value=qty_value,
                                         unit="units",
-                                        is_default=is_checked,
+                                        is_default=(j == 0),
                                         raw_data={"selector": selector, "value": value}
                                     ))
-                            except:
-                                continue
-                    
-                    # Handle button groups
-                    elif 'button' in selector:
-                        for i in range(count):
-                            try:
-                                button = elements.nth(i)
-                                text = button.inner_text().strip()
-                                value = button.get_attribute('data-value') or button.get_attribute('value') or text
+                        except:
+                            continue
+                
+                # Handle radio buttons
+                elif 'radio' in selector:
+                    for element in elements:
+                        try:
+                            value = element['value']
+                            # Text of the associated (or parent) label
+                            label_text = element['labelText']
+                            text = label_text.strip() if label_text is not None else value
+                            
+                            if value and text:
+                                # Try to extract price and quantity
+                                price_match = OPTION_PRICE_RE.search(text)
+                                price = price_match.group(1) if price_match else None
                                 
-                                if text and value:
-                                    # Try to extract price and quantity
-                                    price_match = re.search(r'[\$£€]?(\d+(?:\.\d{2})?)', text)
-                                    price = price_match.group(1) if price_match else None
-                                    
-                                    qty_match = re.search(r'(\d+)', text)
-                                    qty_value = qty_match.group(1) if qty_match else value
-                                    
-                                    # Check if button is selected/active
-                                    is_active = 'active' in (button.get_attribute('class') or '').lower()
-                                    
-                                    buying_options.append(BuyingOption(
-                                        option_type="quantity",
-                                        original_price=price,
-                                        updated_price=price,  # Same price for quantity options
-                                        currency=None,
-                                        value=qty_value,
-                                        unit="units",
-                                        is_default=is_active,
-                                        raw_data={"selector": selector, "value": value}
-                                    ))
-                            except:
-                                continue
-            except:
-                continue
-        
-        # Strategy 2: Look for subscription options
-        subscription_selectors = [
-            'input[type="radio"][name*="subscription"]',
-            'input[type="radio"][name*="recurring"]',
-            '[class*="subscription"] input[type="radio"]',
-            '[class*="recurring"] input[type="radio"]',
-            '.subscription-option',
-            '.recurring-option',
-            'select[name*="subscription"]',
-            'select[name*="recurring"]',
-        ]
-        
-        for selector in subscription_selectors:
-            try:
-                elements = page.locator(selector)
-                count = elements.count()
+                                qty_match = OPTION_QUANTITY_RE.search(text)
+                                qty_value = qty_match.group(1) if qty_match else value
+                                
+                                is_checked = element['checked']
+                                
+                                buying_options.append(BuyingOption(
+                                    option_type="quantity",
+                                    original_price=price,
+                                    updated_price=price,  # Same price for quantity options
+                                    currency=None,
+                                    value=qty_value,
+                                    unit="units",
+                                    is_default=is_checked,
+                                    raw_data={"selector": selector, "value": value}
+                                ))
+                        except:
+                            continue
                 
-                if count > 0:
-                    if verbose:
-                        print(f"[Buying Options] Found {count} subscription element(s) with selector: {selector}")
-                    
-                    for i in range(count):
+                # Handle button groups
+                elif 'button' in selector:
+                    for element in elements:
                         try:
-                            element = elements.nth(i)
+                            text = element['text'].strip()
+                            value = element['dataValue'] or element['value'] or text
                             
-                            if element.get_attribute('type') == 'radio':
-                                value = element.get_attribute('value')
-                                # Find associated label
-                                label = page.locator(f'label[for="{element.get_attribute("id")}"]').first
-                                if label.count() == 0:
-                                    label = element.locator('xpath=ancestor::label').first
+                            if text and value:
+                                # Try to extract price and quantity
+                                price_match = OPTION_PRICE_RE.search(text)
+                                price = price_match.group(1) if price_match else None
                                 
-                                text = label.inner_text().strip() if label.count() > 0 else value
-                                is_checked = element.is_checked()
+                                qty_match = OPTION_QUANTITY_RE.search(text)
+                                qty_value = qty_match.group(1) if qty_match else value
                                 
-                                if text and value:
-                                    # Parse prices from subscription text
-                                    original_price, updated_price, currency = _parse_subscription_prices(text)
-                                    
+                                # Check if button is selected/active
+                                is_active = 'active' in (element['cls'] or '').lower()
+                                
+                                buying_options.append(BuyingOption(
+                                    option_type="quantity",
+                                    original_price=price,
+                                    updated_price=price,  # Same price for quantity options
+                                    currency=None,
+                                    value=qty_value,
+                                    unit="units",
+                                    is_default=is_active,
+                                    raw_data={"selector": selector, "value": value}
+                                ))
+                        except:
+                            continue
+        except:
+            continue
+    
+    return buying_options
+
+
+def _extract_subscription_options(elements_by_selector: Dict[str, List[dict]], verbose: bool = False) -> List[BuyingOption]:
+    """Strategy 2: subscription / one-time purchase radio options."""
+    buying_options = []
+    
+    for selector in SUBSCRIPTION_OPTION_SELECTORS:
+        elements = elements_by_selector.get(selector, [])
+        try:
+            count = len(elements)
+            
+            if count > 0:
+                if verbose:
+                    print(f"[Buying Options] Found {count} subscription element(s) with selector: {selector}")
+                
+                for element in elements:
+                    try:
+                        if element['type'] == 'radio':
+                            value = element['value']
+                            # Text of the associated (or parent) label
+                            label_text = element['labelText']
+                            text = label_text.strip() if label_text is not None else value
+                            is_checked = element['checked']
+                            
+                            if text and value:
+                                # Parse prices from subscription text
+                                original_price, updated_price, currency = _parse_subscription_prices(text)
+                                
+                                buying_options.append(BuyingOption(
+                                    option_type="subscription",
+                                    original_price=original_price,
+                                    updated_price=updated_price,
+                                    currency=currency,
+                                    value=value,
+                                    unit="subscription",
+                                    is_default=is_checked,
+                                    raw_data={"selector": selector, "value": value}
+                                ))
+                    except:
+                        continue
+        except:
+            continue
+    
+    return buying_options
+
+
+def _extract_variant_options(elements_by_selector: Dict[str, List[dict]], verbose: bool = False) -> List[BuyingOption]:
+    """Strategy 3: product variant dropdowns (size, flavor, etc.)."""
+    buying_options = []
+    
+    for selector in VARIANT_OPTION_SELECTORS:
+        elements = elements_by_selector.get(selector, [])
+        try:
+            count = len(elements)
+            
+            if count > 0:
+                if verbose:
+                    print(f"[Buying Options] Found {count} variant element(s) with selector: {selector}")
+                
+                # Handle select dropdowns for variants
+                if 'select' in selector:
+                    for element in elements:
+                        try:
+                            for j, option in enumerate(element['options']):
+                                value = option['value']
+                                text = option['text'].strip()
+                                
+                                if value and text and value != '':
                                     buying_options.append(BuyingOption(
-                                        option_type="subscription",
-                                        original_price=original_price,
-                                        updated_price=updated_price,
-                                        currency=currency,
+                                        option_type="variant",
+                                        original_price=None,
+                                        updated_price=None,
+                                        currency=None,
                                         value=value,
-                                        unit="subscription",
-                                        is_default=is_checked,
+                                        unit="variant",
+                                        is_default=(j == 0),
                                         raw_data={"selector": selector, "value": value}
                                     ))
                         except:
                             continue
-            except:
-                continue
-        
-        # Strategy 3: Look for product variants (size, flavor, etc.)
-        variant_selectors = [
-            'select[name*="variant"]',
-            'select[name*="option"]',
-            '[class*="variant"] select',
-            '[class*="option"] select',
-            'input[type="radio"][name*="variant"]',
-            'input[type="radio"][name*="option"]',
-            '.variant-selector select',
-            '.option-selector select',
-            '.product-variant',
-            '.variant-option',
-        ]
-        
-        for selector in variant_selectors:
-            try:
-                elements = page.locator(selector)
-                count = elements.count()
+        except:
+            continue
+    
+    return buying_options
+
+
+def _extract_pricing_tier_options(elements_by_selector: Dict[str, List[dict]], verbose: bool = False) -> List[BuyingOption]:
+    """Strategy 4: pricing tiers or bundles."""
+    buying_options = []
+    
+    for selector in PRICING_TIER_OPTION_SELECTORS:
+        elements = elements_by_selector.get(selector, [])
+        try:
+            count = len(elements)
+            
+            if count > 0:
+                if verbose:
+                    print(f"[Buying Options] Found {count} pricing tier element(s) with selector: {selector}")
                 
-                if count > 0:
-                    if verbose:
-                        print(f"[Buying Options] Found {count} variant element(s) with selector: {selector}")
-                    
-                    # Handle select dropdowns for variants
-                    if 'select' in selector:
-                        for i in range(count):
-                            try:
-                                select = elements.nth(i)
-                                options = select.locator('option')
-                                
-                                for j in range(options.count()):
-                                    option = options.nth(j)
-                                    value = option.get_attribute('value')
-                                    text = option.inner_text().strip()
-                                    
-                                    if value and text and value != '':
-                                        buying_options.append(BuyingOption(
-                                            option_type="variant",
-                                            original_price=None,
-                                            updated_price=None,
-                                            currency=None,
-                                            value=value,
-                                            unit="variant",
-                                            is_default=(j == 0),
-                                            raw_data={"selector": selector, "value": value}
-                                        ))
-                            except:
-                                continue
-            except:
-                continue
+                for element in elements:
+                    try:
+                        text = element['text'].strip()
+                        
+                        if text:
+                            # Try to extract price
+                            price_match = OPTION_PRICE_RE.search(text)
+                            price = price_match.group(1) if price_match else None
+                            
+                            # Try to extract quantity
+                            qty_match = OPTION_QUANTITY_RE.search(text)
+                            qty_value = qty_match.group(1) if qty_match else None
+                            
+                            buying_options.append(BuyingOption(
+                                option_type="pricing_tier",
+                                original_price=price,
+                                updated_price=price,  # Same price for pricing tiers
+                                currency=None,
+                                value=qty_value,
+                                unit="tier",
+                                is_default=False,
+                                raw_data={"selector": selector, "text": text}
+                            ))
+                    except:
+                        continue
+        except:
+            continue
+    
+    return buying_options
+
+
+
+def _buying_option_key(option: BuyingOption) -> tuple:
+    """Identity of a buying option, ignoring which selector found it."""
+    raw = tuple(sorted((k, str(v)) for k, v in (option.raw_data or {}).items() if k != 'selector'))
+    return (option.option_type, option.value, option.original_price, option.updated_price, raw)
+
+
+def _buying_options_from_offers(offers: list) -> List[BuyingOption]:
+    """Build variant buying options from a JSON-LD Product's `offers` list."""
+    buying_options = []
+    
+    for offer in offers:
+        if not isinstance(offer, dict):
+            continue
+        price = offer.get('price', offer.get('lowPrice'))
+        price = str(price) if price is not None else None
+        value = offer.get('name') or offer.get('sku') or price
+        
+        buying_options.append(BuyingOption(
+            option_type="variant",
+            original_price=price,
+            updated_price=price,  # JSON-LD offers carry a single price
+            currency=offer.get('priceCurrency'),
+            value=str(value) if value is not None else None,
+            unit="variant",
+            is_default=not buying_options,
+            is_available='OutOfStock' not in str(offer.get('availability', '')),
+            raw_data={"source": "json-ld", "sku": offer.get('sku'), "url": offer.get('url')}
+        ))
+    
+    return buying_options
+
+
+async def _extract_buying_options(page: Page, verbose: bool = False) -> List[BuyingOption]:
+    """
+    Extract buying options from a product page.
+    
+    Looks for:
+    - Quantity selectors (1, 3, 6 bottles)
+    - Subscription options (one-time, monthly, etc.)
+    - Product variants (size, flavor, etc.)
+    - Pricing tiers
+    """
+    buying_options = []
+    
+    try:
+        if verbose:
+            print(f"[Buying Options] Extracting buying options...")
         
-        # Strategy 4: Look for pricing tiers or bundles
-        pricing_tier_selectors = [
-            '[class*="pricing-tier"]',
-            '[class*="bundle-option"]',
-            '[class*="package-option"]',
-            '.pricing-option',
-            '.bundle-selector',
-            '.package-selector',
-        ]
-        
-        for selector in pricing_tier_selectors:
-            try:
-                elements = page.locator(selector)
-                count = elements.count()
-                
-                if count > 0:
-                    if verbose:
-                        print(f"[Buying Options] Found {count} pricing tier element(s) with selector: {selector}")
-                    
-                    for i in range(count):
-                        try:
-                            element = elements.nth(i)
-                            text = element.inner_text().strip()
-                            
-                            if text:
-                                # Try to extract price
-                                price_match = re.search(r'[\$£€]?(\d+(?:\.\d{2})?)', text)
-                                price = price_match.group(1) if price_match else None
-                                
-                                # Try to extract quantity
-                                qty_match = re.search(r'(\d+)', text)
-                                qty_value = qty_match.group(1) if qty_match else None
-                                
-                                buying_options.append(BuyingOption(
-                                    option_type="pricing_tier",
-                                    original_price=price,
-                                    updated_price=price,  # Same price for pricing tiers
-                                    currency=None,
-                                    value=qty_value,
-                                    unit="tier",
-                                    is_default=False,
-                                    raw_data={"selector": selector, "text": text}
-                                ))
-                        except:
-                            continue
-            except:
-                continue
+        # Snapshot every candidate element for all four strategies in one round-trip
+        elements_by_selector = await _describe_option_elements(page, ALL_OPTION_SELECTORS)
+        
+        buying_options.extend(_extract_quantity_options(elements_by_selector, verbose))
+        buying_options.extend(_extract_subscription_options(elements_by_selector, verbose))
+        buying_options.extend(_extract_variant_options(elements_by_selector, verbose))
+        buying_options.extend(_extract_pricing_tier_options(elements_by_selector, verbose))
+        
+        # Overlapping selectors find the same element more than once; keep the first detection
+        seen = set()
+        unique_options = []
+        for option in buying_options:
+            key = _buying_option_key(option)
+            if key not in seen:
+                seen.add(key)
+                unique_options.append(option)
+        buying_options = unique_options
         
         if verbose:
             print(f"[Buying Options] Found {len(buying_options)} total buying option(s)")
@@ -785,7 +1273,7 @@ def _extract_buying_options(page: Page, verbose: bool = False) -> List[BuyingOpt
         return []
 
 
-def _extract_product_data(page: Page, extract_buying_options: bool = True) -> ProductData:
+async def _extract_product_data(page: Page, extract_buying_options: bool = True) -> ProductData:
     """Extract product information from a product page (using V1 extraction logic)."""
     product_name = None
     price = None
@@ -796,44 +1284,43 @@ def _extract_product_data(page: Page, extract_buying_options: bool = True) -> Pr
     brand = None
     images = []
     raw_data = {}
+    json_ld_offers = []
     
     try:
+        # Read every candidate field in one round-trip; the rules below run on the snapshot
+        fields = await page.evaluate(PRODUCT_FIELDS_JS, {
+            "itemprops": list(SCHEMA_ITEMPROPS),
+            "priceSelectors": list(PRICE_FALLBACK_SELECTORS),
+        })
+        
         # Try to extract from Schema.org markup
-        schema_name = page.locator('[itemprop="name"]').first
-        if schema_name.count() > 0:
-            product_name = schema_name.inner_text().strip()
+        schema = fields['schema']
+        
+        if 'name' in schema:
+            product_name = schema['name']['text'].strip()
         
-        schema_price = page.locator('[itemprop="price"]').first
-        if schema_price.count() > 0:
-            price_text = schema_price.get_attribute('content') or schema_price.inner_text()
-            price = price_text.strip()
+        if 'price' in schema:
+            price = (schema['price']['content'] or schema['price']['text']).strip()
         
-        schema_currency = page.locator('[itemprop="priceCurrency"]').first
-        if schema_currency.count() > 0:
-            currency = schema_currency.get_attribute('content') or schema_currency.inner_text()
+        if 'priceCurrency' in schema:
+            currency = schema['priceCurrency']['content'] or schema['priceCurrency']['text']
         
-        schema_description = page.locator('[itemprop="description"]').first
-        if schema_description.count() > 0:
-            description = schema_description.inner_text().strip()[:500]  # Limit length
+        if 'description' in schema:
+            description = schema['description']['text'].strip()[:500]  # Limit length
         
-        schema_sku = page.locator('[itemprop="sku"]').first
-        if schema_sku.count() > 0:
-            sku = schema_sku.inner_text().strip()
+        if 'sku' in schema:
+            sku = schema['sku']['text'].strip()
         
-        schema_brand = page.locator('[itemprop="brand"]').first
-        if schema_brand.count() > 0:
-            brand = schema_brand.inner_text().strip()
+        if 'brand' in schema:
+            brand = schema['brand']['text'].strip()
         
-        schema_availability = page.locator('[itemprop="availability"]').first
-        if schema_availability.count() > 0:
-            availability = schema_availability.get_attribute('content') or schema_availability.inner_text()
+        if 'availability' in schema:
+            availability = schema['availability']['content'] or schema['availability']['text']
         
         # Try JSON-LD
-        json_ld = page.locator('script[type="application/ld+json"]')
-        for i in range(json_ld.count()):
+        for content in fields['jsonLd']:
             try:
-                content = json_ld.nth(i).inner_text()
-                data = json.loads(content)
+                data = _loads_json(content)
                 
                 # Handle both single objects and arrays
                 items = [data] if isinstance(data, dict) else data if isinstance(data, list) else []
@@ -857,6 +1344,8 @@ def _extract_product_data(page: Page, extract_buying_options: bool = True) -> Pr
                         # Extract offers data
                         if 'offers' in item:
                             offer = item['offers']
+                            if isinstance(offer, list):
+                                json_ld_offers = offer
                             if isinstance(offer, dict):
                                 if not price and 'price' in offer:
                                     price = str(offer['price'])
@@ -870,37 +1359,22 @@ def _extract_product_data(page: Page, extract_buying_options: bool = True) -> Pr
         
         # Fallback: Try to find product name from h1 or title
         if not product_name:
-            h1 = page.locator('h1').first
-            if h1.count() > 0:
-                product_name = h1.inner_text().strip()
+            if fields['heading'] is not None:
+                product_name = fields['heading'].strip()
             else:
-                product_name = page.title()
+                product_name = fields['title']
         
         # Fallback: Try to find price with common selectors
         if not price:
-            price_selectors = [
-                '[class*="price"]',
-                '[id*="price"]',
-                '[data-testid*="price"]',
-                '.product-price',
-                '#product-price',
-            ]
-            for selector in price_selectors:
+            for price_text in fields['priceTexts']:
                 try:
-                    elem = page.locator(selector).first
-                    if elem.count() > 0:
-                        price_text = elem.inner_text().strip()
-                        # Try to extract price with regex
-                        for pattern in PRICE_PATTERNS:
-                            match = pattern.search(price_text)
-                            if match:
-                                price = match.group(1).replace(',', '')
-                                # Try to detect currency from the text
-                                for symbol, curr in CURRENCY_MAP.items():
-                                    if symbol in price_text:
-                                        currency = curr if not currency else currency
-                                        break
-                                break
+                    if price_text is not None:
+                        price_text = price_text.strip()
+                        # Try to extract price (and its currency) with regex
+                        found_price, found_currency = _find_price(price_text)
+                        if found_price:
+                            price = found_price
+                            currency = currency or found_currency
                         if price:
                             break
                 except:
@@ -908,14 +1382,18 @@ def _extract_product_data(page: Page, extract_buying_options: bool = True) -> Pr
         
         # NEW SIMPLIFIED IMAGE EXTRACTION: Target the main product image
         # This targets the large image next to the product name (like the bottle image)
-        main_image = _extract_main_product_image(page, verbose=False)
+        main_image = await _extract_main_product_image(page, verbose=False)
         if main_image:
             images = [main_image]
         
         # NEW: Extract buying options if enabled
         buying_options = []
         if extract_buying_options:
-            buying_options = _extract_buying_options(page, verbose=False)
+            # Structured data that already lists several offers answers this without a DOM sweep
+            if len(json_ld_offers) > 1:
+                buying_options = _buying_options_from_offers(json_ld_offers)
+            if not buying_options:
+                buying_options = await _extract_buying_options(page, verbose=False)
         
     except Exception as e:
         print(f"[Error] Failed to extract product data: {e}")
@@ -936,7 +1414,21 @@ def _extract_product_data(page: Page, extract_buying_options: bool = True) -> Pr
     )
 
 
-def _extract_main_product_image(page: Page, verbose: bool = False) -> Optional[str]:
+def _variant_url_re(product_name: str) -> Optional[re.Pattern]:
+    """
+    Build one regex matching any variant token of product_name (e.g. "720 mg",
+    "2.5oz") in an image URL, allowing a space, %20, "-" or "_" before the unit.
+    Returns None when the name has no variant tokens.
+    """
+    variants = dict.fromkeys((number, unit.lower()) for number, unit in VARIANT_RE.findall(product_name))
+    if not variants:
+        return None
+    return re.compile("|".join(
+        rf"(?<![\d.]){re.escape(number)}(?:[\s_-]|%20)*{unit}(?![a-z])" for number, unit in variants
+    ), re.I)
+
+
+async def _extract_main_product_image(page: Page, verbose: bool = False) -> Optional[str]:
     """
     Extract the main product image (large image next to product name).
     
@@ -946,144 +1438,79 @@ def _extract_main_product_image(page: Page, verbose: bool = False) -> Optional[s
     Smart matching: Try to find images that match the product variant (e.g., 720mg image for 720mg product).
     """
     try:
+        # Snapshot the h1 and every strategy's candidate images (with sizes) in one round-trip
+        candidates = await page.evaluate(MAIN_IMAGE_CANDIDATES_JS, {
+            "containers": list(MAIN_IMAGE_CONTAINER_SELECTORS),
+            "layouts": list(MAIN_IMAGE_LAYOUT_SELECTORS),
+        })
+        images = candidates['images']
+        
+        # Resolve each candidate once: absolute URL, area and skip-list matches are shared by all strategies
+        for img in images:
+            src = img['src']
+            full_url = urljoin(page.url, src) if src and not src.startswith('data:') else None
+            img['url'] = full_url
+            img['area'] = img['w'] * img['h']
+            img['non_product'] = bool(full_url and NON_PRODUCT_IMAGE_RE.search(full_url))
+            img['badge'] = bool(full_url and BADGE_IMAGE_RE.search(full_url))
+        all_images = [images[i] for i in candidates['all'] if images[i]['url']]
+        
         # Get product name for smart matching
         product_name = None
-        h1 = page.locator('h1').first
-        if h1.count() > 0:
-            product_name = h1.inner_text().strip().lower()
+        if candidates['heading'] is not None:
+            product_name = candidates['heading'].strip().lower()
         
         # Strategy 1: Smart matching - look for images that match product variant
         if product_name:
             if verbose:
                 print(f"[Debug] Looking for images matching product: {product_name}")
-            all_images = page.locator('img[src]')
             
-            # First pass: Look for exact variant matches
-            for i in range(min(20, all_images.count())):
-                try:
-                    img = all_images.nth(i)
-                    src = img.get_attribute('src')
-                    if src and not src.startswith('data:'):
-                        full_url = urljoin(page.url, src)
-                        
-                        # Check if image URL matches product variant
-                        if '500mg' in product_name and '500mg' in full_url.lower():
-                            dims = img.evaluate("el => ({w: el.naturalWidth || 0, h: el.naturalHeight || 0})")
-                            w = dims.get('w', 0)
-                            h = dims.get('h', 0)
-                            if w * h > 50000:  # Reasonably large
-                                if verbose:
-                                    print(f"[Debug] ✓ Found matching 500mg image: {full_url[:80]}")
-                                return full_url
-                        elif '720mg' in product_name and '720mg' in full_url.lower():
-                            dims = img.evaluate("el => ({w: el.naturalWidth || 0, h: el.naturalHeight || 0})")
-                            w = dims.get('w', 0)
-                            h = dims.get('h', 0)
-                            if w * h > 50000:  # Reasonably large
-                                if verbose:
-                                    print(f"[Debug] ✓ Found matching 720mg image: {full_url[:80]}")
-                                return full_url
-                except:
-                    continue
+            # First pass: Look for exact variant matches (any dosage/size named in the product title)
+            variant_re = _variant_url_re(product_name)
+            if variant_re:
+                for img in all_images:
+                    # Check if image URL matches product variant
+                    match = variant_re.search(img['url'])
+                    if match and img['area'] > 50000:  # Reasonably large
+                        if verbose:
+                            print(f"[Debug] ✓ Found matching {match.group(0)} image: {img['url'][:80]}")
+                        return img['url']
             
             if verbose:
                 print(f"[Debug] No exact variant matches found, trying alternative approaches...")
         
         # Strategy 2: Look for product-specific containers first
-        product_containers = [
-            '.product-image',
-            '.product-photo', 
-            '.product-gallery',
-            '.main-image',
-            '.hero-image',
-            '[class*="product"][class*="image"]',
-            '[class*="main"][class*="image"]',
-            '.product-single__photo',
-            '.product__media',
-            '[data-product-image]',
-            # More specific product image selectors
-            '.product-main-image',
-            '.product-hero-image',
-            '.product-primary-image',
-            '.main-product-image',
-            '[class*="product-main"]',
-            '[class*="product-hero"]',
-            '[class*="product-primary"]',
-            '[class*="main-product"]',
-        ]
-        
-        for container_selector in product_containers:
-            try:
-                container = page.locator(container_selector).first
-                if container.count() > 0:
-                    if verbose:
-                        print(f"[Debug] Found container: {container_selector}")
-                    imgs = container.locator('img[src]')
-                    for j in range(min(5, imgs.count())):
-                        img = imgs.nth(j)
-                        src = img.get_attribute('src')
-                        if src and not src.startswith('data:'):
-                            # Get dimensions
-                            dims = img.evaluate("el => ({w: el.naturalWidth || 0, h: el.naturalHeight || 0})")
-                            w = dims.get('w', 0)
-                            h = dims.get('h', 0)
-                            area = w * h
-                            
-                            if area > 50000:  # At least 223x223 pixels
-                                full_url = urljoin(page.url, src)
-                                if verbose:
-                                    print(f"[Debug] ✓ Found image in container ({w}x{h}): {full_url[:80]}")
-                                return full_url
-            except:
-                continue
+        for container_selector, container_images in zip(MAIN_IMAGE_CONTAINER_SELECTORS, candidates['containers']):
+            if container_images is not None:
+                if verbose:
+                    print(f"[Debug] Found container: {container_selector}")
+                for j in container_images:
+                    img = images[j]
+                    if img['url'] and img['area'] > 50000:  # At least 223x223 pixels
+                        if verbose:
+                            print(f"[Debug] ✓ Found image in container ({img['w']}x{img['h']}): {img['url'][:80]}")
+                        return img['url']
         
         # Strategy 3: Find the largest image on the page (excluding obvious non-product images)
         if verbose:
             print(f"[Debug] Using size-based detection...")
-        all_images = page.locator('img[src]')
         largest_image = None
         largest_area = 0
         
-        for i in range(min(20, all_images.count())):
-            try:
-                img = all_images.nth(i)
-                src = img.get_attribute('src')
-                if src and not src.startswith('data:'):
-                    full_url = urljoin(page.url, src)
-                    
-                    # Enhanced filtering - skip obvious non-product images
-                    skip_patterns = [
-                        'logo', 'icon', 'menu', 'header', 'footer', 'cart', 'search',
-                        'badge', 'sticker', 'award', 'certificate', 'approval', 'seal',
-                        'social', 'facebook', 'twitter', 'instagram', 'youtube',
-                        'payment', 'visa', 'mastercard', 'paypal',
-                        'trust', 'security', 'ssl', 'verified',
-                        'flag', 'country', 'language', 'currency',
-                        'star', 'rating', 'review', 'badge',
-                        'nav', 'breadcrumb', 'back', 'close', 'x',
-                        'loading', 'spinner', 'placeholder'
-                    ]
-                    
-                    if any(skip in full_url.lower() for skip in skip_patterns):
-                        if verbose:
-                            print(f"[Debug] Skipped non-product image: {full_url[:60]}...")
-                        continue
-                    
-                    # Get dimensions
-                    dims = img.evaluate("el => ({w: el.naturalWidth || 0, h: el.naturalHeight || 0})")
-                    w = dims.get('w', 0)
-                    h = dims.get('h', 0)
-                    area = w * h
-                    
-                    # Skip very small images (likely icons/logos)
-                    if area > 100000:  # At least 316x316 pixels
-                        if area > largest_area:
-                            largest_area = area
-                            largest_image = full_url
-                            if verbose:
-                                print(f"[Debug] New largest candidate ({w}x{h}): {full_url[:60]}...")
-            except:
+        for img in all_images:
+            # Enhanced filtering - skip obvious non-product images
+            if img['non_product']:
+                if verbose:
+                    print(f"[Debug] Skipped non-product image: {img['url'][:60]}...")
                 continue
+            
+            # Skip very small images (likely icons/logos)
+            if img['area'] > 100000:  # At least 316x316 pixels
+                if img['area'] > largest_area:
+                    largest_area = img['area']
+                    largest_image = img['url']
+                    if verbose:
+                        print(f"[Debug] New largest candidate ({img['w']}x{img['h']}): {largest_image[:60]}...")
         
         if largest_image:
             if verbose:
@@ -1096,73 +1523,32 @@ def _extract_main_product_image(page: Page, verbose: bool = False) -> Optional[s
         
         # Look for images that are likely to be the main product image
         # These are usually in the left column or main content area
-        layout_selectors = [
-            'main img',
-            '[role="main"] img',
-            '.main-content img',
-            '.content img',
-            '.left img',
-            '.product-left img',
-            '.product-main img',
-            '.product-details img',
-            'section img',
-            '.product-section img',
-        ]
-        
-        for layout_selector in layout_selectors:
-            try:
-                layout_imgs = page.locator(layout_selector)
-                for i in range(min(5, layout_imgs.count())):
-                    try:
-                        img = layout_imgs.nth(i)
-                        src = img.get_attribute('src')
-                        if src and not src.startswith('data:'):
-                            full_url = urljoin(page.url, src)
-                            
-                            # Skip obvious non-product images
-                            if any(skip in full_url.lower() for skip in ['badge', 'sticker', 'award', 'logo', 'icon']):
-                                continue
-                            
-                            # Get dimensions
-                            dims = img.evaluate("el => ({w: el.naturalWidth || 0, h: el.naturalHeight || 0})")
-                            w = dims.get('w', 0)
-                            h = dims.get('h', 0)
-                            area = w * h
-                            
-                            # Look for reasonably large images
-                            if area > 50000:  # At least 223x223 pixels
-                                if verbose:
-                                    print(f"[Debug] ✓ Found layout-based product image ({w}x{h}): {full_url[:60]}...")
-                                return full_url
-                    except:
-                        continue
-            except:
-                continue
+        for layout_images in candidates['layouts']:
+            for i in layout_images:
+                img = images[i]
+                # Skip missing/inline sources and obvious non-product images
+                if not img['url'] or img['badge']:
+                    continue
+                
+                # Look for reasonably large images
+                if img['area'] > 50000:  # At least 223x223 pixels
+                    if verbose:
+                        print(f"[Debug] ✓ Found layout-based product image ({img['w']}x{img['h']}): {img['url'][:60]}...")
+                    return img['url']
         
         # Strategy 5: Fallback - get any reasonably large image
         if verbose:
             print(f"[Debug] Fallback: getting any large image...")
-        for i in range(min(10, all_images.count())):
-            try:
-                img = all_images.nth(i)
-                src = img.get_attribute('src')
-                if src and not src.startswith('data:'):
-                    full_url = urljoin(page.url, src)
-                    
-                    # Skip obvious non-product images
-                    if any(skip in full_url.lower() for skip in ['badge', 'sticker', 'award', 'logo', 'icon']):
-                        continue
-                    
-                    dims = img.evaluate("el => ({w: el.naturalWidth || 0, h: el.naturalHeight || 0})")
-                    w = dims.get('w', 0)
-                    h = dims.get('h', 0)
-                    
-                    if w * h > 40000:  # At least 200x200 pixels
-                        if verbose:
-                            print(f"[Debug] ✓ Fallback image: {full_url[:80]}")
-                        return full_url
-            except:
+        for i in candidates['all'][:10]:
+            img = images[i]
+            # Skip missing/inline sources and obvious non-product images
+            if not img['url'] or img['badge']:
                 continue
+            
+            if img['area'] > 40000:  # At least 200x200 pixels
+                if verbose:
+                    print(f"[Debug] ✓ Fallback image: {img['url'][:80]}")
+                return img['url']
         
         if verbose:
             print(f"[Debug] No suitable images found")
@@ -1173,21 +1559,20 @@ def _extract_main_product_image(page: Page, verbose: bool = False) -> Optional[s
         return None
 
 
-def _take_product_screenshot(page: Page, filename: str, out_dir: str, verbose: bool = False) -> Optional[str]:
+async def _take_product_screenshot(page: Page, filename: str, out_dir: str, verbose: bool = False) -> Optional[str]:
     """
     Take a screenshot of the product page and save it with the product name.
     This captures the entire product page like the browser screenshots shown.
     """
     try:
-        media_dir = os.path.join(out_dir, "screenshots")
-        os.makedirs(media_dir, exist_ok=True)
+        media_dir = _ensure_dir(os.path.join(out_dir, "screenshots"))
         
         # Create filename for screenshot
         screenshot_filename = f"{filename}.png"
         screenshot_path = os.path.join(media_dir, _safe_name(screenshot_filename))
         
         # Take full page screenshot
-        page.screenshot(path=screenshot_path, full_page=True)
+        await page.screenshot(path=screenshot_path, full_page=True)
         
         if verbose:
             print(f"[Screenshot] Saved: {os.path.basename(screenshot_path)}")
@@ -1200,103 +1585,96 @@ def _take_product_screenshot(page: Page, filename: str, out_dir: str, verbose: b
         return None
 
 
-def _download_media(context: BrowserContext, url: str, filename: str, out_dir: str) -> Optional[str]:
+def _to_png_bytes(body: bytes) -> bytes:
+    """
+    Decode image bytes with PIL and re-encode them as PNG, flattening any
+    transparency onto a white background. CPU-bound: callers run it in a
+    worker thread. Raises ImportError when Pillow is not installed.
+    """
+    if Image is None:
+        raise ImportError("Pillow is not installed")
+    
+    img = Image.open(io.BytesIO(body))
+    
+    # Only images that can carry transparency need compositing onto white
+    if img.mode in ('RGBA', 'LA', 'PA') or (img.mode == 'P' and 'transparency' in img.info):
+        background = Image.new('RGBA', img.size, (255, 255, 255, 255))
+        img = Image.alpha_composite(background, img.convert('RGBA')).convert('RGB')
+    elif img.mode != 'RGB':
+        img = img.convert('RGB')
+    
+    # Low compression: much faster, slightly larger files
+    out = io.BytesIO()
+    img.save(out, 'PNG', compress_level=1)
+    return out.getvalue()
+
+
+def _is_plain_rgb_png(body: bytes) -> bool:
+    """
+    True for an 8-bit truecolor PNG without a tRNS chunk: no alpha to flatten onto
+    white, so re-encoding it would not change the pixels. The IHDR chunk always
+    comes first: bit depth at byte 24, color type (2 = RGB) at byte 25.
+    """
+    if not body.startswith(PNG_SIGNATURE) or len(body) < 26 or body[12:16] != b"IHDR":
+        return False
+    if body[24] != 8 or body[25] != 2:
+        return False
+    return b"tRNS" not in body.split(b"IDAT", 1)[0]
+
+
+async def _download_media(context: BrowserContext, url: str, filename: str, out_dir: str) -> Optional[str]:
     """
     Download media file from URL using Playwright's request API.
-    Converts WebP images to PNG format for better compatibility.
+    Converts WebP/JPG images to PNG format for better compatibility.
     """
     try:
-        resp = context.request.get(url)
+        resp = await context.request.get(url)
         if not resp.ok:
             return None
         
-        body = resp.body()
+        body = await resp.body()
         ctype = (resp.headers.get("content-type") or "").lower()
         
         # Always save as PNG for better compatibility
         # Determine original extension for conversion detection
         original_ext = _guess_ext(url, ctype) or ".bin"
+        is_webp = "webp" in ctype or original_ext == ".webp"
+        # Extension used when the bytes have to be saved unconverted
+        fallback_ext = ".webp" if is_webp else original_ext
         
         # Save as PNG regardless of original format
         fname = f"{filename}.png"
         out_path = os.path.join(out_dir, _safe_name(fname))
         
-        # Check if we need to convert from WebP
-        if "webp" in ctype or original_ext == ".webp":
-            try:
-                # Convert WebP to PNG using PIL
-                from PIL import Image
-                import io
-                
-                # Open WebP image from bytes
-                webp_image = Image.open(io.BytesIO(body))
-                
-                # Convert to RGB if necessary (WebP can have transparency)
-                if webp_image.mode in ('RGBA', 'LA', 'P'):
-                    # Create a white background for transparency
-                    background = Image.new('RGB', webp_image.size, (255, 255, 255))
-                    if webp_image.mode == 'P':
-                        webp_image = webp_image.convert('RGBA')
-                    background.paste(webp_image, mask=webp_image.split()[-1] if webp_image.mode in ('RGBA', 'LA') else None)
-                    webp_image = background
-                elif webp_image.mode != 'RGB':
-                    webp_image = webp_image.convert('RGB')
-                
-                # Save as PNG
-                webp_image.save(out_path, 'PNG')
+        # Already an opaque RGB PNG: save the bytes as served instead of decoding and
+        # re-encoding them (PNGs with alpha or a palette are still flattened below)
+        if _is_plain_rgb_png(body):
+            with open(out_path, "wb") as f:
+                f.write(body)
+            return out_path
+        
+        try:
+            # Convert to PNG using PIL (off the event loop)
+            png = await asyncio.to_thread(_to_png_bytes, body)
+            with open(out_path, "wb") as f:
+                f.write(png)
+            if is_webp:
                 print(f"[Converted] WebP → PNG: {os.path.basename(out_path)}")
-                
-            except ImportError:
-                print(f"[Warning] PIL not available, saving WebP as-is. Install Pillow for conversion: pip install Pillow")
-                # Fallback: save as WebP if conversion fails
-                fname = f"{filename}.webp"
-                out_path = os.path.join(out_dir, _safe_name(fname))
-                with open(out_path, "wb") as f:
-                    f.write(body)
-            except Exception as e:
-                print(f"[Warning] WebP conversion failed: {e}, saving as WebP")
-                # Fallback: save as WebP if conversion fails
-                fname = f"{filename}.webp"
-                out_path = os.path.join(out_dir, _safe_name(fname))
-                with open(out_path, "wb") as f:
-                    f.write(body)
-        else:
-            # For non-WebP images, save directly as PNG
-            try:
-                # Try to convert any image format to PNG using PIL
-                from PIL import Image
-                import io
-                
-                # Open image from bytes
-                img = Image.open(io.BytesIO(body))
-                
-                # Convert to RGB if necessary
-                if img.mode in ('RGBA', 'LA', 'P'):
-                    background = Image.new('RGB', img.size, (255, 255, 255))
-                    if img.mode == 'P':
-                        img = img.convert('RGBA')
-                    background.paste(img, mask=img.split()[-1] if img.mode in ('RGBA', 'LA') else None)
-                    img = background
-                elif img.mode != 'RGB':
-                    img = img.convert('RGB')
-                
-                # Save as PNG
-                img.save(out_path, 'PNG')
-                
-            except ImportError:
-                print(f"[Warning] PIL not available, saving as original format. Install Pillow for PNG conversion: pip install Pillow")
-                # Fallback: save with original extension
-                fname = f"{filename}{original_ext}"
-                out_path = os.path.join(out_dir, _safe_name(fname))
-                with open(out_path, "wb") as f:
-                    f.write(body)
-            except Exception as e:
-                print(f"[Warning] Image conversion failed: {e}, saving as original format")
-                # Fallback: save with original extension
-                fname = f"{filename}{original_ext}"
-                out_path = os.path.join(out_dir, _safe_name(fname))
-                with open(out_path, "wb") as f:
-                    f.write(body)
+            
+        except ImportError:
+            print(f"[Warning] PIL not available, saving as original format. Install Pillow for PNG conversion: pip install Pillow")
+            # Fallback: save with original extension
+            fname = f"{filename}{fallback_ext}"
+            out_path = os.path.join(out_dir, _safe_name(fname))
+            with open(out_path, "wb") as f:
+                f.write(body)
+        except Exception as e:
+            print(f"[Warning] Image conversion failed: {e}, saving as original format")
+            # Fallback: save with original extension
+            fname = f"{filename}{fallback_ext}"
+            out_path = os.path.join(out_dir, _safe_name(fname))
+            with open(out_path, "wb") as f:
+                f.write(body)
         
         return out_path
     except Exception as e:
@@ -1304,9 +1682,28 @@ def _download_media(context: BrowserContext, url: str, filename: str, out_dir: s
         return None
 
 
+async def _download_media_batch(
+    context: BrowserContext,
+    jobs: List[tuple[str, str]],
+    out_dir: str,
+    max_parallel: int = MAX_PARALLEL_DOWNLOADS,
+) -> List[Optional[str]]:
+    """
+    Download (url, filename) jobs concurrently, at most max_parallel at a time.
+    Returns the saved paths (None for failures) in job order.
+    """
+    semaphore = asyncio.Semaphore(max(1, max_parallel))
+    
+    async def download(url: str, filename: str) -> Optional[str]:
+        async with semaphore:
+            return await _download_media(context, url, filename, out_dir)
+    
+    return list(await asyncio.gather(*(download(url, filename) for url, filename in jobs)))
+
+
 def _guess_ext(url: str, ctype: str) -> str:
     """Guess file extension from URL or content-type."""
-    m = re.search(r"\.([a-z0-9]{2,4})(?:[\?#]|$)", url, re.I)
+    m = URL_EXT_RE.search(url)
     if m:
         return "." + m.group(1).lower()
     if "mp4" in ctype:
@@ -1326,44 +1723,39 @@ def _guess_ext(url: str, ctype: str) -> str:
 
 def _safe_name(name: str) -> str:
     """Sanitize filename by replacing unsafe characters."""
-    return re.sub(r"[^a-zA-Z0-9._-]", "_", name or "file")
+    name = name or "file"
+    if name.isascii():
+        # One C-level pass over the bytes
+        return name.encode("ascii").translate(SAFE_FILENAME_TABLE).decode("ascii")
+    # The table only covers single bytes; other names take the regex path
+    return UNSAFE_FILENAME_RE.sub("_", name)
 
 
-def _extract_links(page: Page, base_url: str) -> List[str]:
+async def _extract_links(page: Page, base_url: str) -> List[str]:
     """Extract all links from the current page (normalized)."""
     links = []
+    seen = set()
     try:
-        anchors = page.locator('a[href]')
-        for i in range(min(100, anchors.count())):  # Limit to 100 links per page
+        base_netloc = urlparse(base_url).netloc
+        # Every href attribute in one round-trip (limit to 100 links per page)
+        hrefs = await page.eval_on_selector_all(
+            'a[href]', 'els => els.slice(0, 100).map(e => e.getAttribute("href"))'
+        )
+        for href in hrefs:
             try:
-                href = anchors.nth(i).get_attribute('href')
                 if href:
                     full_url = urljoin(base_url, href)
                     # Normalize URL to remove hash fragments
                     normalized_url = normalize_url(full_url)
                     # Only keep links from the same domain
-                    if urlparse(normalized_url).netloc == urlparse(base_url).netloc:
+                    if urlparse(normalized_url).netloc == base_netloc:
                         # FILTER: Skip country selector and regional URLs
                         # This prevents looping through different country stores
-                        skip_patterns = [
-                            '?__geom=',  # Country selector parameter
-                            '/en-us',    # US store
-                            '/en-au',    # Australian store
-                            '/en-ca',    # Canadian store
-                            '/en-ie',    # Irish store
-                            '/en-eu',    # EU store
-                            '/en-nz',    # New Zealand store
-                            '/de-de',    # German store
-                            '/fr-fr',    # French store
-                            '/es-es',    # Spanish store
-                            '/it-it',    # Italian store
-                        ]
-                        
-                        # Skip if URL contains any regional patterns
-                        if any(pattern in normalized_url.lower() for pattern in skip_patterns):
+                        if REGIONAL_URL_RE.search(normalized_url):
                             continue
                         
-                        if normalized_url not in links:
+                        if normalized_url not in seen:
+                            seen.add(normalized_url)
                             links.append(normalized_url)
             except:
                 continue
@@ -1373,7 +1765,7 @@ def _extract_links(page: Page, base_url: str) -> List[str]:
     return links
 
 
-def _detect_and_scrape_buy_buttons(
+async def _detect_and_scrape_buy_buttons(
     page: Page,
     context: BrowserContext,
     out_dir: str,
@@ -1399,52 +1791,16 @@ def _detect_and_scrape_buy_buttons(
         # ENHANCED: Take a diagnostic screenshot to see the page state
         if verbose:
             try:
-                screenshot_dir = os.path.join(out_dir, "diagnostics")
-                os.makedirs(screenshot_dir, exist_ok=True)
-                timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+                screenshot_dir = _ensure_dir(os.path.join(out_dir, "diagnostics"))
+                timestamp = _now("%Y%m%d_%H%M%S")
                 safe_url = _safe_name(page.url.split('/')[-1] or "homepage")
                 diagnostic_path = os.path.join(screenshot_dir, f"buy_detection_{safe_url}_{timestamp}.png")
-                page.screenshot(path=diagnostic_path, full_page=True)
+                await page.screenshot(path=diagnostic_path, full_page=True)
                 print(f"[Diagnostic] Screenshot saved: {os.path.basename(diagnostic_path)}")
             except:
                 pass
         
-        # Look for "Buy Now" or "Buy" buttons/links
-        # ENHANCED: More comprehensive selectors
-        buy_button_selectors = [
-            # Text-based (case insensitive)
-            'a:has-text("Buy Now")',
-            'a:has-text("Buy now")',
-            'a:has-text("buy now")',
-            'a:has-text("BUY NOW")',
-            'button:has-text("Buy Now")',
-            'button:has-text("Buy now")',
-            'button:has-text("buy now")',
-            'a:has-text("Buy")',
-            'button:has-text("Buy")',
-            'a:has-text("buy")',
-            'button:has-text("buy")',
-            'a:has-text("Shop Now")',
-            'a:has-text("shop now")',
-            'button:has-text("Shop Now")',
-            'a:has-text("View Product")',
-            'a:has-text("Learn More")',
-            # Class and data attributes
-            '[data-action*="buy"]',
-            '[class*="buy-button"]',
-            '[class*="buy-btn"]',
-            '[class*="shop-now"]',
-            '[class*="shop-button"]',
-            '[class*="product-link"]',
-            '[data-testid*="buy"]',
-            '[data-testid*="shop"]',
-            # Product card links
-            '.product-card a',
-            '.product-item a',
-            '[class*="product-card"] a',
-            '[class*="product-item"] a',
-        ]
-        
+        # Look for "Buy Now" or "Buy" buttons/links (BUY_BUTTON_SELECTORS)
         buy_links = []
         total_buttons_found = 0
         skipped_already_visited = 0
@@ -1452,40 +1808,19 @@ def _detect_and_scrape_buy_buttons(
         skipped_no_href = 0
         
         # Collect all buy button links
-        for selector in buy_button_selectors:
+        for selector in BUY_BUTTON_SELECTORS:
             try:
-                elements = page.locator(selector)
-                count = elements.count()
+                # Count and resolve the first 50 matches (link, parent/sibling/nearby link) in one round-trip
+                found = await page.locator(selector).evaluate_all(BUY_ELEMENT_HREFS_JS)
+                count = found['count']
                 
                 if count > 0:
                     total_buttons_found += count
                     if verbose:
                         print(f"[Buy Detection] '{selector}' → {count} element(s)")
                 
-                for i in range(min(count, 50)):  # Increased limit to 50 to catch more products
+                for href in found['hrefs']:  # Increased limit to 50 to catch more products
                     try:
-                        element = elements.nth(i)
-                        
-                        # Get the href if it's a link
-                        href = element.get_attribute('href')
-                        
-                        # If it's a button, try to find the closest parent link
-                        if not href:
-                            # Try multiple strategies to find the link
-                            parent_link = element.locator('xpath=ancestor::a[@href]').first
-                            if parent_link.count() > 0:
-                                href = parent_link.get_attribute('href')
-                            else:
-                                # Try to find sibling link
-                                sibling_link = element.locator('xpath=following-sibling::a[@href] | preceding-sibling::a[@href]').first
-                                if sibling_link.count() > 0:
-                                    href = sibling_link.get_attribute('href')
-                                else:
-                                    # Try to find any nearby link in the same container
-                                    nearby_link = element.locator('xpath=ancestor::*[contains(@class, "product") or contains(@class, "card") or contains(@class, "item")]//a[@href]').first
-                                    if nearby_link.count() > 0:
-                                        href = nearby_link.get_attribute('href')
-                        
                         if href:
                             full_url = urljoin(page.url, href)
                             normalized_url = normalize_url(full_url)
@@ -1530,37 +1865,21 @@ def _detect_and_scrape_buy_buttons(
                 print(f"[Buy Detection] No buy buttons found, trying fallback product link detection...")
             
             # Look for product containers and extract links from them
-            product_container_selectors = [
-                '[class*="product-card"]',
-                '[class*="product-item"]',
-                '[class*="product-tile"]',
-                '[class*="product-box"]',
-                '.product',
-                '[data-product-id]',
-                '[data-testid*="product"]',
-            ]
-            
-            for container_selector in product_container_selectors:
+            for container_selector in PRODUCT_CARD_SELECTORS:
                 try:
-                    containers = page.locator(container_selector)
-                    container_count = containers.count()
+                    # Count the containers and read the links of the first 20 in one round-trip
+                    found = await page.locator(container_selector).evaluate_all(PRODUCT_CARD_HREFS_JS)
+                    container_count = found['count']
                     
                     if container_count > 0:
                         if verbose:
                             print(f"[Buy Detection] Found {container_count} product container(s) with selector: {container_selector}")
                         
-                        for j in range(min(container_count, 20)):
+                        for container_hrefs in found['hrefs']:
                             try:
-                                container = containers.nth(j)
                                 # Look for any link in this container
-                                links = container.locator('a[href]')
-                                link_count = links.count()
-                                
-                                for k in range(min(link_count, 3)):  # Max 3 links per container
+                                for href in container_hrefs:  # Max 3 links per container
                                     try:
-                                        link = links.nth(k)
-                                        href = link.get_attribute('href')
-                                        
                                         if href:
                                             full_url = urljoin(page.url, href)
                                             normalized_url = normalize_url(full_url)
@@ -1593,6 +1912,9 @@ def _detect_and_scrape_buy_buttons(
         else:
             print(f"[Buy Buttons] No new product URLs found to scrape\n")
         
+        # (product, image URL, filename) of each scraped product; downloaded together after the tabs
+        media_jobs = []
+        
         # Scrape each buy button link in a new tab
         for idx, buy_url in enumerate(buy_links, 1):
             try:
@@ -1603,20 +1925,20 @@ def _detect_and_scrape_buy_buttons(
                 visited_urls.add(buy_url)
                 
                 # Open new tab/page
-                new_page = context.new_page()
+                new_page = await context.new_page()
                 new_page.set_default_timeout(30000)
                 
                 try:
                     # Navigate to the product page
-                    new_page.goto(buy_url, wait_until="domcontentloaded")
-                    new_page.wait_for_timeout(2000)  # Wait for content
+                    await new_page.goto(buy_url, wait_until="domcontentloaded", timeout=NAVIGATION_TIMEOUT_MS)
+                    await _wait_for_content(new_page, PRODUCT_READY_SELECTOR)
                     
                     # Accept cookies on the new page
                     if accept_cookies:
-                        _accept_cookies(new_page, verbose=verbose)
+                        await _accept_cookies(new_page, verbose=verbose)
                     
                     # Check if it's a product page
-                    is_product = _is_product_page(new_page, verbose=verbose)
+                    is_product = await _is_product_page(new_page, verbose=verbose)
                     
                     if verbose:
                         print(f"[Buy Button] URL: {buy_url}")
@@ -1627,7 +1949,7 @@ def _detect_and_scrape_buy_buttons(
                             print(f"[Buy Button] Product page detected!")
                         
                         # Extract product data (including buying options if enabled)
-                        product = _extract_product_data(new_page, extract_buying_options=extract_buying_options)
+                        product = await _extract_product_data(new_page, extract_buying_options=extract_buying_options)
                         product.page_url = buy_url
                         
                         print(f"[Product] {product.product_name}")
@@ -1648,15 +1970,12 @@ def _detect_and_scrape_buy_buttons(
                         # Take screenshot of the buy button product page
                         if take_screenshots and product.product_name:
                             safe_filename = _safe_name(product.product_name[:100])
-                            screenshot_path = _take_product_screenshot(new_page, safe_filename, out_dir, verbose=verbose)
+                            screenshot_path = await _take_product_screenshot(new_page, safe_filename, out_dir, verbose=verbose)
                             if screenshot_path:
                                 print(f"[Screenshot] Buy button product page saved: {os.path.basename(screenshot_path)}")
                         
-                        # Extract and download the main product image next to product name
+                        # Extract the main product image next to product name (downloaded below)
                         if download_media and product.product_name:
-                            media_dir = os.path.join(out_dir, "media")
-                            os.makedirs(media_dir, exist_ok=True)
-                            
                             # Create filename from product name
                             safe_filename = _safe_name(product.product_name[:100])
                             
@@ -1664,31 +1983,20 @@ def _detect_and_scrape_buy_buttons(
                             if verbose:
                                 print(f"[Buy Button] Extracting main product image...")
                             
-                            main_image_url = _extract_main_product_image(new_page, verbose=verbose)
+                            main_image_url = await _extract_main_product_image(new_page, verbose=verbose)
                             
                             if main_image_url:
                                 # Update product images if extraction found something
                                 if main_image_url not in product.images:
                                     product.images = [main_image_url]
                                 
-                                # Download the image
-                                media_path = _download_media(context, main_image_url, safe_filename, media_dir)
-                                if media_path:
-                                    product.media_files = [media_path]
-                                    print(f"[Downloaded] {os.path.basename(media_path)}")
-                                else:
-                                    if verbose:
-                                        print(f"[Buy Button] Failed to download image")
+                                media_jobs.append((product, main_image_url, safe_filename))
                             else:
                                 # Fallback: try to use images from product data extraction
                                 if product.images:
                                     if verbose:
                                         print(f"[Buy Button] Using fallback image from product data")
-                                    img_url = product.images[0]
-                                    media_path = _download_media(context, img_url, safe_filename, media_dir)
-                                    if media_path:
-                                        product.media_files = [media_path]
-                                        print(f"[Downloaded] {os.path.basename(media_path)}")
+                                    media_jobs.append((product, product.images[0], safe_filename))
                                 else:
                                     if verbose:
                                         print(f"[Buy Button] No images found for product")
@@ -1700,7 +2008,7 @@ def _detect_and_scrape_buy_buttons(
                 
                 finally:
                     # Always close the tab
-                    new_page.close()
+                    await new_page.close()
                     if verbose:
                         print(f"[Buy Button] Tab closed, continuing...")
                 
@@ -1709,6 +2017,18 @@ def _detect_and_scrape_buy_buttons(
                     print(f"[Buy Button Error] Failed to scrape {buy_url}: {e}")
                 continue
         
+        # Download the main images of every scraped product concurrently
+        if media_jobs:
+            media_dir = _ensure_dir(os.path.join(out_dir, "media"))
+            jobs = [(img_url, safe_filename) for _, img_url, safe_filename in media_jobs]
+            media_paths = await _download_media_batch(context, jobs, media_dir)
+            for (product, _, _), media_path in zip(media_jobs, media_paths):
+                if media_path:
+                    product.media_files = [media_path]
+                    print(f"[Downloaded] {os.path.basename(media_path)}")
+                elif verbose:
+                    print(f"[Buy Button] Failed to download image for {product.product_name}")
+        
         if scraped_products:
             print(f"[Buy Buttons] Successfully scraped {len(scraped_products)} product(s)")
         
@@ -1719,7 +2039,319 @@ def _detect_and_scrape_buy_buttons(
     return scraped_products
 
 
-def crawl_website(
+def _resource_blocker(blocked_types: Set[str]):
+    """Build a route handler that aborts requests whose resource type is in blocked_types."""
+    async def block(route) -> None:
+        try:
+            if route.request.resource_type in blocked_types:
+                await route.abort()
+            else:
+                await route.continue_()
+        except Exception:
+            pass
+    return block
+
+
+class ContextPool:
+    """
+    Fixed set of browser contexts shared by the crawl tasks.
+    
+    Contexts are created once per crawl and handed out round-robin, so each
+    URL pays for a new page rather than a new browser or context. Pooled
+    contexts block BLOCKED_RESOURCE_TYPES; `media_context` is used for product
+    pages, whose images and screenshots are needed, and only blocks
+    PRODUCT_BLOCKED_RESOURCE_TYPES.
+    
+    A pooled context is closed and replaced after MAX_CONTEXT_USES pages so
+    caches and JS heap don't accumulate over long crawls; the replacement
+    starts from the cookie state captured by share_cookies(). `media_context`
+    is shared rather than handed out, so crawl tasks take it with
+    acquire_media(); once it has served MAX_CONTEXT_USES tasks new ones get a
+    fresh context and the old one is closed when its last user releases it.
+    """
+    
+    def __init__(self, browser, size: int):
+        self.browser = browser
+        self.size = max(1, size)
+        self._queue: asyncio.Queue = asyncio.Queue()
+        self._contexts: List[BrowserContext] = []
+        self._uses: Dict[BrowserContext, int] = {}
+        self.media_context: Optional[BrowserContext] = None
+        # Crawl tasks currently holding each media context (old ones stay open until 0)
+        self._media_users: Dict[BrowserContext, int] = {}
+        self._replacing_media = False
+        # storage_state captured after the cookie banner was accepted, per origin
+        self.origin_states: Dict[str, dict] = {}
+    
+    async def start(self) -> None:
+        """Pre-warm `size` contexts."""
+        for _ in range(self.size):
+            context = await self._new_context()
+            self._contexts.append(context)
+            self._queue.put_nowait(context)
+        self.media_context = await self._new_context(PRODUCT_BLOCKED_RESOURCE_TYPES)
+    
+    async def acquire(self) -> BrowserContext:
+        """Wait for an idle context."""
+        return await self._queue.get()
+    
+    def acquire_media(self) -> BrowserContext:
+        """Take the current media context; pair with release_media()."""
+        context = self.media_context
+        self._media_users[context] = self._media_users.get(context, 0) + 1
+        return context
+    
+    async def _new_context(self, blocked_types: Set[str] = BLOCKED_RESOURCE_TYPES) -> BrowserContext:
+        """Create a resource-blocking context seeded with the accepted cookie state."""
+        cookies = [c for state in self.origin_states.values() for c in state.get("cookies", [])]
+        origins = [o for state in self.origin_states.values() for o in state.get("origins", [])]
+        context = await self.browser.new_context(storage_state={"cookies": cookies, "origins": origins})
+        await context.route("**/*", _resource_blocker(blocked_types))
+        self._uses[context] = 0
+        return context
+    
+    async def release(self, context: BrowserContext) -> None:
+        """Return a context to the pool, replacing it once it has served MAX_CONTEXT_USES pages."""
+        self._uses[context] = self._uses.get(context, 0) + 1
+        if self._uses[context] >= MAX_CONTEXT_USES:
+            try:
+                fresh = await self._new_context()
+            except Exception:
+                fresh = None
+            if fresh is not None:
+                self._contexts[self._contexts.index(context)] = fresh
+                del self._uses[context]
+                try:
+                    await context.close()
+                except Exception:
+                    pass
+                context = fresh
+        self._queue.put_nowait(context)
+    
+    async def release_media(self, context: BrowserContext) -> None:
+        """Give back a media context, replacing it once it has served MAX_CONTEXT_USES tasks."""
+        self._media_users[context] -= 1
+        self._uses[context] += 1
+        if (context is self.media_context and self._uses[context] >= MAX_CONTEXT_USES
+                and not self._replacing_media):
+            self._replacing_media = True
+            try:
+                self.media_context = await self._new_context(PRODUCT_BLOCKED_RESOURCE_TYPES)
+            except Exception:
+                pass
+            finally:
+                self._replacing_media = False
+        # A retired media context is closed once the last task using it is done
+        if context is not self.media_context and self._media_users[context] == 0:
+            del self._media_users[context]
+            del self._uses[context]
+            try:
+                await context.close()
+            except Exception:
+                pass
+    
+    def cookies_accepted(self, url: str) -> bool:
+        """True once the cookie banner has been accepted for url's origin."""
+        return _origin(url) in self.origin_states
+    
+    async def share_cookies(self, context: BrowserContext, url: str) -> None:
+        """Record context's storage_state for url's origin and copy its cookies to the other contexts."""
+        try:
+            state = await context.storage_state()
+        except Exception:
+            return
+        self.origin_states[_origin(url)] = state
+        for other in self._contexts + [self.media_context]:
+            if other is not None and other is not context:
+                try:
+                    await other.add_cookies(state.get("cookies", []))
+                except Exception:
+                    pass
+    
+    async def close(self) -> None:
+        """Close every context owned by the pool."""
+        for context in self._contexts + [self.media_context]:
+            if context is None:
+                continue
+            try:
+                await context.close()
+            except Exception:
+                pass
+
+
+async def _crawl_page(
+    pool: ContextPool,
+    normalized_url: str,
+    crawl_no: int,
+    out_dir: str,
+    download_media: bool,
+    verbose: bool,
+    scroll_enabled: bool,
+    buy_button_scraping: bool,
+    take_screenshots: bool,
+    accept_cookies: bool,
+    extract_buying_options: bool,
+    visited_urls: Set[str],
+) -> tuple[Optional[PageData], List[str]]:
+    """
+    Crawl a single URL in its own page.
+    
+    Returns:
+        Tuple of (PageData or None on failure, links found on the page)
+    """
+    context = await pool.acquire()
+    media_context = pool.acquire_media()
+    page = None
+    try:
+        # Product URLs go straight to the context that loads images, so they are navigated once
+        url_is_product = _looks_like_product_url(normalized_url)
+        page_context = media_context if url_is_product else context
+        page = await page_context.new_page()
+        page.set_default_timeout(30000)
+        await page.goto(normalized_url, wait_until="domcontentloaded", timeout=NAVIGATION_TIMEOUT_MS)
+        await _wait_for_content(page, PRODUCT_READY_SELECTOR if url_is_product else PAGE_READY_SELECTOR)
+        
+        # NEW: Accept cookies first to avoid interference (once per origin; the
+        # resulting cookies are shared with every context in the pool)
+        if accept_cookies and not pool.cookies_accepted(normalized_url):
+            if await _accept_cookies(page, verbose=verbose):
+                await pool.share_cookies(page_context, normalized_url)
+        
+        # NEW: Scroll page to load all content (images are blocked on discovery pages, so no settle wait there)
+        if scroll_enabled:
+            await _scroll_page_to_load_content(page, verbose=verbose, wait_for_images=url_is_product)
+        
+        # DIAGNOSTIC: Take screenshot after page load to verify content
+        if verbose:
+            try:
+                screenshot_dir = _ensure_dir(os.path.join(out_dir, "diagnostics"))
+                timestamp = _now("%Y%m%d_%H%M%S")
+                safe_url = _safe_name(normalized_url.split('/')[-1] or f"page_{crawl_no}")
+                diagnostic_path = os.path.join(screenshot_dir, f"crawl_{crawl_no}_{safe_url}_{timestamp}.png")
+                await page.screenshot(path=diagnostic_path, full_page=True)
+                print(f"[Diagnostic] Page screenshot: {os.path.basename(diagnostic_path)}")
+            except:
+                pass
+        
+        # Get page title
+        page_title = await page.title()
+        
+        # Check if it's a product page
+        is_product = await _is_product_page(page, verbose=verbose)
+        print(f"[Detection] Product page: {is_product}")
+        
+        products = []
+        
+        if is_product and not url_is_product:
+            # Detected from the DOM with images blocked: a page route takes precedence over
+            # the context's, so reload this same page (cookie banner state kept) with images allowed
+            await page.route("**/*", _resource_blocker(PRODUCT_BLOCKED_RESOURCE_TYPES))
+            await page.reload(wait_until="domcontentloaded", timeout=NAVIGATION_TIMEOUT_MS)
+            await _wait_for_content(page, PRODUCT_READY_SELECTOR)
+            if scroll_enabled:
+                await _scroll_page_to_load_content(page, verbose=verbose)
+        
+        if is_product:
+            
+            # Extract product data (including buying options if enabled)
+            product = await _extract_product_data(page, extract_buying_options=extract_buying_options)
+            # Update URL to normalized version
+            product.page_url = normalized_url
+            
+            print(f"[Product] {product.product_name}")
+            print(f"[Price] {product.price} {product.currency or 'N/A'}")
+            print(f"[Images] Found {len(product.images)} main image(s)")
+            if product.buying_options:
+                print(f"[Buying Options] Found {len(product.buying_options)} option(s)")
+                for option in product.buying_options[:3]:  # Show first 3
+                    price_info = ""
+                    if option.original_price and option.updated_price:
+                        if option.original_price == option.updated_price:
+                            price_info = f" - ${option.updated_price}"
+                        else:
+                            price_info = f" - ${option.original_price} → ${option.updated_price}"
+                    elif option.updated_price:
+                        price_info = f" - ${option.updated_price}"
+                    print(f"  - {option.option_type}: {option.value} {option.unit}{price_info}")
+            
+            # Take screenshot of the product page
+            if take_screenshots and product.product_name:
+                safe_filename = _safe_name(product.product_name[:100])
+                screenshot_path = await _take_product_screenshot(page, safe_filename, out_dir, verbose=verbose)
+                if screenshot_path:
+                    print(f"[Screenshot] Product page saved: {os.path.basename(screenshot_path)}")
+            
+            # Download media if requested
+            if download_media and product.images and product.product_name:
+                media_dir = _ensure_dir(os.path.join(out_dir, "media"))
+                
+                # Create filename from product name (like "Save image as" with product name)
+                product_name = product.product_name
+                # Clean the product name for filename
+                safe_filename = _safe_name(product_name[:100])  # Limit length
+                
+                # Download the product images concurrently (the first one is the main image)
+                jobs = [
+                    (img_url, safe_filename if i == 0 else f"{safe_filename}_{i + 1}")
+                    for i, img_url in enumerate(product.images)
+                ]
+                downloaded = []
+                for media_path in await _download_media_batch(media_context, jobs, media_dir):
+                    if media_path:
+                        downloaded.append(media_path)
+                        print(f"[Downloaded] {os.path.basename(media_path)}")
+                
+                product.media_files = downloaded
+            
+            products.append(product)
+        else:
+            # NEW: If not a product page, check for "Buy Now" or "Buy" buttons
+            # and scrape their target pages in new tabs
+            if buy_button_scraping:
+                buy_button_products = await _detect_and_scrape_buy_buttons(
+                    page=page,
+                    context=media_context,
+                    out_dir=out_dir,
+                    download_media=download_media,
+                    visited_urls=visited_urls,
+                    verbose=verbose,
+                    take_screenshots=take_screenshots,
+                    accept_cookies=accept_cookies,
+                    extract_buying_options=extract_buying_options  # NEW: Pass buying options flag
+                )
+                
+                if buy_button_products:
+                    products.extend(buy_button_products)
+        
+        # Extract links for further crawling
+        links = await _extract_links(page, normalized_url)
+        
+        # Create page data
+        page_data = PageData(
+            url=normalized_url,
+            is_product_page=is_product,
+            page_title=page_title,
+            crawled_at=_now(),
+            products=products,
+            links_found=links[:20],  # Limit stored links
+        )
+        
+        return page_data, links
+        
+    except Exception as e:
+        print(f"[Error] Failed to crawl {normalized_url}: {e}")
+        return None, []
+    finally:
+        if page is not None:
+            try:
+                await page.close()
+            except:
+                pass
+        await pool.release_media(media_context)
+        await pool.release(context)
+
+
+async def crawl_website_async(
     start_url: str,
     out_dir: str,
     max_pages: int = 20,
@@ -1730,10 +2362,11 @@ def crawl_website(
     buy_button_scraping: bool = True,
     take_screenshots: bool = True,
     accept_cookies: bool = True,
-    extract_buying_options: bool = True  # NEW: Enable buying options extraction
+    extract_buying_options: bool = True,  # NEW: Enable buying options extraction
+    concurrency: int = MAX_PARALLEL_PAGES
 ) -> List[PageData]:
     """
-    Crawl website starting from start_url.
+    Crawl website starting from start_url, visiting up to `concurrency` pages at once.
     
     Args:
         start_url: Starting URL to crawl
@@ -1747,178 +2380,104 @@ def crawl_website(
         take_screenshots: Whether to take screenshots of product pages
         accept_cookies: Whether to automatically accept cookie banners
         extract_buying_options: Whether to extract buying options (quantities, subscriptions, variants)
+        concurrency: Maximum number of pages processed in parallel
     
     Returns:
         List of PageData objects with crawled information
     """
-    with sync_playwright() as p:
-        browser = p.chromium.launch(
+    async with async_playwright() as p:
+        browser = await p.chromium.launch(
             headless=headless,
             args=["--disable-blink-features=AutomationControlled"]
         )
-        context = browser.new_context()
-        page = context.new_page()
-        page.set_default_timeout(30000)
+        pool = ContextPool(browser, concurrency)
         
         os.makedirs(out_dir, exist_ok=True)
         
         visited_urls: Set[str] = set()
         to_visit: List[str] = [normalize_url(start_url)]
         results: List[PageData] = []
+        pending: Set[asyncio.Task] = set()
         
-        base_domain = urlparse(start_url).netloc
+        base_domain = urlparse(to_visit[0]).netloc
         
-        while to_visit and len(visited_urls) < max_pages:
-            current_url = to_visit.pop(0)
-            
-            # Normalize URL to prevent hash fragment duplicates
-            normalized_url = normalize_url(current_url)
-            
-            # Skip if already visited
-            if normalized_url in visited_urls:
-                continue
-            
-            # Skip non-http(s) URLs
-            if not normalized_url.startswith(('http://', 'https://')):
-                continue
-            
-            # Skip if different domain
-            if urlparse(normalized_url).netloc != base_domain:
-                continue
-            
-            print(f"\n[Crawling {len(visited_urls)+1}/{max_pages}] {normalized_url}")
-            visited_urls.add(normalized_url)
+        # Stream, contexts and browser are closed (and unfinished pages cancelled)
+        # even if the crawl is interrupted
+        try:
+            await pool.start()
             
-            try:
-                page.goto(normalized_url, wait_until="domcontentloaded")
-                page.wait_for_timeout(2000)  # Wait for dynamic content
-                
-                # NEW: Accept cookies first to avoid interference
-                if accept_cookies:
-                    _accept_cookies(page, verbose=verbose)
-                
-                # NEW: Scroll page to load all content
-                if scroll_enabled:
-                    _scroll_page_to_load_content(page, verbose=verbose)
-                
-                # DIAGNOSTIC: Take screenshot after page load to verify content
-                if verbose:
-                    try:
-                        screenshot_dir = os.path.join(out_dir, "diagnostics")
-                        os.makedirs(screenshot_dir, exist_ok=True)
-                        timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-                        safe_url = _safe_name(normalized_url.split('/')[-1] or f"page_{len(visited_urls)}")
-                        diagnostic_path = os.path.join(screenshot_dir, f"crawl_{len(visited_urls)}_{safe_url}_{timestamp}.png")
-                        page.screenshot(path=diagnostic_path, full_page=True)
-                        print(f"[Diagnostic] Page screenshot: {os.path.basename(diagnostic_path)}")
-                    except:
-                        pass
-                
-                # Get page title
-                page_title = page.title()
+            # Products are streamed here as they are scraped (deduplicated like products.json)
+            with open(os.path.join(out_dir, "products.ndjson"), "wb") as stream:
+                streamed_urls: Set[str] = set()
                 
-                # Check if it's a product page
-                is_product = _is_product_page(page, verbose=verbose)
-                print(f"[Detection] Product page: {is_product}")
-                
-                products = []
-                
-                if is_product:
-                    # Extract product data (including buying options if enabled)
-                    product = _extract_product_data(page, extract_buying_options=extract_buying_options)
-                    # Update URL to normalized version
-                    product.page_url = normalized_url
-                    
-                    print(f"[Product] {product.product_name}")
-                    print(f"[Price] {product.price} {product.currency or 'N/A'}")
-                    print(f"[Images] Found {len(product.images)} main image(s)")
-                    if product.buying_options:
-                        print(f"[Buying Options] Found {len(product.buying_options)} option(s)")
-                        for option in product.buying_options[:3]:  # Show first 3
-                            price_info = ""
-                            if option.original_price and option.updated_price:
-                                if option.original_price == option.updated_price:
-                                    price_info = f" - ${option.updated_price}"
-                                else:
-                                    price_info = f" - ${option.original_price} → ${option.updated_price}"
-                            elif option.updated_price:
-                                price_info = f" - ${option.updated_price}"
-                            print(f"  - {option.option_type}: {option.value} {option.unit}{price_info}")
-                    
-                    # Take screenshot of the product page
-                    if take_screenshots and product.product_name:
-                        safe_filename = _safe_name(product.product_name[:100])
-                        screenshot_path = _take_product_screenshot(page, safe_filename, out_dir, verbose=verbose)
-                        if screenshot_path:
-                            print(f"[Screenshot] Product page saved: {os.path.basename(screenshot_path)}")
-                    
-                    # Download media if requested
-                    if download_media and product.images and product.product_name:
-                        media_dir = os.path.join(out_dir, "media")
-                        os.makedirs(media_dir, exist_ok=True)
+                while to_visit or pending:
+                    # Dispatch every queued URL; the context pool bounds how many run at once
+                    while to_visit and len(visited_urls) < max_pages:
+                        current_url = to_visit.pop(0)
+                        
+                        # Normalize URL to prevent hash fragment duplicates
+                        normalized_url = normalize_url(current_url)
                         
-                        # Create filename from product name (like "Save image as" with product name)
-                        product_name = product.product_name
-                        # Clean the product name for filename
-                        safe_filename = _safe_name(product_name[:100])  # Limit length
+                        # Skip if already visited
+                        if normalized_url in visited_urls:
+                            continue
                         
-                        # Download the main product image
-                        downloaded = []
-                        if product.images:
-                            img_url = product.images[0]  # Get the main image
-                            media_path = _download_media(context, img_url, safe_filename, media_dir)
-                            if media_path:
-                                downloaded.append(media_path)
-                                print(f"[Downloaded] {os.path.basename(media_path)}")
+                        # Skip non-http(s) URLs
+                        if not normalized_url.startswith(('http://', 'https://')):
+                            continue
                         
-                        product.media_files = downloaded
-                    
-                    products.append(product)
-                else:
-                    # NEW: If not a product page, check for "Buy Now" or "Buy" buttons
-                    # and scrape their target pages in new tabs
-                    if buy_button_scraping:
-                        buy_button_products = _detect_and_scrape_buy_buttons(
-                            page=page,
-                            context=context,
+                        # Skip if different domain
+                        if urlparse(normalized_url).netloc != base_domain:
+                            continue
+                        
+                        print(f"\n[Crawling {len(visited_urls)+1}/{max_pages}] {normalized_url}")
+                        visited_urls.add(normalized_url)
+                        
+                        pending.add(asyncio.create_task(_crawl_page(
+                            pool=pool,
+                            normalized_url=normalized_url,
+                            crawl_no=len(visited_urls),
                             out_dir=out_dir,
                             download_media=download_media,
-                            visited_urls=visited_urls,
                             verbose=verbose,
+                            scroll_enabled=scroll_enabled,
+                            buy_button_scraping=buy_button_scraping,
                             take_screenshots=take_screenshots,
                             accept_cookies=accept_cookies,
-                            extract_buying_options=extract_buying_options  # NEW: Pass buying options flag
-                        )
+                            extract_buying_options=extract_buying_options,
+                            visited_urls=visited_urls,
+                        )))
+                    
+                    if not pending:
+                        break
+                    
+                    done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+                    for task in done:
+                        page_data, links = task.result()
+                        if page_data is None:
+                            continue
                         
-                        if buy_button_products:
-                            products.extend(buy_button_products)
-                
-                # Extract links for further crawling
-                links = _extract_links(page, normalized_url)
-                
-                # Add new links to the queue
-                for link in links:
-                    normalized_link = normalize_url(link)
-                    if normalized_link not in visited_urls and normalized_link not in to_visit:
-                        to_visit.append(normalized_link)
-                
-                # Create page data
-                page_data = PageData(
-                    url=normalized_url,
-                    is_product_page=is_product,
-                    page_title=page_title,
-                    crawled_at=datetime.now().strftime("%Y-%m-%d %H:%M:%S"),
-                    products=products,
-                    links_found=links[:20],  # Limit stored links
-                )
-                
-                results.append(page_data)
-                
-            except Exception as e:
-                print(f"[Error] Failed to crawl {normalized_url}: {e}")
-                continue
-        
-        browser.close()
+                        results.append(page_data)
+                        for product in page_data.products:
+                            product_url = normalize_url(product.page_url)
+                            if product_url in streamed_urls:
+                                continue
+                            streamed_urls.add(product_url)
+                            stream.write(_ndjson_line(product))
+                        stream.flush()
+                        
+                        # Add new links to the queue
+                        for link in links:
+                            normalized_link = normalize_url(link)
+                            if normalized_link not in visited_urls and normalized_link not in to_visit:
+                                to_visit.append(normalized_link)
+        
+        finally:
+            for task in pending:
+                task.cancel()
+            await asyncio.gather(*pending, return_exceptions=True)
+            await pool.close()
+            await browser.close()
         
         # Count total products (including buy button products)
         total_products = sum(len(r.products) for r in results)
@@ -1933,6 +2492,11 @@ def crawl_website(
         return results
 
 
+def crawl_website(*args, **kwargs) -> List[PageData]:
+    """Synchronous entry point; runs crawl_website_async() in a fresh event loop."""
+    return asyncio.run(crawl_website_async(*args, **kwargs))
+
+
 def save_results(results: List[PageData], out_dir: str) -> None:
     """Save crawl results to JSON file."""
     try:
@@ -1943,7 +2507,7 @@ def save_results(results: List[PageData], out_dir: str) -> None:
         buy_button_count = sum(len(r.products) for r in results if not r.is_product_page and r.products)
         
         data = {
-            "crawl_time": datetime.now().strftime("%Y-%m-%d %H:%M:%S"),
+            "crawl_time": _now(),
             "total_pages": len(results),
             "product_pages": sum(1 for r in results if r.is_product_page),
             "total_products": total_products_count,
@@ -2056,6 +2620,12 @@ def main() -> int:
         action="store_true",
         help="Enable detection of buying options (quantities, subscriptions, variants)"
     )
+    parser.add_argument(
+        "--concurrency",
+        type=int,
+        default=MAX_PARALLEL_PAGES,
+        help="Number of pages crawled in parallel"
+    )
     
     args = parser.parse_args()
     
@@ -2087,7 +2657,8 @@ def main() -> int:
         buy_button_scraping=not args.no_buy_buttons,
         take_screenshots=not args.no_screenshots,
         accept_cookies=not args.no_cookies,
-        extract_buying_options=args.buying_options  # NEW: Enable buying options detection
+        extract_buying_options=args.buying_options,  # NEW: Enable buying options detection
+        concurrency=args.concurrency
     )
     
     save_results(results, args.out_dir)
@@ -33,6 +33,7 @@ import json
 import os
 import re
 import time
+from collections import deque
 from dataclasses import dataclass, asdict
 from datetime import datetime
 from typing import List, Optional, Dict, Set
@@ -106,6 +107,216 @@ CURRENCY_MAP = {
     '€': 'EUR',
 }
 
+# File extension at the end of a URL path (before any query/fragment)
+URL_EXT_RE = re.compile(r"\.([a-z0-9]{2,4})(?:[\?#]|$)", re.I)
+
+# Characters not allowed in saved media filenames
+UNSAFE_FILENAME_RE = re.compile(r"[^a-zA-Z0-9._-]")
+
+# Country selector / regional store URLs skipped by _extract_links (prevents looping through country stores)
+REGIONAL_URL_RE = re.compile("|".join(map(re.escape, (
+    '?__geom=',  # Country selector parameter
+    '/en-us',    # US store
+    '/en-au',    # Australian store
+    '/en-ca',    # Canadian store
+    '/en-ie',    # Irish store
+    '/en-eu',    # EU store
+    '/en-nz',    # New Zealand store
+    '/de-de',    # German store
+    '/fr-fr',    # French store
+    '/es-es',    # Spanish store
+    '/it-it',    # Italian store
+))), re.I)
+
+# "Buy Now" / "Buy" buttons and links on catalog pages, probed by _detect_and_scrape_buy_buttons
+BUY_BUTTON_SELECTORS = (
+    # Text-based (case insensitive)
+    'a:has-text("Buy Now")',
+    'a:has-text("Buy now")',
+    'a:has-text("buy now")',
+    'a:has-text("BUY NOW")',
+    'button:has-text("Buy Now")',
+    'button:has-text("Buy now")',
+    'button:has-text("buy now")',
+    'a:has-text("Buy")',
+    'button:has-text("Buy")',
+    'a:has-text("buy")',
+    'button:has-text("buy")',
+    'a:has-text("Shop Now")',
+    'a:has-text("shop now")',
+    'button:has-text("Shop Now")',
+    'a:has-text("View Product")',
+    'a:has-text("Learn More")',
+    # Class and data attributes
+    '[data-action*="buy"]',
+    '[class*="buy-button"]',
+    '[class*="buy-btn"]',
+    '[class*="shop-now"]',
+    '[class*="shop-button"]',
+    '[class*="product-link"]',
+    '[data-testid*="buy"]',
+    '[data-testid*="shop"]',
+    # Product card links
+    '.product-card a',
+    '.product-item a',
+    '[class*="product-card"] a',
+    '[class*="product-item"] a',
+)
+
+# All buy-button selectors as one selector list: one query and one DOM traversal per page
+COMBINED_BUY_SELECTOR = ", ".join(BUY_BUTTON_SELECTORS)
+
+# Upper bound on buy-button elements inspected per page
+MAX_BUY_ELEMENTS = 200
+
+# Buy-button product tabs loading at the same time, and the delay between opening them
+MAX_PARALLEL_BUY_TABS = 4
+BUY_TAB_STAGGER_MS = 150
+
+# After navigation, wait up to NETWORK_IDLE_WAIT_MS for the network to go quiet, then up to
+# PRODUCT_SIGNAL_WAIT_MS for product markup (busy pages with analytics/long polling never go idle)
+NETWORK_IDLE_WAIT_MS = 1500
+PRODUCT_SIGNAL_WAIT_MS = 1000
+PRODUCT_SIGNAL_SELECTOR = '[class*="price"], [itemprop="price"], button:has-text("Add to cart")'
+
+# JPEG quality of the viewport-only diagnostic screenshots (--diagnostics)
+DIAGNOSTIC_JPEG_QUALITY = 60
+
+# URLs aborted on product pages (fonts, media, text tracks); images (main-image sizing,
+# screenshots) and CSS (layout) still load. Matched by URL so the sync API only routes
+# these requests through Python, not every request of every tab.
+PRODUCT_BLOCKED_URL_RE = re.compile(
+    r"\.(?:woff2?|ttf|otf|eot|mp4|webm|m4v|mov|mp3|m3u8|vtt)(?:[?#]|$)", re.I
+)
+
+# URLs aborted on discovery pages: the above plus images and stylesheets (only links and
+# product signals are needed there)
+BLOCKED_URL_RE = re.compile(
+    r"\.(?:woff2?|ttf|otf|eot|mp4|webm|m4v|mov|mp3|m3u8|vtt"
+    r"|png|jpe?g|gif|webp|avif|svg|ico|css)(?:[?#]|$)", re.I
+)
+
+# URL fragments that rule out a product page (listing, regional store and account pages)
+PRODUCT_PAGE_EXCLUDE_PATTERNS = (
+    '/shop',
+    '/category',
+    '/categories',
+    '/collection',
+    '/collections',
+    '/search',
+    '?__geom=',  # Country selector parameters
+    '/en-us',    # US store
+    '/en-au',    # Australian store
+    '/en-ca',    # Canadian store
+    '/en-ie',    # Irish store
+    '/en-eu',    # EU store
+    '/en-nz',    # New Zealand store
+    '/de-de',    # German store
+    '/fr-fr',    # French store
+    '/es-es',    # Spanish store
+    '/it-it',    # Italian store
+    '/cart',
+    '/checkout',
+    '/account',
+    '/login',
+    '/register',
+)
+
+# Product URL patterns; a product ID/slug must follow (not just /products)
+PRODUCT_URL_PATTERNS = (
+    '/product/',
+    '/products/',
+    '/supplement/',     # Added for supplement sites
+    '/supplements/',    # Added for supplement sites
+    '/item/',
+    '/p/',
+    '/dp/',
+)
+
+# Target URL of each matched buy element (first `limit`) plus the match count, in one round-trip.
+# Buttons without an href fall back to the outermost ancestor <a href>, then the first sibling
+# <a href>, then the first <a href> inside the outermost product/card/item ancestor.
+BUY_ELEMENT_HREFS_JS = """
+(els, limit) => ({
+    count: els.length,
+    hrefs: els.slice(0, limit).map(el => {
+        const href = el.getAttribute('href');
+        if (href) return href;
+        const ancestors = [];
+        for (let p = el.parentElement; p; p = p.parentElement) ancestors.push(p);
+        const link = ancestors.filter(p => p.matches('a[href]')).pop();
+        if (link) return link.getAttribute('href');
+        const sibling = el.parentElement
+            ? Array.from(el.parentElement.children).find(c => c !== el && c.matches('a[href]'))
+            : null;
+        if (sibling) return sibling.getAttribute('href');
+        const card = ancestors.filter(p => /product|card|item/.test(p.getAttribute('class') || '')).pop();
+        const nearby = card ? card.querySelector('a[href]') : null;
+        return nearby ? nearby.getAttribute('href') : null;
+    }),
+})
+"""
+
+# Product cards searched for links when a catalog page has no buy buttons
+PRODUCT_CARD_SELECTORS = (
+    '[class*="product-card"]',
+    '[class*="product-item"]',
+    '[class*="product-tile"]',
+    '[class*="product-box"]',
+    '.product',
+    '[data-product-id]',
+    '[data-testid*="product"]',
+)
+
+# All product-card selectors as one selector list
+COMBINED_PRODUCT_CARD_SELECTOR = ", ".join(PRODUCT_CARD_SELECTORS)
+
+
+def _abort_route(route) -> None:
+    """Route handler for BLOCKED_URL_RE on discovery pages."""
+    try:
+        route.abort()
+    except Exception:
+        pass
+
+
+def _product_route(route) -> None:
+    """Page-level override of _abort_route: lets images and CSS through on product pages."""
+    try:
+        if PRODUCT_BLOCKED_URL_RE.search(route.request.url):
+            route.abort()
+        else:
+            route.continue_()
+    except Exception:
+        pass
+
+
+def _looks_like_product_url(url: str) -> bool:
+    """URL-only part of _is_product_page, used to allow images before navigating."""
+    url = url.lower()
+    path = url.split('?')[0]
+    if any(pattern in url for pattern in PRODUCT_PAGE_EXCLUDE_PATTERNS):
+        return False
+    if any(x in path for x in ['/index', '/home']):
+        return False
+    return any(
+        pattern in url and url.split(pattern)[1].strip('/')
+        for pattern in PRODUCT_URL_PATTERNS
+    )
+
+
+def _wait_for_content(page: Page) -> None:
+    """Wait for dynamic content: returns as soon as the network is idle or product markup is attached."""
+    try:
+        page.wait_for_load_state("networkidle", timeout=NETWORK_IDLE_WAIT_MS)
+        return
+    except:
+        pass
+    try:
+        page.wait_for_selector(PRODUCT_SIGNAL_SELECTOR, state="attached", timeout=PRODUCT_SIGNAL_WAIT_MS)
+    except:
+        pass
+
 
 def _accept_cookies(page: Page, verbose: bool = False) -> None:
     """
@@ -285,33 +496,7 @@ def _is_product_page(page: Page, verbose: bool = False) -> bool:
             print(f"[Product Detection] Checking URL: {url}")
         
         # EXCLUSION FILTERS: These are NOT product pages
-        exclusion_patterns = [
-            '/shop',
-            '/category',
-            '/categories',
-            '/collection',
-            '/collections',
-            '/search',
-            '?__geom=',  # Country selector parameters
-            '/en-us',    # US store
-            '/en-au',    # Australian store
-            '/en-ca',    # Canadian store
-            '/en-ie',    # Irish store
-            '/en-eu',    # EU store
-            '/en-nz',    # New Zealand store
-            '/de-de',    # German store
-            '/fr-fr',    # French store
-            '/es-es',    # Spanish store
-            '/it-it',    # Italian store
-            '/cart',
-            '/checkout',
-            '/account',
-            '/login',
-            '/register',
-        ]
-        
-        # Exclude if URL matches exclusion patterns
-        for pattern in exclusion_patterns:
+        for pattern in PRODUCT_PAGE_EXCLUDE_PATTERNS:
             if pattern in url:
                 if verbose:
                     print(f"[Product Detection] Excluded by pattern: {pattern}")
@@ -331,9 +516,9 @@ def _is_product_page(page: Page, verbose: bool = False) -> bool:
         
         # Check for JSON-LD Product schema (STRICT - must be exact @type match)
         json_ld = page.locator('script[type="application/ld+json"]')
-        for i in range(json_ld.count()):
+        for script in json_ld.element_handles():
             try:
-                content = json_ld.nth(i).inner_text()
+                content = script.inner_text()
                 data = json.loads(content)
                 
                 # Check if it's a single product
@@ -361,18 +546,8 @@ def _is_product_page(page: Page, verbose: bool = False) -> bool:
                 return True
         
         # Check URL patterns (STRICT - must have product ID or slug)
-        product_url_patterns = [
-            '/product/',
-            '/products/',
-            '/supplement/',     # Added for supplement sites
-            '/supplements/',    # Added for supplement sites
-            '/item/',
-            '/p/',
-            '/dp/',
-        ]
-        
         # URL must contain pattern AND have additional path segments (not just /products)
-        for pattern in product_url_patterns:
+        for pattern in PRODUCT_URL_PATTERNS:
             if pattern in url:
                 # Check if there's content after the pattern (product ID/slug)
                 parts = url.split(pattern)
@@ -441,9 +616,9 @@ def _extract_product_data(page: Page) -> ProductData:
         
         # Try JSON-LD
         json_ld = page.locator('script[type="application/ld+json"]')
-        for i in range(json_ld.count()):
+        for script in json_ld.element_handles():
             try:
-                content = json_ld.nth(i).inner_text()
+                content = script.inner_text()
                 data = json.loads(content)
                 
                 # Handle both single objects and arrays
@@ -564,9 +739,8 @@ def _extract_main_product_image(page: Page, verbose: bool = False) -> Optional[s
             all_images = page.locator('img[src]')
             
             # First pass: Look for exact variant matches
-            for i in range(min(20, all_images.count())):
+            for img in all_images.element_handles()[:20]:
                 try:
-                    img = all_images.nth(i)
                     src = img.get_attribute('src')
                     if src and not src.startswith('data:'):
                         full_url = urljoin(page.url, src)
@@ -624,8 +798,7 @@ def _extract_main_product_image(page: Page, verbose: bool = False) -> Optional[s
                     if verbose:
                         print(f"[Debug] Found container: {container_selector}")
                     imgs = container.locator('img[src]')
-                    for j in range(min(5, imgs.count())):
-                        img = imgs.nth(j)
+                    for img in imgs.element_handles()[:5]:
                         src = img.get_attribute('src')
                         if src and not src.startswith('data:'):
                             # Get dimensions
@@ -645,13 +818,12 @@ def _extract_main_product_image(page: Page, verbose: bool = False) -> Optional[s
         # Strategy 3: Find the largest image on the page (excluding obvious non-product images)
         if verbose:
             print(f"[Debug] Using size-based detection...")
-        all_images = page.locator('img[src]')
+        image_handles = page.locator('img[src]').element_handles()
         largest_image = None
         largest_area = 0
         
-        for i in range(min(20, all_images.count())):
+        for img in image_handles[:20]:
             try:
-                img = all_images.nth(i)
                 src = img.get_attribute('src')
                 if src and not src.startswith('data:'):
                     full_url = urljoin(page.url, src)
@@ -717,9 +889,8 @@ def _extract_main_product_image(page: Page, verbose: bool = False) -> Optional[s
         for layout_selector in layout_selectors:
             try:
                 layout_imgs = page.locator(layout_selector)
-                for i in range(min(5, layout_imgs.count())):
+                for img in layout_imgs.element_handles()[:5]:
                     try:
-                        img = layout_imgs.nth(i)
                         src = img.get_attribute('src')
                         if src and not src.startswith('data:'):
                             full_url = urljoin(page.url, src)
@@ -747,9 +918,8 @@ def _extract_main_product_image(page: Page, verbose: bool = False) -> Optional[s
         # Strategy 5: Fallback - get any reasonably large image
         if verbose:
             print(f"[Debug] Fallback: getting any large image...")
-        for i in range(min(10, all_images.count())):
+        for img in image_handles[:10]:
             try:
-                img = all_images.nth(i)
                 src = img.get_attribute('src')
                 if src and not src.startswith('data:'):
                     full_url = urljoin(page.url, src)
@@ -911,7 +1081,7 @@ def _download_media(context: BrowserContext, url: str, filename: str, out_dir: s
 
 def _guess_ext(url: str, ctype: str) -> str:
     """Guess file extension from URL or content-type."""
-    m = re.search(r"\.([a-z0-9]{2,4})(?:[\?#]|$)", url, re.I)
+    m = URL_EXT_RE.search(url)
     if m:
         return "." + m.group(1).lower()
     if "mp4" in ctype:
@@ -931,41 +1101,28 @@ def _guess_ext(url: str, ctype: str) -> str:
 
 def _safe_name(name: str) -> str:
     """Sanitize filename by replacing unsafe characters."""
-    return re.sub(r"[^a-zA-Z0-9._-]", "_", name or "file")
+    return UNSAFE_FILENAME_RE.sub("_", name or "file")
 
 
-def _extract_links(page: Page, base_url: str) -> List[str]:
+def _extract_links(page: Page, base_url: str, base_netloc: Optional[str] = None) -> List[str]:
     """Extract all links from the current page (normalized)."""
     links = []
+    if base_netloc is None:
+        base_netloc = urlparse(base_url).netloc
     try:
         anchors = page.locator('a[href]')
-        for i in range(min(100, anchors.count())):  # Limit to 100 links per page
+        for anchor in anchors.element_handles()[:100]:  # Limit to 100 links per page
             try:
-                href = anchors.nth(i).get_attribute('href')
+                href = anchor.get_attribute('href')
                 if href:
                     full_url = urljoin(base_url, href)
                     # Normalize URL to remove hash fragments
                     normalized_url = normalize_url(full_url)
                     # Only keep links from the same domain
-                    if urlparse(normalized_url).netloc == urlparse(base_url).netloc:
-                        # FILTER: Skip country selector and regional URLs
+                    if urlparse(normalized_url).netloc == base_netloc:
+                        # FILTER: Skip country selector and regional URLs (REGIONAL_URL_RE)
                         # This prevents looping through different country stores
-                        skip_patterns = [
-                            '?__geom=',  # Country selector parameter
-                            '/en-us',    # US store
-                            '/en-au',    # Australian store
-                            '/en-ca',    # Canadian store
-                            '/en-ie',    # Irish store
-                            '/en-eu',    # EU store
-                            '/en-nz',    # New Zealand store
-                            '/de-de',    # German store
-                            '/fr-fr',    # French store
-                            '/es-es',    # Spanish store
-                            '/it-it',    # Italian store
-                        ]
-                        
-                        # Skip if URL contains any regional patterns
-                        if any(pattern in normalized_url.lower() for pattern in skip_patterns):
+                        if REGIONAL_URL_RE.search(normalized_url):
                             continue
                         
                         if normalized_url not in links:
@@ -978,6 +1135,94 @@ def _extract_links(page: Page, base_url: str) -> List[str]:
     return links
 
 
+def _scrape_buy_tab(
+    new_page: Page,
+    context: BrowserContext,
+    buy_url: str,
+    out_dir: str,
+    download_media: bool,
+    verbose: bool = True,
+    take_screenshots: bool = True,
+    accept_cookies: bool = True
+) -> Optional[ProductData]:
+    """Scrape a buy-button product tab that has already been navigated to buy_url."""
+    # Accept cookies on the new page
+    if accept_cookies:
+        _accept_cookies(new_page, verbose=verbose)
+    
+    # Check if it's a product page
+    is_product = _is_product_page(new_page, verbose=verbose)
+    
+    if verbose:
+        print(f"[Buy Button] URL: {buy_url}")
+        print(f"[Buy Button] Product detection result: {is_product}")
+    
+    if is_product:
+        if verbose:
+            print(f"[Buy Button] Product page detected!")
+        
+        # Extract product data
+        product = _extract_product_data(new_page)
+        product.page_url = buy_url
+        
+        print(f"[Product] {product.product_name}")
+        print(f"[Price] {product.price} {product.currency or 'N/A'}")
+        
+        # Take screenshot of the buy button product page
+        if take_screenshots and product.product_name:
+            safe_filename = _safe_name(product.product_name[:100])
+            screenshot_path = _take_product_screenshot(new_page, safe_filename, out_dir, verbose=verbose)
+            if screenshot_path:
+                print(f"[Screenshot] Buy button product page saved: {os.path.basename(screenshot_path)}")
+        
+        # Extract and download the main product image next to product name
+        if download_media and product.product_name:
+            media_dir = os.path.join(out_dir, "media")
+            os.makedirs(media_dir, exist_ok=True)
+            
+            # Create filename from product name
+            safe_filename = _safe_name(product.product_name[:100])
+            
+            # Extract the main product image (image next to product name)
+            if verbose:
+                print(f"[Buy Button] Extracting main product image...")
+            
+            main_image_url = _extract_main_product_image(new_page, verbose=verbose)
+            
+            if main_image_url:
+                # Update product images if extraction found something
+                if main_image_url not in product.images:
+                    product.images = [main_image_url]
+                
+                # Download the image
+                media_path = _download_media(context, main_image_url, safe_filename, media_dir)
+                if media_path:
+                    product.media_files = [media_path]
+                    print(f"[Downloaded] {os.path.basename(media_path)}")
+                else:
+                    if verbose:
+                        print(f"[Buy Button] Failed to download image")
+            else:
+                # Fallback: try to use images from product data extraction
+                if product.images:
+                    if verbose:
+                        print(f"[Buy Button] Using fallback image from product data")
+                    img_url = product.images[0]
+                    media_path = _download_media(context, img_url, safe_filename, media_dir)
+                    if media_path:
+                        product.media_files = [media_path]
+                        print(f"[Downloaded] {os.path.basename(media_path)}")
+                else:
+                    if verbose:
+                        print(f"[Buy Button] No images found for product")
+        
+        return product
+    
+    if verbose:
+        print(f"[Buy Button] Not a product page, skipping")
+    return None
+
+
 def _detect_and_scrape_buy_buttons(
     page: Page,
     context: BrowserContext,
@@ -986,138 +1231,94 @@ def _detect_and_scrape_buy_buttons(
     visited_urls: Set[str],
     verbose: bool = True,
     take_screenshots: bool = True,
-    accept_cookies: bool = True
+    accept_cookies: bool = True,
+    diagnostics: bool = False,
+    scraped_cache: Optional[Dict[str, ProductData]] = None
 ) -> List[ProductData]:
     """
     Detect "Buy Now" or "Buy" buttons on the current page, open them in new tabs,
     scrape the product pages, then close the tabs.
     
     This is useful for catalog/listing pages that have product cards with buy buttons.
+    Scraped products are recorded in scraped_cache (if given) under both the buy link
+    and the URL the tab landed on, and links already in the cache are skipped.
     
     Returns:
         List of ProductData scraped from the buy button links
     """
     scraped_products = []
+    if scraped_cache is None:
+        scraped_cache = {}
     
     try:
         # ENHANCED: Take a diagnostic screenshot to see the page state
-        if verbose:
+        if diagnostics:
             try:
                 screenshot_dir = os.path.join(out_dir, "diagnostics")
                 os.makedirs(screenshot_dir, exist_ok=True)
                 timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
                 safe_url = _safe_name(page.url.split('/')[-1] or "homepage")
-                diagnostic_path = os.path.join(screenshot_dir, f"buy_detection_{safe_url}_{timestamp}.png")
-                page.screenshot(path=diagnostic_path, full_page=True)
+                diagnostic_path = os.path.join(screenshot_dir, f"buy_detection_{safe_url}_{timestamp}.jpg")
+                page.screenshot(path=diagnostic_path, type="jpeg", quality=DIAGNOSTIC_JPEG_QUALITY)
                 print(f"[Diagnostic] Screenshot saved: {os.path.basename(diagnostic_path)}")
             except:
                 pass
         
-        # Look for "Buy Now" or "Buy" buttons/links
-        # ENHANCED: More comprehensive selectors
-        buy_button_selectors = [
-            # Text-based (case insensitive)
-            'a:has-text("Buy Now")',
-            'a:has-text("Buy now")',
-            'a:has-text("buy now")',
-            'a:has-text("BUY NOW")',
-            'button:has-text("Buy Now")',
-            'button:has-text("Buy now")',
-            'button:has-text("buy now")',
-            'a:has-text("Buy")',
-            'button:has-text("Buy")',
-            'a:has-text("buy")',
-            'button:has-text("buy")',
-            'a:has-text("Shop Now")',
-            'a:has-text("shop now")',
-            'button:has-text("Shop Now")',
-            'a:has-text("View Product")',
-            'a:has-text("Learn More")',
-            # Class and data attributes
-            '[data-action*="buy"]',
-            '[class*="buy-button"]',
-            '[class*="buy-btn"]',
-            '[class*="shop-now"]',
-            '[class*="shop-button"]',
-            '[class*="product-link"]',
-            '[data-testid*="buy"]',
-            '[data-testid*="shop"]',
-            # Product card links
-            '.product-card a',
-            '.product-item a',
-            '[class*="product-card"] a',
-            '[class*="product-item"] a',
-        ]
-        
-        buy_links = []
-        total_buttons_found = 0
+        # Look for "Buy Now" or "Buy" buttons/links (BUY_BUTTON_SELECTORS)
+        page_url = page.url
+        base_netloc = urlparse(page_url).netloc
+        # Host names are case-insensitive: the shortcut below compares lowercased
+        same_domain_prefix = '//' + base_netloc.lower()
+        buy_links: List[str] = []
+        buy_links_set: Set[str] = set()
         skipped_already_visited = 0
         skipped_different_domain = 0
         skipped_no_href = 0
         
-        # Collect all buy button links
-        for selector in buy_button_selectors:
+        # Collect all buy button links: one query for every selector, matches in document order.
+        # Each element's href (or its parent/sibling/nearby link) is resolved in the same round-trip.
+        try:
+            found = page.locator(COMBINED_BUY_SELECTOR).evaluate_all(BUY_ELEMENT_HREFS_JS, MAX_BUY_ELEMENTS)
+        except:
+            found = {"count": 0, "hrefs": []}
+        total_buttons_found = found["count"]
+        if verbose and total_buttons_found > 0:
+            print(f"[Buy Detection] {total_buttons_found} element(s) match the buy button selectors")
+        
+        for href in found["hrefs"]:
             try:
-                elements = page.locator(selector)
-                count = elements.count()
-                
-                if count > 0:
-                    total_buttons_found += count
-                    if verbose:
-                        print(f"[Buy Detection] '{selector}' → {count} element(s)")
-                
-                for i in range(min(count, 50)):  # Increased limit to 50 to catch more products
-                    try:
-                        element = elements.nth(i)
-                        
-                        # Get the href if it's a link
-                        href = element.get_attribute('href')
-                        
-                        # If it's a button, try to find the closest parent link
-                        if not href:
-                            # Try multiple strategies to find the link
-                            parent_link = element.locator('xpath=ancestor::a[@href]').first
-                            if parent_link.count() > 0:
-                                href = parent_link.get_attribute('href')
-                            else:
-                                # Try to find sibling link
-                                sibling_link = element.locator('xpath=following-sibling::a[@href] | preceding-sibling::a[@href]').first
-                                if sibling_link.count() > 0:
-                                    href = sibling_link.get_attribute('href')
-                                else:
-                                    # Try to find any nearby link in the same container
-                                    nearby_link = element.locator('xpath=ancestor::*[contains(@class, "product") or contains(@class, "card") or contains(@class, "item")]//a[@href]').first
-                                    if nearby_link.count() > 0:
-                                        href = nearby_link.get_attribute('href')
-                        
-                        if href:
-                            full_url = urljoin(page.url, href)
-                            normalized_url = normalize_url(full_url)
-                            
-                            # Check domain first
-                            if urlparse(normalized_url).netloc != urlparse(page.url).netloc:
-                                skipped_different_domain += 1
-                                continue
-                            
-                            # Check if already visited
-                            if normalized_url in visited_urls:
-                                skipped_already_visited += 1
-                                if verbose:
-                                    print(f"[Buy Button] Already visited, skipping: {normalized_url}")
-                                continue
-                            
-                            # Check if already in current buy_links list
-                            if normalized_url in buy_links:
-                                continue
-                            
-                            # Valid new link
-                            buy_links.append(normalized_url)
-                            if verbose:
-                                print(f"[Buy Button] Found new product URL: {normalized_url}")
-                        else:
-                            skipped_no_href += 1
-                    except:
+                if href:
+                    # Absolute links to another host can be rejected without parsing
+                    if href.startswith(('http://', 'https://')) and same_domain_prefix not in href.lower():
+                        skipped_different_domain += 1
+                        continue
+                    
+                    full_url = urljoin(page_url, href)
+                    normalized_url = normalize_url(full_url)
+                    
+                    # Check domain first
+                    if urlparse(normalized_url).netloc != base_netloc:
+                        skipped_different_domain += 1
+                        continue
+                    
+                    # Check if already visited (or scraped under a redirect target)
+                    if normalized_url in visited_urls or normalized_url in scraped_cache:
+                        skipped_already_visited += 1
+                        if verbose:
+                            print(f"[Buy Button] Already visited, skipping: {normalized_url}")
+                        continue
+                    
+                    # Check if already in current buy_links list
+                    if normalized_url in buy_links_set:
                         continue
+                    
+                    # Valid new link
+                    buy_links.append(normalized_url)
+                    buy_links_set.add(normalized_url)
+                    if verbose:
+                        print(f"[Buy Button] Found new product URL: {normalized_url}")
+                else:
+                    skipped_no_href += 1
             except:
                 continue
         
@@ -1133,173 +1334,124 @@ def _detect_and_scrape_buy_buttons(
             if verbose:
                 print(f"[Buy Detection] No buy buttons found, trying fallback product link detection...")
             
-            # Look for product containers and extract links from them
-            product_container_selectors = [
-                '[class*="product-card"]',
-                '[class*="product-item"]',
-                '[class*="product-tile"]',
-                '[class*="product-box"]',
-                '.product',
-                '[data-product-id]',
-                '[data-testid*="product"]',
-            ]
-            
-            for container_selector in product_container_selectors:
-                try:
-                    containers = page.locator(container_selector)
-                    container_count = containers.count()
+            # Look for product containers (PRODUCT_CARD_SELECTORS, one query) and extract links from them
+            try:
+                containers = page.locator(COMBINED_PRODUCT_CARD_SELECTOR)
+                container_handles = containers.element_handles()
+                
+                if container_handles:
+                    if verbose:
+                        print(f"[Buy Detection] Found {len(container_handles)} product container(s)")
                     
-                    if container_count > 0:
-                        if verbose:
-                            print(f"[Buy Detection] Found {container_count} product container(s) with selector: {container_selector}")
-                        
-                        for j in range(min(container_count, 20)):
-                            try:
-                                container = containers.nth(j)
-                                # Look for any link in this container
-                                links = container.locator('a[href]')
-                                link_count = links.count()
-                                
-                                for k in range(min(link_count, 3)):  # Max 3 links per container
-                                    try:
-                                        link = links.nth(k)
-                                        href = link.get_attribute('href')
+                    for container in container_handles[:20]:
+                        try:
+                            # Look for any link in this container
+                            for link in container.query_selector_all('a[href]')[:3]:  # Max 3 links per container
+                                try:
+                                    href = link.get_attribute('href')
+                                    
+                                    if href:
+                                        if href.startswith(('http://', 'https://')) and same_domain_prefix not in href.lower():
+                                            continue
                                         
-                                        if href:
-                                            full_url = urljoin(page.url, href)
-                                            normalized_url = normalize_url(full_url)
-                                            
-                                            # Check domain
-                                            if urlparse(normalized_url).netloc != urlparse(page.url).netloc:
-                                                continue
-                                            
-                                            # Check if already visited
-                                            if normalized_url in visited_urls:
-                                                continue
-                                            
-                                            # Check if already in current buy_links list
-                                            if normalized_url in buy_links:
-                                                continue
-                                            
-                                            # Add to buy_links
-                                            buy_links.append(normalized_url)
-                                            if verbose:
-                                                print(f"[Buy Button] Fallback found product URL: {normalized_url}")
-                                    except:
-                                        continue
-                            except:
-                                continue
-                except:
-                    continue
+                                        full_url = urljoin(page_url, href)
+                                        normalized_url = normalize_url(full_url)
+                                        
+                                        # Check domain
+                                        if urlparse(normalized_url).netloc != base_netloc:
+                                            continue
+                                        
+                                        # Check if already visited
+                                        if normalized_url in visited_urls or normalized_url in scraped_cache:
+                                            continue
+                                        
+                                        # Check if already in current buy_links list
+                                        if normalized_url in buy_links_set:
+                                            continue
+                                        
+                                        # Add to buy_links
+                                        buy_links.append(normalized_url)
+                                        buy_links_set.add(normalized_url)
+                                        if verbose:
+                                            print(f"[Buy Button] Fallback found product URL: {normalized_url}")
+                                except:
+                                    continue
+                        except:
+                            continue
+            except:
+                pass
         
         if buy_links:
             print(f"[Buy Buttons] Starting to scrape {len(buy_links)} product(s)...\n")
         else:
             print(f"[Buy Buttons] No new product URLs found to scrape\n")
         
-        # Scrape each buy button link in a new tab
-        for idx, buy_url in enumerate(buy_links, 1):
-            try:
+        # Scrape the buy button links in batches of tabs: every tab in a batch starts
+        # navigating before the first one is inspected, so their loads overlap
+        for batch_start in range(0, len(buy_links), MAX_PARALLEL_BUY_TABS):
+            tabs = []
+            batch = buy_links[batch_start:batch_start + MAX_PARALLEL_BUY_TABS]
+            for offset, buy_url in enumerate(batch):
+                idx = batch_start + offset + 1
                 if verbose:
                     print(f"\n[Buy Button {idx}/{len(buy_links)}] Opening: {buy_url}")
                 
                 # Mark as visited to prevent duplicate scraping
                 visited_urls.add(buy_url)
                 
-                # Open new tab/page
-                new_page = context.new_page()
-                new_page.set_default_timeout(30000)
+                # Stagger tab openings so the site is not hit all at once
+                if offset:
+                    time.sleep(BUY_TAB_STAGGER_MS / 1000)
                 
+                new_page = None
                 try:
-                    # Navigate to the product page
-                    new_page.goto(buy_url, wait_until="domcontentloaded")
-                    new_page.wait_for_timeout(2000)  # Wait for content
-                    
-                    # Accept cookies on the new page
-                    if accept_cookies:
-                        _accept_cookies(new_page, verbose=verbose)
-                    
-                    # Check if it's a product page
-                    is_product = _is_product_page(new_page, verbose=verbose)
-                    
+                    # Open new tab/page and start navigating; the load finishes in the background
+                    new_page = context.new_page()
+                    new_page.set_default_timeout(30000)
+                    new_page.goto(buy_url, wait_until="commit")
+                    tabs.append((buy_url, new_page))
+                except Exception as e:
+                    if new_page:
+                        try:
+                            new_page.close()
+                        except:
+                            pass
                     if verbose:
-                        print(f"[Buy Button] URL: {buy_url}")
-                        print(f"[Buy Button] Product detection result: {is_product}")
+                        print(f"[Buy Button Error] Failed to scrape {buy_url}: {e}")
+            
+            for buy_url, new_page in tabs:
+                try:
+                    new_page.wait_for_load_state("domcontentloaded")
+                    # Wait for content; tabs that finished loading in the background return at once
+                    _wait_for_content(new_page)
                     
-                    if is_product:
-                        if verbose:
-                            print(f"[Buy Button] Product page detected!")
-                        
-                        # Extract product data
-                        product = _extract_product_data(new_page)
-                        product.page_url = buy_url
-                        
-                        print(f"[Product] {product.product_name}")
-                        print(f"[Price] {product.price} {product.currency or 'N/A'}")
-                        
-                        # Take screenshot of the buy button product page
-                        if take_screenshots and product.product_name:
-                            safe_filename = _safe_name(product.product_name[:100])
-                            screenshot_path = _take_product_screenshot(new_page, safe_filename, out_dir, verbose=verbose)
-                            if screenshot_path:
-                                print(f"[Screenshot] Buy button product page saved: {os.path.basename(screenshot_path)}")
-                        
-                        # Extract and download the main product image next to product name
-                        if download_media and product.product_name:
-                            media_dir = os.path.join(out_dir, "media")
-                            os.makedirs(media_dir, exist_ok=True)
-                            
-                            # Create filename from product name
-                            safe_filename = _safe_name(product.product_name[:100])
-                            
-                            # Extract the main product image (image next to product name)
-                            if verbose:
-                                print(f"[Buy Button] Extracting main product image...")
-                            
-                            main_image_url = _extract_main_product_image(new_page, verbose=verbose)
-                            
-                            if main_image_url:
-                                # Update product images if extraction found something
-                                if main_image_url not in product.images:
-                                    product.images = [main_image_url]
-                                
-                                # Download the image
-                                media_path = _download_media(context, main_image_url, safe_filename, media_dir)
-                                if media_path:
-                                    product.media_files = [media_path]
-                                    print(f"[Downloaded] {os.path.basename(media_path)}")
-                                else:
-                                    if verbose:
-                                        print(f"[Buy Button] Failed to download image")
-                            else:
-                                # Fallback: try to use images from product data extraction
-                                if product.images:
-                                    if verbose:
-                                        print(f"[Buy Button] Using fallback image from product data")
-                                    img_url = product.images[0]
-                                    media_path = _download_media(context, img_url, safe_filename, media_dir)
-                                    if media_path:
-                                        product.media_files = [media_path]
-                                        print(f"[Downloaded] {os.path.basename(media_path)}")
-                                else:
-                                    if verbose:
-                                        print(f"[Buy Button] No images found for product")
-                        
+                    product = _scrape_buy_tab(
+                        new_page,
+                        context,
+                        buy_url,
+                        out_dir,
+                        download_media,
+                        verbose=verbose,
+                        take_screenshots=take_screenshots,
+                        accept_cookies=accept_cookies
+                    )
+                    if product:
                         scraped_products.append(product)
-                    else:
-                        if verbose:
-                            print(f"[Buy Button] Not a product page, skipping")
+                        scraped_cache[buy_url] = product
+                        scraped_cache[normalize_url(new_page.url)] = product
+                
+                except Exception as e:
+                    if verbose:
+                        print(f"[Buy Button Error] Failed to scrape {buy_url}: {e}")
                 
                 finally:
                     # Always close the tab
-                    new_page.close()
+                    try:
+                        new_page.close()
+                    except:
+                        pass
                     if verbose:
                         print(f"[Buy Button] Tab closed, continuing...")
-                
-            except Exception as e:
-                if verbose:
-                    print(f"[Buy Button Error] Failed to scrape {buy_url}: {e}")
-                continue
         
         if scraped_products:
             print(f"[Buy Buttons] Successfully scraped {len(scraped_products)} product(s)")
@@ -1321,7 +1473,8 @@ def crawl_website(
     scroll_enabled: bool = True,
     buy_button_scraping: bool = True,
     take_screenshots: bool = True,
-    accept_cookies: bool = True
+    accept_cookies: bool = True,
+    diagnostics: bool = False
 ) -> List[PageData]:
     """
     Crawl website starting from start_url.
@@ -1337,6 +1490,7 @@ def crawl_website(
         buy_button_scraping: Whether to detect and scrape "Buy" buttons in new tabs
         take_screenshots: Whether to take screenshots of product pages
         accept_cookies: Whether to automatically accept cookie banners
+        diagnostics: Whether to save viewport screenshots of crawled pages to diagnostics/
     
     Returns:
         List of PageData objects with crawled information
@@ -1346,26 +1500,34 @@ def crawl_website(
             headless=headless,
             args=["--disable-blink-features=AutomationControlled"]
         )
+        # Discovery pages only need HTML and scripts; product pages (a page-level route on
+        # the crawl page) and buy-button tabs (their own context) also load images and CSS
         context = browser.new_context()
+        context.route(BLOCKED_URL_RE, _abort_route)
+        media_context = browser.new_context()
+        media_context.route(PRODUCT_BLOCKED_URL_RE, _abort_route)
         page = context.new_page()
         page.set_default_timeout(30000)
         
         os.makedirs(out_dir, exist_ok=True)
         
         visited_urls: Set[str] = set()
-        to_visit: List[str] = [normalize_url(start_url)]
+        to_visit: deque[str] = deque([normalize_url(start_url)])
+        queued: Set[str] = set(to_visit)
         results: List[PageData] = []
+        # Scraped products by normalized URL, both as requested and as landed on after redirects
+        scraped_cache: Dict[str, ProductData] = {}
         
         base_domain = urlparse(start_url).netloc
         
         while to_visit and len(visited_urls) < max_pages:
-            current_url = to_visit.pop(0)
+            current_url = to_visit.popleft()
             
             # Normalize URL to prevent hash fragment duplicates
             normalized_url = normalize_url(current_url)
             
-            # Skip if already visited
-            if normalized_url in visited_urls:
+            # Skip if already visited, or already scraped (e.g. a buy-button redirect target)
+            if normalized_url in visited_urls or normalized_url in scraped_cache:
                 continue
             
             # Skip non-http(s) URLs
@@ -1379,9 +1541,20 @@ def crawl_website(
             print(f"\n[Crawling {len(visited_urls)+1}/{max_pages}] {normalized_url}")
             visited_urls.add(normalized_url)
             
+            # Product URLs let images and CSS through from the start, so they load only once
+            product_routed = _looks_like_product_url(normalized_url)
+            if product_routed:
+                page.route(BLOCKED_URL_RE, _product_route)
+            
             try:
                 page.goto(normalized_url, wait_until="domcontentloaded")
-                page.wait_for_timeout(2000)  # Wait for dynamic content
+                _wait_for_content(page)  # Wait for dynamic content
+                
+                # Redirected to a product that has already been scraped
+                landed_url = normalize_url(page.url)
+                if landed_url in scraped_cache:
+                    print(f"[Skip] Redirected to an already scraped product: {landed_url}")
+                    continue
                 
                 # NEW: Accept cookies first to avoid interference
                 if accept_cookies:
@@ -1392,14 +1565,14 @@ def crawl_website(
                     _scroll_page_to_load_content(page, verbose=verbose)
                 
                 # DIAGNOSTIC: Take screenshot after page load to verify content
-                if verbose:
+                if diagnostics:
                     try:
                         screenshot_dir = os.path.join(out_dir, "diagnostics")
                         os.makedirs(screenshot_dir, exist_ok=True)
                         timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
                         safe_url = _safe_name(normalized_url.split('/')[-1] or f"page_{len(visited_urls)}")
-                        diagnostic_path = os.path.join(screenshot_dir, f"crawl_{len(visited_urls)}_{safe_url}_{timestamp}.png")
-                        page.screenshot(path=diagnostic_path, full_page=True)
+                        diagnostic_path = os.path.join(screenshot_dir, f"crawl_{len(visited_urls)}_{safe_url}_{timestamp}.jpg")
+                        page.screenshot(path=diagnostic_path, type="jpeg", quality=DIAGNOSTIC_JPEG_QUALITY)
                         print(f"[Diagnostic] Page screenshot: {os.path.basename(diagnostic_path)}")
                     except:
                         pass
@@ -1414,6 +1587,16 @@ def crawl_website(
                 products = []
                 
                 if is_product:
+                    if not product_routed:
+                        # Detected from the DOM with images blocked: allow them on this page and
+                        # reload it (same context, so the accepted cookie banner stays accepted)
+                        page.route(BLOCKED_URL_RE, _product_route)
+                        product_routed = True
+                        page.reload(wait_until="domcontentloaded")
+                        _wait_for_content(page)
+                        if scroll_enabled:
+                            _scroll_page_to_load_content(page, verbose=verbose)
+                    
                     # Extract product data
                     product = _extract_product_data(page)
                     # Update URL to normalized version
@@ -1444,7 +1627,7 @@ def crawl_website(
                         downloaded = []
                         if product.images:
                             img_url = product.images[0]  # Get the main image
-                            media_path = _download_media(context, img_url, safe_filename, media_dir)
+                            media_path = _download_media(media_context, img_url, safe_filename, media_dir)
                             if media_path:
                                 downloaded.append(media_path)
                                 print(f"[Downloaded] {os.path.basename(media_path)}")
@@ -1452,32 +1635,37 @@ def crawl_website(
                         product.media_files = downloaded
                     
                     products.append(product)
+                    scraped_cache[normalized_url] = product
+                    scraped_cache[landed_url] = product
                 else:
                     # NEW: If not a product page, check for "Buy Now" or "Buy" buttons
                     # and scrape their target pages in new tabs
                     if buy_button_scraping:
                         buy_button_products = _detect_and_scrape_buy_buttons(
                             page=page,
-                            context=context,
+                            context=media_context,
                             out_dir=out_dir,
                             download_media=download_media,
                             visited_urls=visited_urls,
                             verbose=verbose,
                             take_screenshots=take_screenshots,
-                            accept_cookies=accept_cookies
+                            accept_cookies=accept_cookies,
+                            diagnostics=diagnostics,
+                            scraped_cache=scraped_cache
                         )
                         
                         if buy_button_products:
                             products.extend(buy_button_products)
                 
                 # Extract links for further crawling
-                links = _extract_links(page, normalized_url)
+                links = _extract_links(page, normalized_url, base_domain)
                 
                 # Add new links to the queue
                 for link in links:
                     normalized_link = normalize_url(link)
-                    if normalized_link not in visited_urls and normalized_link not in to_visit:
+                    if normalized_link not in visited_urls and normalized_link not in queued:
                         to_visit.append(normalized_link)
+                        queued.add(normalized_link)
                 
                 # Create page data
                 page_data = PageData(
@@ -1494,6 +1682,13 @@ def crawl_website(
             except Exception as e:
                 print(f"[Error] Failed to crawl {normalized_url}: {e}")
                 continue
+            finally:
+                # The crawl page is reused: back to discovery-page blocking
+                if product_routed:
+                    try:
+                        page.unroute(BLOCKED_URL_RE, _product_route)
+                    except Exception:
+                        pass
         
         browser.close()
         
@@ -1523,17 +1718,24 @@ def save_results(results: List[PageData], out_dir: str) -> None:
         total_products_count = sum(len(r.products) for r in results)
         buy_button_count = sum(len(r.products) for r in results if not r.is_product_page and r.products)
         
-        data = {
+        header = {
             "crawl_time": datetime.now().strftime("%Y-%m-%d %H:%M:%S"),
             "total_pages": len(results),
             "product_pages": sum(1 for r in results if r.is_product_page),
             "total_products": total_products_count,
             "buy_button_products": buy_button_count,
-            "pages": [asdict(r) for r in results]
         }
         
+        # Stream the pages one at a time (compact, one page per line) instead of
+        # building the whole asdict() tree first
         with open(output_file, "w", encoding="utf-8") as f:
-            json.dump(data, f, ensure_ascii=False, indent=2)
+            f.write(json.dumps(header, ensure_ascii=False, separators=(",", ":"))[:-1])
+            f.write(',"pages":[\n')
+            for i, r in enumerate(results):
+                if i:
+                    f.write(",\n")
+                f.write(json.dumps(asdict(r), ensure_ascii=False, separators=(",", ":")))
+            f.write("\n]}\n")
         
         print(f"\n[Saved] Results saved to {output_file}")
         
@@ -1619,6 +1821,11 @@ def main() -> int:
         action="store_true",
         help="Disable automatic cookie acceptance"
     )
+    parser.add_argument(
+        "--diagnostics",
+        action="store_true",
+        help="Save a viewport screenshot of every crawled page to diagnostics/"
+    )
     
     args = parser.parse_args()
     
@@ -1648,7 +1855,8 @@ def main() -> int:
         scroll_enabled=not args.no_scroll,
         buy_button_scraping=not args.no_buy_buttons,
         take_screenshots=not args.no_screenshots,
-        accept_cookies=not args.no_cookies
+        accept_cookies=not args.no_cookies,
+        diagnostics=args.diagnostics
     )
     
     save_results(results, args.out_dir)